@@ -5,8 +5,11 @@ import pytorch_lightning as pl
 
 # make core features and version number accessible
 from ._version import __version__  # noqa: F401
+from .bulk import fit_bulk, fit_stacked, iter_fit_bulk  # noqa: F401
+from .data.stream import DataFrameChunks  # noqa: F401
 from .df_utils import add_quarter_condition, add_weekday_condition, split_df  # noqa: F401
 from .forecaster import NeuralProphet  # noqa: F401
+from .predictor import ForecastSession, Predictor  # noqa: F401
 from .torch_prophet import TorchProphet  # noqa: F401
 from .uncertainty import uncertainty_evaluate  # noqa: F401
 from .utils import load, save, set_log_level, set_random_seed  # noqa: F401
@@ -0,0 +1,274 @@
+import logging
+import multiprocessing
+import os
+import pickle
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Hashable, Iterator, Optional, Tuple, Union
+
+import pandas as pd
+import torch
+
+from neuralprophet import df_utils, utils, utils_torch
+from neuralprophet.forecaster import NeuralProphet
+
+log = logging.getLogger("NP.bulk")
+
+# fits submitted per worker ahead of the results streamed back, bounding the data queued to the pool
+TASKS_PER_WORKER = 2
+
+
+@dataclass
+class BulkFitResult:
+    """Fit of the model of one series by ``iter_fit_bulk`` or ``fit_stacked``.
+
+    ``ID`` is the value of the series in the ``ID`` column, of its type. If the fit failed, ``error`` holds the
+    exception raised, and ``model`` and ``metrics`` are None.
+    """
+
+    ID: Hashable
+    model: Optional[Union[NeuralProphet, dict]]
+    metrics: Optional[pd.DataFrame]
+    error: Optional[Exception] = None
+
+
+def _init_worker(log_level: str):
+    # the models are small: one core per model is faster than intra-op threads competing across workers
+    torch.set_num_threads(1)
+    utils.set_log_level(log_level)
+
+
+def _fit_one(
+    ID: Hashable,
+    df: pd.DataFrame,
+    freq: str,
+    model_kwargs: dict,
+    fit_kwargs: dict,
+    seed: Optional[int],
+    return_state_dict: bool,
+) -> Tuple[Hashable, Optional[bytes], Optional[pd.DataFrame], Optional[Exception]]:
+    try:
+        if seed is not None:
+            utils.set_random_seed(seed)
+        m = NeuralProphet(**model_kwargs)
+        metrics = m.fit(df, freq=freq, **fit_kwargs)
+    except Exception as error:
+        # returned instead of raised, which would end the fits of all series
+        return ID, None, None, error
+    # pickled by the standard pickler: the pool's refuses the tensors a fit with the Trainer keeps attached to autograd
+    model = pickle.dumps(m.model.state_dict() if return_state_dict else m)
+    return ID, model, metrics, None
+
+
+def iter_fit_bulk(
+    df: pd.DataFrame,
+    freq: str = "auto",
+    model_kwargs: Optional[dict] = None,
+    fit_kwargs: Optional[dict] = None,
+    num_workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    return_state_dict: bool = False,
+    mp_context: Optional[str] = None,
+) -> Iterator[BulkFitResult]:
+    """Fits one independent model per series (``ID``) in a pool of processes, yielding each fit once done.
+
+    Meant for many small series with the same hyperparameters, e.g. one model per product. Each worker fits one
+    model at a time on a single thread, so the fits scale with the number of cores instead of sharing one process.
+
+    Parameters
+    ----------
+        df : pd.DataFrame
+            dataframe containing column ``ds``, ``y``, and ``ID`` with the data of all series
+        freq : str
+            data step sizes, see ``NeuralProphet.fit``
+        model_kwargs : dict
+            arguments of ``NeuralProphet``, the same for each model
+        fit_kwargs : dict
+            further arguments of ``NeuralProphet.fit``, the same for each model. The progress is not shown,
+            unless ``progress`` is set.
+        num_workers : int
+            number of processes, defaults to the number of CPUs
+        seed : int
+            random seed set before each fit, making the fits independent of their order and worker
+        return_state_dict : bool
+            whether to return the state dict of each model instead of the fitted ``NeuralProphet``
+        mp_context : str
+            start method of the processes, see ``multiprocessing.get_context``. Defaults to that of the platform,
+            as for the workers of a ``DataLoader``: ``fork`` starts fastest and shares the memory of the modules
+            imported, ``spawn`` starts each process anew.
+
+    Returns
+    -------
+        Iterator[BulkFitResult]
+            ID, fitted model (or its state dict) and metrics of each series, in the order the fits finish. The fit of
+            a series failing does not stop the others, its result holding the exception raised instead. A series
+            with a non-string ID is fitted under the ID as string, e.g. ``1`` as ``"1"``.
+
+    Examples
+    --------
+    Fit a model per ID and forecast with each as soon as it is fitted
+        >>> from neuralprophet.bulk import iter_fit_bulk
+        >>> for result in iter_fit_bulk(df, model_kwargs={"n_lags": 7, "epochs": 10}, seed=0):
+        ...     forecast = result.model.predict(df[df["ID"] == result.ID])
+    """
+    df, _, _, _ = df_utils.prep_or_copy_df(df, copy=False)
+    model_kwargs = {} if model_kwargs is None else model_kwargs
+    fit_kwargs = {"progress": None, **({} if fit_kwargs is None else fit_kwargs)}
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    if num_workers < 1:
+        raise ValueError("num_workers must be at least 1.")
+
+    tasks = iter(df.groupby("ID", sort=False))
+    with ProcessPoolExecutor(
+        max_workers=num_workers,
+        mp_context=multiprocessing.get_context(mp_context),
+        initializer=_init_worker,
+        initargs=(logging.getLevelName(logging.getLogger("NP").getEffectiveLevel()),),
+    ) as executor:
+        pending = set()
+        while True:
+            for ID, df_id in tasks:
+                if not isinstance(ID, str):
+                    # the datasets of a model take string IDs, the result keeps the ID as given
+                    df_id = df_id.assign(ID=str(ID))
+                pending.add(
+                    executor.submit(_fit_one, ID, df_id, freq, model_kwargs, fit_kwargs, seed, return_state_dict)
+                )
+                if len(pending) >= TASKS_PER_WORKER * num_workers:
+                    break
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                ID, model, metrics, error = future.result()
+                if model is None:
+                    log.warning(f"Fitting the model of series {ID} failed: {error!r}")
+                    yield BulkFitResult(ID=ID, model=None, metrics=None, error=error)
+                    continue
+                log.debug(f"Fitted the model of series {ID}.")
+                yield BulkFitResult(ID=ID, model=pickle.loads(model), metrics=metrics)
+
+
+def fit_bulk(df: pd.DataFrame, freq: str = "auto", **kwargs) -> tuple[dict, pd.DataFrame]:
+    """Fits one independent model per series (``ID``) in a pool of processes.
+
+    Parameters
+    ----------
+        df : pd.DataFrame
+            dataframe containing column ``ds``, ``y``, and ``ID`` with the data of all series
+        freq : str
+            data step sizes, see ``NeuralProphet.fit``
+        **kwargs
+            further arguments of ``iter_fit_bulk``
+
+    Returns
+    -------
+        dict
+            fitted model (or its state dict) of each ID, in the order of the IDs in ``df``. IDs whose fit failed
+            are left out, see ``iter_fit_bulk`` for their exceptions.
+        pd.DataFrame
+            metrics of each epoch of each model, with column ``ID``
+
+    Examples
+    --------
+        >>> from neuralprophet import fit_bulk
+        >>> models, metrics = fit_bulk(df, model_kwargs={"n_lags": 7, "epochs": 10}, num_workers=8)
+        >>> forecast = models["store_1"].predict(df[df["ID"] == "store_1"])
+    """
+    results = {result.ID: result for result in iter_fit_bulk(df, freq=freq, **kwargs)}
+    return _collect_results(results, IDs=df_utils.prep_or_copy_df(df, copy=False)[3])
+
+
+def fit_stacked(
+    df: pd.DataFrame,
+    freq: str = "auto",
+    model_kwargs: Optional[dict] = None,
+    progress: Optional[str] = None,
+    seed: Optional[int] = None,
+) -> tuple[dict, pd.DataFrame]:
+    """Fits one independent model per series (``ID``) in one process, training many models at once.
+
+    The models of series with the same number of samples, and thereby the same batches, epochs and architecture, are
+    stacked into one network and trained together with batched operations, see ``utils_torch.train_stacked``.
+    Fits hundreds of small models in about the time of a few, without the processes of ``fit_bulk``.
+
+    Note
+    ----
+    Each model finds its own learning rate, unless a ``learning_rate`` is set. With ``lr_finder="fast"`` the models
+    of a stack share the cached learning rate of the first. Validation, early stopping and checkpointing are not
+    supported.
+
+    Parameters
+    ----------
+        df : pd.DataFrame
+            dataframe containing column ``ds``, ``y``, and ``ID`` with the data of all series
+        freq : str
+            data step sizes, see ``NeuralProphet.fit``
+        model_kwargs : dict
+            arguments of ``NeuralProphet``, the same for each model
+        progress : str
+            whether to show a progress bar for each stack of models, ``bar`` or None
+        seed : int
+            random seed set before the models are initialized
+
+    Returns
+    -------
+        dict
+            fitted model of each ID, in the order of the IDs in ``df``
+        pd.DataFrame
+            metrics of each epoch of each model, with column ``ID``
+
+    Examples
+    --------
+        >>> from neuralprophet import fit_stacked
+        >>> models, metrics = fit_stacked(df, model_kwargs={"n_lags": 7, "epochs": 10, "learning_rate": 0.1})
+        >>> forecast = models["store_1"].predict(df[df["ID"] == "store_1"])
+    """
+    df, _, _, IDs = df_utils.prep_or_copy_df(df, copy=False)
+    model_kwargs = {} if model_kwargs is None else model_kwargs
+    if seed is not None:
+        utils.set_random_seed(seed)
+
+    forecasters, loaders = {}, {}
+    stacks = defaultdict(list)
+    for ID, df_id in df.groupby("ID", sort=False):
+        m = NeuralProphet(**model_kwargs)
+        m.early_stopping = False
+        df_id, _ = m._prepare_fit_data(df_id, freq=freq)
+        loaders[ID], _, _ = m._init_training(
+            df_id, progress_bar_enabled=False, metrics_enabled=bool(m.metrics), use_trainer=False
+        )
+        forecasters[ID] = m
+        shapes = tuple((name, tuple(param.shape)) for name, param in m.model.named_parameters())
+        stacks[(len(loaders[ID].dataset), m.config_train.epochs, m.config_train.batch_size, shapes)].append(ID)
+    log.info(f"Training {len(forecasters)} models in {len(stacks)} stacks.")
+
+    results = {}
+    for (_, epochs, _, _), stack in stacks.items():
+        histories = utils_torch.train_stacked(
+            [forecasters[ID].model for ID in stack],
+            [loaders[ID] for ID in stack],
+            epochs=epochs,
+            metrics_enabled=bool(forecasters[stack[0]].metrics),
+            progress_bar_enabled=bool(progress),
+        )
+        for ID, history in zip(stack, histories):
+            m = forecasters[ID]
+            for name, values in history.items():
+                m.metrics_logger.history[name].extend(values)
+            m.fitted = True
+            metrics = pd.DataFrame(m.metrics_logger.history) if history else None
+            results[ID] = BulkFitResult(ID=ID, model=m, metrics=metrics)
+    return _collect_results(results, IDs)
+
+
+def _collect_results(results: dict, IDs: list) -> tuple[dict, pd.DataFrame]:
+    failed = [ID for ID in IDs if results[ID].error is not None]
+    if failed:
+        log.error(f"Fitting the models of {len(failed)} of {len(IDs)} series failed, IDs: {failed}")
+    IDs = [ID for ID in IDs if results[ID].error is None]
+    models = {ID: results[ID].model for ID in IDs}
+    metrics = [results[ID].metrics.assign(ID=ID) for ID in IDs if results[ID].metrics is not None]
+    return models, pd.concat(metrics, ignore_index=True) if metrics else pd.DataFrame()
@@ -1,11 +1,13 @@
 from abc import abstractmethod
+from collections import OrderedDict
 
+import numpy as np
 import torch
 import torch.nn as nn
 
 from neuralprophet import utils
 from neuralprophet.components.seasonality import Seasonality
-from neuralprophet.utils_torch import init_parameter
+from neuralprophet.utils_torch import init_parameter, select_by_id
 
 
 class FourierSeasonality(Seasonality):
@@ -41,6 +43,17 @@ class FourierSeasonality(Seasonality):
                     for name, dim in self.season_dims.items()
                 }
             )
+            if self.config_seasonality.computation == "fourier_fused":
+                # angular frequency of every Fourier term of all seasonalities, in the order of their features
+                scales, periods, sizes = [], [], []
+                for name, period in self.config_seasonality.periods.items():
+                    if period.resolution > 0:
+                        scales.extend(2.0 * (i + 1) * np.pi for i in range(period.resolution))
+                        periods.extend([period.period] * period.resolution)
+                        sizes.append(period.resolution)
+                self.register_buffer("fourier_scales", torch.tensor(scales, dtype=torch.float32), persistent=False)
+                self.register_buffer("fourier_periods", torch.tensor(periods, dtype=torch.float32), persistent=False)
+                self.fourier_sizes = sizes
 
     @abstractmethod
     def compute_fourier(self, features, name, meta=None):
@@ -63,6 +76,43 @@ class FourierSeasonality(Seasonality):
         """
         pass
 
+    def compute_features(self, s):
+        """Compute the Fourier features of all seasonalities, if not computed by the dataset.
+
+        With the ``fourier_fused`` computation, the features of all seasonalities are computed in one batched
+        operation from the time in days, identical to the features computed by the dataset.
+
+        Parameters
+        ----------
+            s : dict
+                dict of named seasonalities (keys) with their features (values)
+                dims of each dict value (batch, n_forecasts, n_features),
+                or with ``fourier_fused`` computation, ``ds`` with the time in days since 1900-01-01 and the values
+                of the seasonality conditions, dims of each dict value (batch, n_forecasts)
+
+        Returns
+        -------
+            dict
+                named seasonalities (keys) with their features (values), dims of each dict value
+                (batch, n_forecasts, n_features)
+        """
+        if self.config_seasonality.computation != "fourier_fused":
+            return s
+        # dimensions - batch, n_forecasts, total no. of Fourier terms
+        arguments = s["ds"].unsqueeze(dim=-1) * self.fourier_scales / self.fourier_periods
+        sin, cos = torch.sin(arguments), torch.cos(arguments)
+        features = OrderedDict({})
+        names = [name for name, period in self.config_seasonality.periods.items() if period.resolution > 0]
+        for name, sin_i, cos_i in zip(
+            names, sin.split(self.fourier_sizes, dim=-1), cos.split(self.fourier_sizes, dim=-1)
+        ):
+            features[name] = torch.cat((sin_i, cos_i), dim=-1)
+            condition_name = self.config_seasonality.periods[name].condition_name
+            if condition_name is not None:
+                # multiply seasonality features with condition mask/values
+                features[name] = features[name] * s[condition_name].unsqueeze(dim=-1)
+        return features
+
     def forward(self, s, meta):
         """Compute all seasonality components.
 
@@ -70,7 +120,7 @@ class FourierSeasonality(Seasonality):
         ----------
             s : torch.Tensor, float
                 dict of named seasonalities (keys) with their features (values)
-                dims of each dict value (batch, n_forecasts, n_features)
+                dims of each dict value (batch, n_forecasts, n_features), see ``compute_features``
             meta: dict
                 Metadata about the all the samples of the model input batch. Contains the following:
                     * ``df_name`` (list, str), time series ID corresponding to each sample of the input batch.
@@ -80,6 +130,7 @@ class FourierSeasonality(Seasonality):
             torch.Tensor
                 Forecast component of dims (batch, n_forecasts)
         """
+        s = self.compute_features(s)
         device = s[list(s.keys())[0]].device
         x = torch.zeros(
             size=(s[list(s.keys())[0]].shape[0], s[list(s.keys())[0]].shape[1], len(self.quantiles)),
@@ -175,13 +226,9 @@ class LocalFourierSeasonality(FourierSeasonality):
             torch.Tensor
                 Forecast component of dims (batch, n_forecasts)
         """
-        # From the dataloader meta data, we get the one-hot encoding of the df_name.
-        meta_name_tensor_one_hot = nn.functional.one_hot(meta, num_classes=len(self.id_list))
+        # From the dataloader meta data, we gather the parameters of the df_name of each sample.
         # dimensions - quantiles, batch, parameters_fourier
-        season_params_sample = torch.sum(
-            meta_name_tensor_one_hot.unsqueeze(dim=0).unsqueeze(dim=-1) * self.season_params[name].unsqueeze(dim=1),
-            dim=2,
-        )
+        season_params_sample = select_by_id(self.season_params[name], meta)
         # dimensions -  batch_size, n_forecasts, quantiles
         seasonality = torch.sum(features.unsqueeze(2) * season_params_sample.permute(1, 0, 2).unsqueeze(1), dim=-1)
         return seasonality
@@ -226,14 +273,10 @@ class GlocalFourierSeasonality(FourierSeasonality):
             torch.Tensor
                 Forecast component of dims (batch, n_forecasts)
         """
-        # From the dataloader meta data, we get the one-hot encoding of the df_name.
+        # From the dataloader meta data, we gather the parameters of the df_name of each sample.
         if self.config_seasonality.periods[name].global_local == "local":
-            meta_name_tensor_one_hot = nn.functional.one_hot(meta, num_classes=len(self.id_list))
             # dimensions - quantiles, batch, parameters_fourier
-            season_params_sample = torch.sum(
-                meta_name_tensor_one_hot.unsqueeze(dim=0).unsqueeze(dim=-1) * self.season_params[name].unsqueeze(dim=1),
-                dim=2,
-            )
+            season_params_sample = select_by_id(self.season_params[name], meta)
             # dimensions -  batch_size, n_forecasts, quantiles
             seasonality = torch.sum(features.unsqueeze(2) * season_params_sample.permute(1, 0, 2).unsqueeze(1), dim=-1)
         elif self.config_seasonality.periods[name].global_local == "global":
@@ -1,8 +1,5 @@
-import torch
-import torch.nn as nn
-
 from neuralprophet.components.trend import Trend
-from neuralprophet.utils_torch import init_parameter
+from neuralprophet.utils_torch import init_parameter, select_by_id
 
 
 class LinearTrend(Trend):
@@ -94,13 +91,9 @@ class LocalLinearTrend(LinearTrend):
             torch.Tensor
                 Trend component, same dimensions as input t
         """
-        # From the dataloader meta data, we get the one-hot encoding of the df_name.
-        meta_name_tensor_one_hot = nn.functional.one_hot(meta, num_classes=len(self.id_list))
         # trend_k_0 = trend_k_0(sample metadata)
         # dimensions - batch_size, segments(1), quantiles
-        trend_k_0 = torch.sum(
-            meta_name_tensor_one_hot.unsqueeze(dim=0).unsqueeze(dim=-1) * self.trend_k0.unsqueeze(dim=1), dim=2
-        ).permute(1, 2, 0)
+        trend_k_0 = select_by_id(self.trend_k0, meta).permute(1, 2, 0)
         # dimensions -  batch_size, n_forecasts, quantiles
         trend = trend_k_0 * t.unsqueeze(2)
         return self.bias.unsqueeze(dim=0).unsqueeze(dim=0) + trend
@@ -1,9 +1,8 @@
 import numpy as np
 import torch
-import torch.nn as nn
 
 from neuralprophet.components.trend import Trend
-from neuralprophet.utils_torch import init_parameter
+from neuralprophet.utils_torch import init_parameter, select_by_id
 
 
 class PiecewiseLinearTrend(Trend):
@@ -66,30 +65,29 @@ class PiecewiseLinearTrend(Trend):
                 Trend component, same dimensions as input t
 
         """
-        # From the dataloader meta data, we get the one-hot encoding of the df_name.
+        # From the dataloader meta data, we get the time series ID of each sample.
         if self.config_trend.trend_global_local == "local":
-            # dimensions - batch , num_time_series
-            meta_name_tensor_one_hot = nn.functional.one_hot(meta, num_classes=len(self.id_list))
+            # dimensions - batch
+            meta_name_tensor = meta
         else:
-            meta_name_tensor_one_hot = None
+            meta_name_tensor = None
 
-        # Variables identifying, for t, the corresponding trend segment (for each sample of the batch).
-        past_next_changepoint = t.unsqueeze(dim=2) >= self.trend_changepoints_t[1:].unsqueeze(dim=0)
-        segment_id = past_next_changepoint.sum(dim=2)
-        # = dimensions - batch_size, n_forecasts, segments (+ 1)
-        current_segment = nn.functional.one_hot(segment_id, num_classes=self.config_trend.n_changepoints + 1)
+        # Variable identifying, for t, the corresponding trend segment (for each sample of the batch):
+        # the number of (sorted) changepoints after the start, which are <= t.
+        # dimensions - batch_size, n_forecasts
+        segment_id = torch.searchsorted(self.trend_changepoints_t[1:], t.contiguous(), right=True)
 
         # Computing k_t.
         # dimensions - batch_size, n_forecasts, quantiles_size
-        k_t = self.compute_k_t(current_segment, past_next_changepoint, meta_name_tensor_one_hot)
+        k_t = self.compute_k_t(segment_id, meta_name_tensor)
 
         # Computing m_t.
         # dimensions - batch_size, n_forecasts, quantiles_size
-        m_t = self.compute_m_t(current_segment, past_next_changepoint, meta_name_tensor_one_hot)
+        m_t = self.compute_m_t(segment_id, meta_name_tensor)
 
         # Computing trend value at time(t) for each batch sample.
         # dimensions - batch_size, n_forecasts, quantiles_size
-        trend = self.compute_trend(t, k_t, m_t, meta_name_tensor_one_hot)
+        trend = self.compute_trend(t, k_t, m_t, meta_name_tensor)
 
         return self.bias.unsqueeze(dim=0).unsqueeze(dim=0) + trend
 
@@ -110,7 +108,79 @@ class PiecewiseLinearTrend(Trend):
     def add_regularization(self):
         pass
 
-    def compute_k_t(self, current_segment, past_next_changepoint, meta_name_tensor_one_hot):
+    def k_t_by_segment(self, trend_deltas):
+        """Table of k_t for each segment.
+
+        For segmentwise, k_t in a segment is the delta of the segment. For not segmentwise, it is the sum of the
+        deltas of the segment and all previous segments.
+
+        Parameters
+        ----------
+            trend_deltas : torch.Tensor, float
+                trend deltas, dims: (quantiles, num_time_series or batch_size, segments (+ 1))
+
+        Returns
+        -------
+            torch.Tensor
+                k_t of each segment, same dimensions as trend_deltas
+        """
+        if self.segmentwise_trend:
+            return trend_deltas
+        return torch.cumsum(trend_deltas, dim=-1)
+
+    def m_t_by_segment(self, trend_k0, trend_deltas):
+        """Table of m_t for each segment, for a continuous trend.
+
+        m_t in a segment is the sum of the offsets ``gammas`` of all changepoints before the segment.
+
+        Parameters
+        ----------
+            trend_k0 : torch.Tensor, float
+                trend k0, dims: (quantiles, num_time_series or batch_size, 1)
+            trend_deltas : torch.Tensor, float
+                trend deltas, dims: (quantiles, num_time_series or batch_size, segments (+ 1))
+
+        Returns
+        -------
+            torch.Tensor
+                m_t of each segment, same dimensions as trend_deltas
+        """
+        # Intermediate computation: deltas.
+        # `deltas`` is representing the difference between trend slope in the current_segment at time t
+        #  and the trend slope in the previous segment.
+        if self.segmentwise_trend:
+            deltas = trend_deltas - torch.cat((trend_k0, trend_deltas[:, :, 0:-1]), dim=2)
+        else:
+            deltas = trend_deltas
+        # dimensions - quantiles, num_time_series or batch_size, segments
+        gammas = -self.trend_changepoints_t[1:] * deltas[:, :, 1:]
+        m_t = torch.cat((torch.zeros_like(gammas[:, :, :1]), torch.cumsum(gammas, dim=-1)), dim=-1)
+        if not self.segmentwise_trend:
+            m_t = m_t.detach()
+        return m_t
+
+    @staticmethod
+    def select_segment(by_segment, segment_id):
+        """Looks up the value of the current segment at time t, for each sample of the batch.
+
+        Parameters
+        ----------
+            by_segment : torch.Tensor, float
+                value of each segment, dims: (quantiles, 1 or batch_size, segments (+ 1))
+            segment_id : torch.Tensor, int
+                segment corresponding to time t, dims: (batch_size, n_forecasts)
+
+        Returns
+        -------
+            torch.Tensor
+                value of the current segment, dims: (batch_size, n_forecasts, quantiles_size)
+        """
+        # dimensions - batch_size, segments (+ 1), quantiles
+        by_segment = by_segment.permute(1, 2, 0).expand(segment_id.shape[0], -1, -1)
+        index = segment_id.unsqueeze(dim=2).expand(-1, -1, by_segment.shape[2])
+        return torch.gather(by_segment, dim=1, index=index)
+
+    def compute_k_t(self, segment_id, meta_name_tensor):
         """For segmentwise, k_t is the model parameter representing the trend slope(actually, trend slope-k_0) in the
         current_segment at time t (for each sample of the batch).
 
@@ -119,13 +189,10 @@ class PiecewiseLinearTrend(Trend):
 
         Parameters
         ----------
-            current_segment : torch.Tensor, int
-                segment corresponding to time t (batch_size, n_forecasts, segments (+ 1))
-
-            past_next_changepoint : torch.Tensor, bool
-                whether the a changepoint >= time t (batch_size, n_forecasts, segments (+ 1))
+            segment_id : torch.Tensor, int
+                segment corresponding to time t (batch_size, n_forecasts)
 
-            meta_name_tensor_one_hot : torch.Tensor, float
+            meta_name_tensor : torch.Tensor, int
                 Metadata about the all the samples of the model input batch.
 
                 Contains the following:
@@ -138,20 +205,17 @@ class PiecewiseLinearTrend(Trend):
 
         pass
 
-    def compute_m_t(self, current_segment, past_next_changepoint, meta_name_tensor_one_hot):
+    def compute_m_t(self, segment_id, meta_name_tensor):
         """m_t represents the value at the origin(t=0) that we would need to have so that if we use (k_t + k_0) as
         slope, we reach the same value at time = chagepoint_start_of_segment_i as we would reach by following the
         segmented slope (having in each segment the slope trend_deltas(i) + k_0)
 
         Parameters
         ----------
-            current_segment : torch.Tensor, int
-                segment corresponding to time t (batch_size, n_forecasts, segments (+ 1))
-
-            past_next_changepoint : torch.Tensor, bool
-                whether the a changepoint >= time t (batch_size, n_forecasts, segments (+ 1))
+            segment_id : torch.Tensor, int
+                segment corresponding to time t (batch_size, n_forecasts)
 
-            meta_name_tensor_one_hot : torch.Tensor, float
+            meta_name_tensor : torch.Tensor, int
                 Metadata about the all the samples of the model input batch.
 
                 Contains the following:
@@ -164,7 +228,7 @@ class PiecewiseLinearTrend(Trend):
 
         pass
 
-    def compute_trend(self, t, k_t, m_t, meta_name_tensor_one_hot=None):
+    def compute_trend(self, t, k_t, m_t, meta_name_tensor=None):
         """This method computes the trend component of the model.
 
 
@@ -179,7 +243,7 @@ class PiecewiseLinearTrend(Trend):
             m_t : torch.Tensor, bool
                 see compute_m_t
 
-            meta_name_tensor_one_hot : torch.Tensor, float
+            meta_name_tensor : torch.Tensor, int
                 Metadata about the all the samples of the model input batch.
 
                 Contains the following:
@@ -203,64 +267,30 @@ class GlobalPiecewiseLinearTrend(PiecewiseLinearTrend):
             device=device,
         )
 
-    def compute_k_t(self, current_segment, past_next_changepoint, meta_name_tensor_one_hot=None):
+    def compute_k_t(self, segment_id, meta_name_tensor=None):
         """This method overrides the method from the PiecewiseLinear class."""
-        # For segmentwise k_t, is the model parameter representing the trend slope(actually, trend slope-k_0) in the
-        # current_segment at time t (for each sample of the batch).
         # k_t = k_t(current_segment).
         # dimensions - batch_size, n_forecasts, quantiles_size
-        k_t = torch.sum(
-            current_segment.unsqueeze(dim=2) * self.trend_deltas.permute(1, 0, 2).unsqueeze(1),
-            dim=-1,
-        )
-
-        # For not segmentwise k_t is the model parameter representing the difference between trend slope in the
-        # current_segment at time t and the trend slope in the previous segment (for each sample of the batch).
-        if not self.segmentwise_trend:
-            # k_t = k_t(current_segment, previous_segment)
-            # dimensions - batch_size, n_forecasts, quantiles_size
-            previous_deltas_t = torch.sum(
-                past_next_changepoint.unsqueeze(dim=2) * self.trend_deltas.permute(1, 0, 2)[:, :, :-1].unsqueeze(dim=0),
-                dim=-1,
-            )
-            k_t = k_t + previous_deltas_t
-
-        return k_t
+        return self.select_segment(self.k_t_by_segment(self.trend_deltas), segment_id)
 
-    def compute_m_t(self, current_segment, past_next_changepoint, meta_name_tensor_one_hot=None):
+    def compute_m_t(self, segment_id, meta_name_tensor=None):
         """This method overrides the method from the PiecewiseLinear class."""
         # Computing m_t.
         # m_t represents the value at the origin(t=0) that we would need to have so that if we use (k_t + k_0) as slope,
         # we reach the same value at time = chagepoint_start_of_segment_i
         # that the segmented slope (having in each segment the slope trend_deltas(i) + k_0)
         if self.config_trend.growth != "discontinuous":
-            # Intermediate computation: deltas.
-            # `deltas`` is representing the difference between trend slope in the current_segment at time t
-            #  and the trend slope in the previous segment.
-            if self.segmentwise_trend:
-                # dimensions - quantiles, num_trends_modelled, segments
-                deltas = self.trend_deltas[:, :, :] - torch.cat((self.trend_k0, self.trend_deltas[:, :, 0:-1]), dim=2)
-
-            else:
-                deltas = self.trend_deltas
-
-            # dimensions - quantiles, 1, segments
-            gammas = -self.trend_changepoints_t[1:] * deltas[:, :, 1:]
-            # dimensions - batch_size, n_forecasts, quantiles
-            m_t = torch.sum(past_next_changepoint.unsqueeze(dim=2) * gammas.permute(1, 0, 2).unsqueeze(1), dim=-1)
-
-            if not self.segmentwise_trend:
-                m_t = m_t.detach()
+            # dimensions - quantiles, 1, segments (+ 1)
+            m_t_by_segment = self.m_t_by_segment(self.trend_k0, self.trend_deltas)
         else:
             # For discontinuous, trend_m is a parameter to optimize, as it is not defined just
             # by trend_deltas & trend_k0
-            # m_t = m_t(current_segment)
-            # dimensions - batch_size, n_forecasts, quantiles
-            m_t = torch.sum(current_segment.unsqueeze(dim=2) * self.trend_m.permute(1, 0, 2).unsqueeze(dim=0), dim=-1)
-
-        return m_t
+            m_t_by_segment = self.trend_m
+        # m_t = m_t(current_segment)
+        # dimensions - batch_size, n_forecasts, quantiles
+        return self.select_segment(m_t_by_segment, segment_id)
 
-    def compute_trend(self, t, k_t, m_t, meta_name_tensor_one_hot=None):
+    def compute_trend(self, t, k_t, m_t, meta_name_tensor=None):
         """This method overrides the method from the PiecewiseLinear class."""
         # Computing trend value at time(t) for each batch sample.
         # dimensions - batch_size, n_forecasts, quantiles
@@ -278,86 +308,38 @@ class LocalPiecewiseLinearTrend(PiecewiseLinearTrend):
             device=device,
         )
 
-    def compute_k_t(self, current_segment, past_next_changepoint, meta_name_tensor_one_hot):
+    def compute_k_t(self, segment_id, meta_name_tensor):
         """This method overrides the method from the PiecewiseLinear class."""
-        # For segmentwise k_t, is the model parameter representing the trend slope(actually, trend slope-k_0) in the
-        # current_segment at time t (for each sample of the batch).
         # k_t = k_t(current_segment, sample metadata)
         # dimensions - quantiles, batch_size, segments (+ 1)
-        trend_deltas_by_sample = torch.sum(
-            meta_name_tensor_one_hot.unsqueeze(dim=0).unsqueeze(dim=-1) * self.trend_deltas.unsqueeze(dim=1), dim=2
-        )
+        trend_deltas_by_sample = select_by_id(self.trend_deltas, meta_name_tensor)
         # dimensions - batch_size, n_forecasts, quantiles_size
-        k_t = torch.sum(current_segment.unsqueeze(dim=2) * trend_deltas_by_sample.permute(1, 0, 2).unsqueeze(1), dim=-1)
-
-        # For not segmentwise k_t is the model parameter representing the difference between trend slope in the
-        # current_segment at time t and the trend slope in the previous segment (for each sample of the batch).
-        if not self.segmentwise_trend:
-            # k_t = k_t(current_segment, previous_segment, sample metadata)
-            previous_deltas_t = torch.sum(
-                past_next_changepoint.unsqueeze(dim=2)
-                * trend_deltas_by_sample.permute(1, 0, 2)[:, :, :-1].unsqueeze(dim=1),
-                dim=-1,
-            )
-            # dimensions - batch_size, n_forecasts, quantiles_size
-            k_t = k_t + previous_deltas_t
-
-        return k_t
+        return self.select_segment(self.k_t_by_segment(trend_deltas_by_sample), segment_id)
 
-    def compute_m_t(self, current_segment, past_next_changepoint, meta_name_tensor_one_hot=None):
+    def compute_m_t(self, segment_id, meta_name_tensor=None):
         """This method overrides the method from the PiecewiseLinear class."""
         # Computing m_t.
         # m_t represents the value at the origin(t=0) that we would need to have so that if we use (k_t + k_0) as slope,
         # we reach the same value at time = chagepoint_start_of_segment_i
         # that the segmented slope (having in each segment the slope trend_deltas(i) + k_0)
         if self.config_trend.growth != "discontinuous":
-            # Intermediate computation: deltas.
-            # `deltas`` is representing the difference between trend slope in the current_segment at time t
-            #  and the trend slope in the previous segment.
-            if self.segmentwise_trend:
-                # dimensions - quantiles, num_trends_modelled, segments
-                deltas = self.trend_deltas[:, :, :] - torch.cat((self.trend_k0, self.trend_deltas[:, :, 0:-1]), dim=2)
-
-            else:
-                deltas = self.trend_deltas
-
-            # We create a dict of gammas based on the df_name
-            # m_t = m_t(current_segment, sample metadata)
-            # dimensions - quantiles, num_time_series, segments
-            gammas_0 = -self.trend_changepoints_t[1:] * deltas[:, :, 1:]
-            # dimensions - quantiles, segments, batch_size
-            gammas = torch.sum(
-                torch.transpose(meta_name_tensor_one_hot, 1, 0).unsqueeze(dim=-2).unsqueeze(dim=0)
-                * torch.unsqueeze(gammas_0, dim=-1),
-                dim=1,
+            # dimensions - quantiles, batch_size, segments (+ 1)
+            m_t_by_segment = self.m_t_by_segment(
+                select_by_id(self.trend_k0, meta_name_tensor), select_by_id(self.trend_deltas, meta_name_tensor)
             )
-            # dimensions - batch_size, n_forecasts, quantiles
-            m_t = torch.sum(past_next_changepoint.unsqueeze(2) * gammas.permute(2, 0, 1).unsqueeze(1), dim=-1)
-
-            if not self.segmentwise_trend:
-                m_t = m_t.detach()
         else:
             # For discontinuous, trend_m is a parameter to optimize, as it is not defined just
             # by trend_deltas & trend_k0
-            # m_t = m_t(current_segment, sample metadata)
-            # dimensions - quantiles, batch_size, segments
-            m_t_0 = torch.sum(
-                meta_name_tensor_one_hot.unsqueeze(dim=0).unsqueeze(dim=-1) * self.trend_m.unsqueeze(dim=1), dim=2
-            )
-            # dimensions - batch_size, n_forecasts, quantiles
-            m_t = torch.sum(
-                current_segment.unsqueeze(dim=2) * m_t_0.permute(1, 0, 2).unsqueeze(dim=1),
-                dim=-1,
-            )
-
-        return m_t
+            # dimensions - quantiles, batch_size, segments (+ 1)
+            m_t_by_segment = select_by_id(self.trend_m, meta_name_tensor)
+        # m_t = m_t(current_segment, sample metadata)
+        # dimensions - batch_size, n_forecasts, quantiles
+        return self.select_segment(m_t_by_segment, segment_id)
 
-    def compute_trend(self, t, k_t, m_t, meta_name_tensor_one_hot=None):
+    def compute_trend(self, t, k_t, m_t, meta_name_tensor=None):
         """This method overrides the method from the PiecewiseLinear class."""
         # Computing trend value at time(t) for each batch sample.
         # trend_k_0 = trend_k_0(current_segment, sample metadata)
-        trend_k_0 = torch.sum(
-            meta_name_tensor_one_hot.unsqueeze(dim=0).unsqueeze(dim=-1) * self.trend_k0.unsqueeze(dim=1), dim=2
-        ).permute(1, 2, 0)
+        trend_k_0 = select_by_id(self.trend_k0, meta_name_tensor).permute(1, 2, 0)
         # dimensions - batch_size, n_forecasts, quantiles
         return (trend_k_0 + k_t) * t.unsqueeze(dim=2) + m_t
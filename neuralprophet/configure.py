@@ -56,6 +56,21 @@ class Normalization:
             global_time_normalization=self.global_normalization,
         )
 
+    def init_data_params_from_stream(self, streaming_data_params):
+        """Sets the data params accumulated in a streaming pass over chunks of data.
+
+        Parameters
+        ----------
+            streaming_data_params : data.stream.StreamingDataParams
+                data params accumulated over all chunks of the training data
+        """
+        if len(streaming_data_params.local_data_params) == 1 and not self.global_normalization:
+            log.info("Setting normalization to global as only one dataframe provided for training.")
+            self.global_normalization = True
+        self.local_data_params, self.global_data_params = streaming_data_params.get_data_params(
+            global_time_normalization=self.global_normalization
+        )
+
     def get_data_params(self, df_name):
         if self.global_normalization:
             data_params = self.global_data_params
@@ -104,8 +119,11 @@ class Train:
     n_data: int = field(init=False)
     loss_func_name: str = field(init=False)
     lr_finder_args: dict = field(default_factory=dict)
+    lr_finder: str = "lightning"
 
     def __post_init__(self):
+        if self.lr_finder not in ["lightning", "fast"]:
+            raise ValueError(f"Learning rate finder {self.lr_finder} not supported, use 'lightning' or 'fast'.")
         # assert the uncertainty estimation params and then finalize the quantiles
         self.set_quantiles()
         assert self.newer_samples_weight >= 1.0
@@ -344,7 +362,9 @@ class ConfigSeasonality:
     condition_name: Optional[str] = None
 
     def __post_init__(self):
-        if self.reg_lambda > 0 and self.computation == "fourier":
+        if self.computation not in ["fourier", "fourier_fused"]:
+            raise ValueError(f"Seasonality computation '{self.computation}' not implemented.")
+        if self.reg_lambda > 0 and self.computation in ["fourier", "fourier_fused"]:
             log.info("Note: Fourier-based seasonality regularization is experimental.")
             self.reg_lambda = 0.001 * self.reg_lambda
 
@@ -68,34 +68,48 @@ def _reshape_raw_predictions_to_forecst_df(
     # Receives df with single ID column
     assert len(df["ID"].unique()) == 1
     cols = ["ds", "y", "ID"]  # cols to keep from df
-    df_forecast = pd.concat((df[cols],), axis=1)
-    # create a line for each forecast_lag
-    # 'yhat<i>' is the forecast for 'y' at 'ds' from i steps ago.
-    for j in range(len(quantiles)):
-        for forecast_lag in range(1, n_forecasts + 1):
-            forecast = predicted[:, forecast_lag - 1, j]
+    n_rows = len(df)
+    n_samples = predicted.shape[0]
+    lags = np.arange(1, n_forecasts + 1)
+    # rows[i, forecast_lag - 1] is the row of the forecast of sample i for forecast_lag, i.e. its target datetime
+    if prediction_frequency is None:
+        rows = max_lags + np.arange(n_samples)[:, np.newaxis] + lags[np.newaxis, :] - 1
+    else:
+        # calendar features are derived once and sliced for each forecast lag
+        calendar = df_utils.CalendarIndex.from_ds(df["ds"])
+        rows = np.empty((n_samples, n_forecasts), dtype=np.int64)
+        for forecast_lag in lags:
             pad_before = max_lags + forecast_lag - 1
             pad_after = n_forecasts - forecast_lag
-            yhat = np.pad(forecast, (pad_before, pad_after), mode="constant", constant_values=np.NaN)
-            if prediction_frequency is not None:
-                ds = df_forecast["ds"].iloc[pad_before : -pad_after if pad_after > 0 else None]
-                mask = df_utils.create_mask_for_prediction_frequency(
-                    prediction_frequency=prediction_frequency,
-                    ds=ds,
-                    forecast_lag=forecast_lag,
-                )
-                yhat = np.full((len(ds),), np.nan)
-                yhat[mask] = forecast
-                yhat = np.pad(yhat, (pad_before, pad_after), mode="constant", constant_values=np.NaN)
-            # 0 is the median quantile index
-            if j == 0:
-                name = f"yhat{forecast_lag}"
-            else:
-                name = f"yhat{forecast_lag} {round(quantiles[j] * 100, 1)}%"
-            df_forecast[name] = yhat
+            mask = df_utils.create_mask_for_prediction_frequency(
+                prediction_frequency=prediction_frequency,
+                ds=df["ds"].iloc[pad_before : n_rows - pad_after],
+                forecast_lag=forecast_lag,
+                calendar=calendar[pad_before : n_rows - pad_after],
+            )
+            rows[:, forecast_lag - 1] = pad_before + np.flatnonzero(mask)
+
+    def scatter_forecasts(values, n_quantiles):
+        # block of forecasts for each forecast lag (inner) and quantile (outer), NaN where not forecasted
+        # predictions filtered by prediction frequency are filled into a float64 block
+        dtype = values.dtype if prediction_frequency is None else np.result_type(values.dtype, np.float64)
+        block = np.full((n_rows, n_quantiles * n_forecasts), np.nan, dtype=dtype)
+        for j in range(n_quantiles):
+            block[rows, j * n_forecasts + lags - 1] = values[:, :, j]
+        return block
+
+    # 'yhat<i>' is the forecast for 'y' at 'ds' from i steps ago.
+    # 0 is the median quantile index
+    names = [f"yhat{forecast_lag}" for forecast_lag in lags]
+    for j in range(1, len(quantiles)):
+        names += [f"yhat{forecast_lag} {round(quantiles[j] * 100, 1)}%" for forecast_lag in lags]
+    blocks = [
+        df[cols],
+        pd.DataFrame(scatter_forecasts(predicted, len(quantiles)), index=df.index, columns=pd.Index(names)),
+    ]
 
     if components is None:
-        return df_forecast
+        return pd.concat(blocks, axis=1)
 
     # else add components
     lagged_components = [
@@ -106,69 +120,37 @@ def _reshape_raw_predictions_to_forecst_df(
             lagged_components.append(f"lagged_regressor_{name}")
     for comp in lagged_components:
         if comp in components:
-            for j in range(len(quantiles)):
-                for forecast_lag in range(1, n_forecasts + 1):
-                    forecast = components[comp][:, forecast_lag - 1, j]  # 0 is the median quantile
-                    pad_before = max_lags + forecast_lag - 1
-                    pad_after = n_forecasts - forecast_lag
-                    yhat = np.pad(forecast, (pad_before, pad_after), mode="constant", constant_values=np.NaN)
-                    if prediction_frequency is not None:
-                        ds = df_forecast["ds"].iloc[pad_before : -pad_after if pad_after > 0 else None]
-                        mask = df_utils.create_mask_for_prediction_frequency(
-                            prediction_frequency=prediction_frequency,
-                            ds=ds,
-                            forecast_lag=forecast_lag,
-                        )
-                        yhat = np.full((len(ds),), np.nan)
-                        yhat[mask] = forecast
-                        yhat = np.pad(yhat, (pad_before, pad_after), mode="constant", constant_values=np.NaN)
-                    if j == 0:  # temporary condition to add only the median component
-                        name = f"{comp}{forecast_lag}"
-                        df_forecast[name] = yhat
+            # only the median component
+            names = [f"{comp}{forecast_lag}" for forecast_lag in lags]
+            blocks.append(pd.DataFrame(scatter_forecasts(components[comp], 1), index=df.index, columns=pd.Index(names)))
 
     # only for non-lagged components
-    for comp in components:
-        if comp not in lagged_components:
-            for j in range(len(quantiles)):
-                forecast_0 = components[comp][0, :, j]
-                forecast_rest = components[comp][1:, n_forecasts - 1, j]
-                yhat = np.pad(
-                    np.concatenate((forecast_0, forecast_rest)), (max_lags, 0), mode="constant", constant_values=np.NaN
-                )
-                if prediction_frequency is not None:
-                    date_list = []
-                    for key, value in prediction_frequency.items():
-                        if key == "daily-hour":
-                            dates_comp = dates[dates.dt.hour == value]
-                        elif key == "weekly-day":
-                            dates_comp = dates[dates.dt.dayofweek == value]
-                        elif key == "monthly-day":
-                            dates_comp = dates[dates.dt.day == value]
-                        elif key == "yearly-month":
-                            dates_comp = dates[dates.dt.month == value]
-                        elif key == "hourly-minute":
-                            dates_comp = dates[dates.dt.minute == value]
-                        else:
-                            raise ValueError(f"prediction_frequency {key} not supported")
-                        date_list.append(dates_comp)
-                    # create new pd.Series only containing the dates that are in all Series in date_list
-                    dates_comp = pd.Series(date_list[0])
-                    for i in range(1, len(date_list)):
-                        dates_comp = dates_comp[dates_comp.isin(date_list[i])]
-                    ser = pd.Series(dtype="datetime64[ns]")
-                    for date in dates_comp:
-                        d = pd.date_range(date, periods=n_forecasts + 1, freq=freq)
-                        ser = pd.concat((ser, pd.Series(d).iloc[1:]))
-                    df_comp = pd.DataFrame({"ds": ser, "yhat": components[comp][:, :, j].flatten()}).drop_duplicates(
-                        subset="ds"
-                    )
-                    df_comp, _ = df_utils.add_missing_dates_nan(df=df_comp, freq=freq)
-                    yhat = pd.merge(df_forecast.filter(["ds", "ID"]), df_comp, on="ds", how="left")["yhat"].values
-                if j == 0:  # temporary condition to add only the median component
-                    # add yhat into dataframe, using df_forecast indexing
-                    yhat_df = pd.Series(yhat, name=comp).set_axis(df_forecast.index)
-                    df_forecast = pd.concat([df_forecast, yhat_df], axis=1, ignore_index=False)
-    return df_forecast
+    non_lagged_components = [comp for comp in components if comp not in lagged_components]
+    block = np.full((n_rows, len(non_lagged_components)), np.nan, dtype=np.result_type(*components.values()))
+    if prediction_frequency is None:
+        for k, comp in enumerate(non_lagged_components):
+            # only the median component
+            block[max_lags : max_lags + n_forecasts, k] = components[comp][0, :, 0]
+            block[max_lags + n_forecasts :, k] = components[comp][1:, n_forecasts - 1, 0]
+    else:
+        # only the prediction origins matching all prediction frequency filters
+        dates_comp = pd.DatetimeIndex(dates)[
+            df_utils.create_prediction_frequency_mask(df_utils.CalendarIndex.from_ds(dates), prediction_frequency)
+        ]
+        # rows of the datetimes 1 to n_forecasts steps after each prediction origin, -1 where not in df.
+        # located on a grid with the data frequency, spanning all origins and their forecasts
+        grid = pd.date_range(dates_comp[0], dates_comp[-1], freq=freq)
+        grid = grid.append(pd.date_range(grid[-1], periods=n_forecasts + 1, freq=freq)[1:])
+        steps = grid.get_indexer(dates_comp)[:, np.newaxis] + lags[np.newaxis, :]
+        comp_rows = pd.DatetimeIndex(df["ds"]).get_indexer(grid[steps.flatten()])
+        # the first forecast of each datetime is kept
+        comp_rows, first = np.unique(comp_rows, return_index=True)
+        first, comp_rows = first[comp_rows >= 0], comp_rows[comp_rows >= 0]
+        for k, comp in enumerate(non_lagged_components):
+            # only the median component
+            block[comp_rows, k] = components[comp][:, :, 0].flatten()[first]
+    blocks.append(pd.DataFrame(block, index=df.index, columns=pd.Index(non_lagged_components)))
+    return pd.concat(blocks, axis=1)
 
 
 def _convert_raw_predictions_to_raw_df(
@@ -206,26 +188,23 @@ def _convert_raw_predictions_to_raw_df(
             ... step3 is the prediction for 3 steps into the future,
             predicted using information up to (excluding) this datetime.
     """
-    all_data = predicted
-    df_raw = pd.DataFrame()
-    df_raw.insert(0, "ds", dates.values)
+    # predictions and dates are paired by position
+    n_samples = min(len(dates), len(predicted))
+    # per forecast lag: a column per quantile, then a column per component (for which quantiles are ignored for now)
+    values = [predicted[:n_samples]]
+    names = [[f"step{forecast_lag}" for forecast_lag in range(n_forecasts)]]  # 0 is the median quantile index
+    for quantile in quantiles[1:]:
+        names.append([f"step{forecast_lag} {quantile * 100}%" for forecast_lag in range(n_forecasts)])
+    if components is not None:
+        for comp_name, comp_data in components.items():
+            values.append(np.asarray(comp_data[:n_samples, :, :1]))
+            names.append([f"{comp_name}{forecast_lag}" for forecast_lag in range(n_forecasts)])
+    # columns ordered by forecast lag, then by quantile and component
+    block = np.concatenate(values, axis=2).reshape(n_samples, -1)
+    columns = [name for lag_names in zip(*names) for name in lag_names]
+    df_raw = pd.DataFrame(block, columns=pd.Index(columns))
+    df_raw.insert(0, "ds", dates.values[:n_samples])
     df_raw.insert(1, "ID", "__df__")  # type: ignore
-    for forecast_lag in range(n_forecasts):
-        for quantile_idx in range(len(quantiles)):
-            # 0 is the median quantile index
-            if quantile_idx == 0:
-                step_name = f"step{forecast_lag}"
-            else:
-                step_name = f"step{forecast_lag} {quantiles[quantile_idx] * 100}%"
-            data = all_data[:, forecast_lag, quantile_idx]
-            ser = pd.Series(data=data, name=step_name)
-            df_raw = df_raw.merge(ser, left_index=True, right_index=True)
-        if components is not None:
-            for comp_name, comp_data in components.items():
-                comp_name_ = f"{comp_name}{forecast_lag}"
-                data = comp_data[:, forecast_lag, 0]  # for components the quantiles are ignored for now
-                ser = pd.Series(data=data, name=comp_name_)
-                df_raw = df_raw.merge(ser, left_index=True, right_index=True)
     return df_raw
 
 
@@ -258,7 +237,6 @@ def _prepare_dataframe_to_predict(model, df: pd.DataFrame, max_lags: int, freq:
     # Receives df with ID column
     df_prepared = pd.DataFrame()
     for df_name, df_i in df.groupby("ID"):
-        df_i = df_i.copy(deep=True)
         _ = df_utils.infer_frequency(df_i, n_lags=max_lags, freq=freq)
         # check if received pre-processed df
         if "y_scaled" in df_i.columns or "t" in df_i.columns:
@@ -290,7 +268,7 @@ def _prepare_dataframe_to_predict(model, df: pd.DataFrame, max_lags: int, freq:
                 config_seasonality=model.config_seasonality,
                 predicting=True,
             )
-        df_prepared = pd.concat((df_prepared, df_i.copy(deep=True).reset_index(drop=True)), ignore_index=True)
+        df_prepared = pd.concat((df_prepared, df_i.reset_index(drop=True)), ignore_index=True)
     return df_prepared
 
 
@@ -406,7 +384,8 @@ def _check_dataframe(
             "Dataframe has less than n_forecasts + n_lags rows. "
             "Forecasting not possible. Please either use a larger dataset, or adjust the model parameters."
         )
-    df, _, _, _ = df_utils.prep_or_copy_df(df)
+    # check_dataframe copies df
+    df, _, _, _ = df_utils.prep_or_copy_df(df, copy=False)
     df, regressors_to_remove, lag_regressors_to_remove = df_utils.check_dataframe(
         df=df,
         check_y=check_y,
@@ -481,7 +460,10 @@ def _handle_missing_data(
         The pre-processed DataFrame, including imputed missing data, if applicable.
 
     """
-    df, _, _, _ = df_utils.prep_or_copy_df(df)
+    # df is owned by the caller, which continues with the returned df only
+    df, _, _, _ = df_utils.prep_or_copy_df(df, copy=False)
+    # store the rows of each series contiguously and in chronological order
+    df = time_dataset.sort_by_id_and_ds(df)
 
     if n_lags == 0 and not predicting:
         # drop rows with NaNs in y and count them
@@ -493,34 +475,29 @@ def _handle_missing_data(
 
     if n_lags > 0:
         # add missig dates to df
-        df_grouped = df.groupby("ID").apply(lambda x: x.set_index("ds").resample(freq).asfreq()).drop(columns=["ID"])
-        n_missing_dates = len(df_grouped) - len(df)
+        df_resampled, n_missing_dates = df_utils.add_missing_dates_nan_by_id(df, freq)
         if n_missing_dates > 0:
-            df = df_grouped.reset_index()
+            df = df_resampled
             log.info(f"Added {n_missing_dates} missing dates.")
 
     if config_regressors is not None and config_regressors.regressors is not None:
         # drop complete row for future regressors that are NaN at the end
-        last_valid_index = df.groupby("ID")[list(config_regressors.regressors.keys())].apply(
-            lambda x: x.last_valid_index()
-        )
-        df_dropped = df.groupby("ID", group_keys=False).apply(lambda x: x.loc[: last_valid_index[x.name]])
-        n_dropped = len(df) - len(df_dropped)
+        is_trailing = _is_trailing_nan(df, list(config_regressors.regressors.keys()))
+        n_dropped = int(is_trailing.sum())
         if n_dropped > 0:
-            df = df_dropped
+            df = df.take(np.flatnonzero(~is_trailing))
             log.info(f"Dropped {n_dropped} rows at the end with NaNs in future regressors.")
 
     dropped_trailing_y = False
     if df["y"].isna().any():
         # drop complete row if y of ID ends with nan
-        last_valid_index = df.groupby("ID")["y"].apply(lambda x: x.last_valid_index())
-        df_dropped = df.groupby("ID", group_keys=False).apply(lambda x: x.loc[: last_valid_index[x.name]])
-        n_dropped = len(df) - len(df_dropped)
+        is_trailing = _is_trailing_nan(df, ["y"])
+        n_dropped = int(is_trailing.sum())
         if n_dropped > 0:
             dropped_trailing_y = True
             # save dropped rows for later
-            df_to_add = df.groupby("ID", group_keys=False).apply(lambda x: x.loc[last_valid_index[x.name] + 1 :])
-            df = df_dropped
+            df_to_add = df.take(np.flatnonzero(is_trailing))
+            df = df.take(np.flatnonzero(~is_trailing))
             log.info(f"Dropped {n_dropped} rows at the end with NaNs in 'y' column.")
 
     if config_missing.impute_missing:
@@ -546,19 +523,21 @@ def _handle_missing_data(
                 )
             )
             data_columns.extend(conditional_cols)
+        id_offsets = df_utils.get_series_offsets(df["ID"].to_numpy())
         for column in data_columns:
             sum_na = df[column].isna().sum()
             if sum_na > 0:
                 log.warning(f"{sum_na} missing values in column {column} were detected in total. ")
                 # use 0 substitution for holidays and events missing values
                 if config_events is not None and column in config_events.keys():
-                    df[column].fillna(0, inplace=True)
+                    df[column] = df[column].fillna(0)
                     remaining_na = 0
                 else:
                     df.loc[:, column], remaining_na = df_utils.fill_linear_then_rolling_avg(
-                        df[column],
+                        df.loc[:, column],
                         limit_linear=config_missing.impute_linear,
                         rolling=config_missing.impute_rolling,
+                        id_offsets=id_offsets,
                     )
                 log.info(f"{sum_na - remaining_na} NaN values in column {column} were auto-imputed.")
                 if remaining_na > 0:
@@ -571,11 +550,36 @@ def _handle_missing_data(
         # add trailing y values again if in predict mode
         df = pd.concat([df, df_to_add])
         if config_seasonality is not None and len(conditional_cols) > 0:
-            df[conditional_cols] = df[conditional_cols].ffill()  # type: ignore
+            df[conditional_cols] = df.groupby("ID", sort=False)[conditional_cols].ffill()  # type: ignore
     return df
 
 
-def _create_dataset(model, df, predict_mode, prediction_frequency=None):
+def _is_trailing_nan(df, columns):
+    """Marks the rows after the last row of each series with a value in any of the columns.
+
+    Parameters
+    ----------
+        df : pd.DataFrame
+            dataframe containing column ``ID`` and columns, sorted by ``ID`` and ``ds``
+        columns : list
+            names of the columns to check
+
+    Returns
+    -------
+        np.array
+            boolean mask of the trailing rows, none for series without any value
+    """
+    if len(df) == 0:
+        return np.zeros(0, dtype=bool)
+    offsets = df_utils.get_series_offsets(df["ID"].values)
+    positions = np.arange(len(df))
+    has_value = df[columns].notna().to_numpy().any(axis=1)
+    last_valid = np.maximum.reduceat(np.where(has_value, positions, -1), offsets[:-1])
+    last_valid = np.repeat(last_valid, np.diff(offsets))
+    return (positions > last_valid) & (last_valid >= 0)
+
+
+def _create_dataset(model, df, predict_mode, prediction_frequency=None, precompute_tensors=True):
     """Construct dataset from dataframe.
 
     (Configured Hyperparameters can be overridden by explicitly supplying them.
@@ -607,12 +611,14 @@ def _create_dataset(model, df, predict_mode, prediction_frequency=None):
 
             value: int
                 forecast origin of the predictions to be made, e.g. 7 for 7am in case of 'daily-hour'.
+        precompute_tensors : bool
+            convert model inputs once into float32 tensors, see ``TimeDataset``
 
     Returns
     -------
         TimeDataset
     """
-    df, _, _, _ = df_utils.prep_or_copy_df(df)
+    df, _, _, _ = df_utils.prep_or_copy_df(df, copy=False)
     return time_dataset.GlobalTimeDataset(
         df,
         predict_mode=predict_mode,
@@ -627,4 +633,7 @@ def _create_dataset(model, df, predict_mode, prediction_frequency=None):
         config_lagged_regressors=model.config_lagged_regressors,
         config_missing=model.config_missing,
         # config_train=model.config_train, # no longer needed since JIT tabularization.
+        precompute_tensors=precompute_tensors,
+        id_list=model.id_list,
+        sparse_events=model.sparse_events,
     )
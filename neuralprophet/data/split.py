@@ -56,7 +56,7 @@ def _maybe_extend_df(
         if periods_add[df_name] > 0:
             # This does not include future regressors or events.
             # periods should be 0 if those are configured.
-            last_date = pd.to_datetime(df_i["ds"].copy(deep=True)).sort_values().max()
+            last_date = pd.to_datetime(df_i["ds"]).max()
             future_df = df_utils.make_future_df(
                 df_columns=df_i.columns,
                 last_date=last_date,
@@ -68,7 +68,7 @@ def _maybe_extend_df(
             future_df["ID"] = df_name
             df_i = pd.concat([df_i, future_df])
             df_i.reset_index(drop=True, inplace=True)
-        extended_df = pd.concat((extended_df, df_i.copy(deep=True)), ignore_index=True)
+        extended_df = pd.concat((extended_df, df_i), ignore_index=True)
     return extended_df, periods_add
 
 
@@ -0,0 +1,351 @@
+import logging
+import math
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional, Sequence, Union, cast
+
+import numpy as np
+import pandas as pd
+
+from neuralprophet import df_utils
+from neuralprophet.configure import (
+    ConfigEvents,
+    ConfigFutureRegressors,
+    ConfigLaggedRegressors,
+    ConfigSeasonality,
+)
+
+log = logging.getLogger("NP.data.stream")
+
+
+class DataFrameChunks:
+    """Partitioned time series data, which is loaded one chunk at a time.
+
+    Each chunk is a dataframe with columns ``ds``, ``y``, optionally ``ID`` and further model inputs,
+    and must contain every series (``ID``) it holds completely, e.g. one partition per ID.
+    Only one chunk is kept in memory at a time, allowing to fit on datasets larger than memory.
+    """
+
+    def __init__(self, chunks: Sequence[Union[pd.DataFrame, str, Path, Callable]], columns: Optional[list] = None):
+        """
+        Parameters
+        ----------
+            chunks : list
+                Each chunk is given by a
+
+                    * ``pd.DataFrame``, e.g. for testing
+                    * path of a Parquet file (requires ``pyarrow`` or ``fastparquet``)
+                    * Arrow object with ``to_table`` (e.g. a ``pyarrow.dataset`` fragment) or ``to_pandas``
+                    * callable returning a ``pd.DataFrame``
+            columns : list
+                Columns to read from Parquet files and Arrow objects, all columns if None
+        """
+        self.chunks = list(chunks)
+        self.columns = columns
+
+    @classmethod
+    def from_parquet(cls, path: Union[str, Path], columns: Optional[list] = None):
+        """Creates chunks from a Parquet file or a directory of Parquet files, one chunk per file.
+
+        Note
+        ----
+        In Hive partitioned directories (e.g. ``ID=series_a/part-0.parquet``), the ``ID`` column
+        is restored from the directory name, if missing in the file.
+
+        Parameters
+        ----------
+            path : str, Path
+                Parquet file or directory containing Parquet files (searched recursively)
+            columns : list
+                Columns to read, all columns if None
+
+        Returns
+        -------
+            DataFrameChunks
+        """
+        path = Path(path)
+        files = sorted(path.rglob("*.parquet")) if path.is_dir() else [path]
+        if len(files) == 0:
+            raise ValueError(f"No Parquet files found in {path}")
+        return cls(files, columns=columns)
+
+    @classmethod
+    def from_arrow_dataset(cls, dataset, columns: Optional[list] = None):
+        """Creates chunks from a ``pyarrow.dataset.Dataset``, one chunk per fragment.
+
+        Parameters
+        ----------
+            dataset : pyarrow.dataset.Dataset
+                Arrow dataset, e.g. ``pyarrow.dataset.dataset(path, partitioning="hive")``
+            columns : list
+                Columns to read, all columns if None
+
+        Returns
+        -------
+            DataFrameChunks
+        """
+        return cls(list(dataset.get_fragments()), columns=columns)
+
+    def __len__(self):
+        return len(self.chunks)
+
+    def __getitem__(self, index) -> pd.DataFrame:
+        """Loads a chunk.
+
+        Parameters
+        ----------
+            index : int
+                Position of the chunk
+
+        Returns
+        -------
+            pd.DataFrame
+                data of the chunk
+        """
+        chunk = self.chunks[index]
+        if isinstance(chunk, pd.DataFrame):
+            return chunk.copy(deep=True)
+        if isinstance(chunk, (str, Path)):
+            df = pd.read_parquet(chunk, columns=self.columns)
+            if "ID" not in df.columns:
+                partition = [part for part in Path(chunk).parts if part.startswith("ID=")]
+                if len(partition) > 0:
+                    df["ID"] = partition[-1][len("ID=") :]
+            return df
+        if hasattr(chunk, "to_table"):
+            return chunk.to_table(columns=self.columns).to_pandas()
+        if hasattr(chunk, "to_pandas"):
+            df = chunk.to_pandas()
+            return df if self.columns is None else df.loc[:, self.columns]
+        if callable(chunk):
+            return cast(pd.DataFrame, chunk())
+        raise ValueError(f"Unsupported chunk type {type(chunk)}")
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+class ColumnStatistics:
+    """Statistics of a column, accumulated over chunks of data to compute its normalization parameters."""
+
+    def __init__(self, sample_size: int, rng: np.random.Generator):
+        """
+        Parameters
+        ----------
+            sample_size : int
+                Size of the uniform random sample of values, used to estimate quantiles
+            rng : np.random.Generator
+                Random number generator for sampling
+        """
+        self.sample_size = sample_size
+        self.rng = rng
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        # first (up to) three distinct values, including NaN, as counted by auto_normalization_setting
+        self.distinct = np.array([])
+        self.sample = np.array([])
+        self.sample_keys = np.array([])
+
+    def update(self, array: np.ndarray):
+        """Adds the values of a chunk.
+
+        Parameters
+        ----------
+            array : np.array
+                values of the column in the chunk
+        """
+        array = np.asarray(array, dtype=np.float64)
+        self.distinct = np.unique(np.concatenate((self.distinct, np.unique(array)[:3])))[:3]
+        values = array[~np.isnan(array)]
+        if len(values) == 0:
+            return
+        # merge mean and sum of squared deviations of chunk (Chan et al.)
+        count = len(values)
+        mean = float(np.mean(values))
+        m2 = float(np.sum(np.square(values - mean)))
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta**2 * self.count * count / total
+        self.count = total
+        self.min = min(self.min, float(np.min(values)))
+        self.max = max(self.max, float(np.max(values)))
+        # uniform sample without replacement: keep the values with the smallest random keys
+        sample = np.concatenate((self.sample, values))
+        sample_keys = np.concatenate((self.sample_keys, self.rng.random(count)))
+        if len(sample) > self.sample_size:
+            keep = np.argpartition(sample_keys, self.sample_size)[: self.sample_size]
+            sample, sample_keys = sample[keep], sample_keys[keep]
+        self.sample, self.sample_keys = sample, sample_keys
+
+    def get_normalization_params(self, norm_type: str) -> df_utils.ShiftScale:
+        """Computes normalization parameters like ``df_utils.get_normalization_params``.
+
+        Note
+        ----
+        Quantiles (of ``soft`` and ``soft1``) are estimated from the sample, all other statistics are exact.
+
+        Parameters
+        ----------
+            norm_type : str
+                Type of normalization, see ``df_utils.get_normalization_params``
+
+        Returns
+        -------
+            ShiftScale
+                normalization parameters
+        """
+        if norm_type == "auto":
+            norm_type = df_utils.auto_normalization_setting(self.distinct)
+        shift = 0.0
+        scale = 1.0
+        if norm_type == "soft":
+            width = float(np.quantile(self.sample, 0.95)) - self.min
+            if math.isclose(width, 0):
+                width = self.max - self.min
+            shift = self.min
+            scale = width
+        elif norm_type == "soft1":
+            width = float(np.quantile(self.sample, 0.9)) - self.min
+            if math.isclose(width, 0):
+                width = (self.max - self.min) / 1.25
+            shift = self.min - 0.125 * width
+            scale = 1.25 * width
+        elif norm_type == "minmax":
+            shift = self.min
+            scale = self.max - shift
+        elif norm_type == "standardize":
+            shift = self.mean
+            scale = math.sqrt(self.m2 / self.count)
+        elif norm_type != "off":
+            log.error(f"Normalization {norm_type} not defined.")
+        return df_utils.ShiftScale(shift, scale)
+
+
+class StreamingDataParams:
+    """Computes the data params of ``df_utils.init_data_params`` in a single pass over chunks of data.
+
+    Local data params are computed exactly from each (complete) series.
+    Global data params are computed from accumulated statistics, with quantiles estimated from a bounded
+    uniform sample of each column, which is exact as long as a column has no more than ``sample_size`` values.
+    """
+
+    def __init__(
+        self,
+        normalize="auto",
+        config_lagged_regressors: Optional[ConfigLaggedRegressors] = None,
+        config_regressors: Optional[ConfigFutureRegressors] = None,
+        config_events: Optional[ConfigEvents] = None,
+        config_seasonality: Optional[ConfigSeasonality] = None,
+        global_normalization=False,
+        sample_size: int = 100000,
+        seed: int = 0,
+    ):
+        """
+        Parameters
+        ----------
+            normalize : str
+                Type of normalization, see ``df_utils.init_data_params``
+            config_lagged_regressors : configure.ConfigLaggedRegressors
+                Configurations for lagged regressors
+            config_regressors : configure.ConfigFutureRegressors
+                extra regressors (with known future values)
+            config_events : configure.ConfigEvents
+                user specified events configs
+            config_seasonality : configure.ConfigSeasonality
+                user specified seasonality configs
+            global_normalization : bool
+                whether global normalization is used, see ``df_utils.init_data_params``
+            sample_size : int
+                maximal number of values per column kept to estimate global quantiles
+            seed : int
+                seed of the sampling
+        """
+        self.normalize = normalize
+        self.config_lagged_regressors = config_lagged_regressors
+        self.config_regressors = config_regressors
+        self.config_events = config_events
+        self.config_seasonality = config_seasonality
+        self.global_normalization = global_normalization
+        self.sample_size = sample_size
+        self.rng = np.random.default_rng(seed)
+        self.local_data_params = OrderedDict()
+        self.column_statistics = OrderedDict()
+        self.ds_min = None
+        self.ds_max = None
+
+    def update(self, df: pd.DataFrame):
+        """Adds a chunk of data.
+
+        Parameters
+        ----------
+            df : pd.DataFrame
+                data of complete series, containing columns ``ds``, ``y``, ``ID`` and further model inputs
+        """
+        for df_name, df_i in df.groupby("ID"):
+            if df_name in self.local_data_params:
+                raise ValueError(f"Series {df_name!r} is split across chunks, each series must be within one chunk.")
+            self.local_data_params[df_name] = df_utils.data_params_definition(
+                df=df_i.drop("ID", axis=1),
+                normalize=self.normalize,
+                config_lagged_regressors=self.config_lagged_regressors,
+                config_regressors=self.config_regressors,
+                config_events=self.config_events,
+                config_seasonality=self.config_seasonality,
+                local_run_despite_global=True if self.global_normalization else None,
+            )
+        ds_min, ds_max = df.loc[:, "ds"].min(), df.loc[:, "ds"].max()
+        self.ds_min = ds_min if self.ds_min is None else min(self.ds_min, ds_min)
+        self.ds_max = ds_max if self.ds_max is None else max(self.ds_max, ds_max)
+        for name, _ in self.get_normalized_columns():
+            if name in df.columns:
+                if name not in self.column_statistics:
+                    self.column_statistics[name] = ColumnStatistics(self.sample_size, self.rng)
+                self.column_statistics[name].update(df[name].values)
+
+    def get_normalized_columns(self):
+        """Columns with their normalization type, in the order of ``df_utils.data_params_definition``."""
+        columns = [("y", self.normalize)]
+        if self.config_lagged_regressors is not None:
+            columns += [(covar, config.normalize) for covar, config in self.config_lagged_regressors.items()]
+        if self.config_regressors is not None and self.config_regressors.regressors is not None:
+            columns += [(reg, config.normalize) for reg, config in self.config_regressors.regressors.items()]
+        return columns
+
+    def get_data_params(self, global_time_normalization=False):
+        """Gets the data params of all chunks added so far.
+
+        Parameters
+        ----------
+            global_time_normalization : bool
+                normalize time globally across all time series, see ``df_utils.init_data_params``
+
+        Returns
+        -------
+            OrderedDict
+                nested dict with data_params for each dataset
+            OrderedDict
+                global ShiftScale entries containing ``shift`` and ``scale`` parameters for each column
+        """
+        if self.ds_min is None or self.ds_max is None:
+            raise ValueError("No data added, the data params require at least one chunk.")
+        global_data_params = OrderedDict({})
+        global_data_params["ds"] = df_utils.ShiftScale(shift=self.ds_min, scale=self.ds_max - self.ds_min)
+        for name, norm_type in self.get_normalized_columns():
+            if name in self.column_statistics:
+                global_data_params[name] = self.column_statistics[name].get_normalization_params(norm_type)
+        if self.config_events is not None:
+            for event in self.config_events.keys():
+                global_data_params[event] = df_utils.ShiftScale()
+        if self.config_seasonality is not None:
+            for season in self.config_seasonality.periods.values():
+                if season.condition_name is not None:
+                    global_data_params[season.condition_name] = df_utils.ShiftScale()
+        if global_time_normalization:
+            for data_params in self.local_data_params.values():
+                data_params["ds"] = global_data_params["ds"]
+        return self.local_data_params, global_data_params
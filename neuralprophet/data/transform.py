@@ -1,5 +1,6 @@
 import logging
 
+import numpy as np
 import pandas as pd
 
 from neuralprophet import df_utils
@@ -24,12 +25,36 @@ def _normalize(df: pd.DataFrame, config_normalization: Normalization) -> pd.Data
     -------
         df: pd.DataFrame, normalized
     """
-    df, _, _, _ = df_utils.prep_or_copy_df(df)
-    df_norm = pd.DataFrame()
-    for df_name, df_i in df.groupby("ID"):
-        data_params = config_normalization.get_data_params(df_name)
-        df_i.drop("ID", axis=1, inplace=True)
-        df_aux = df_utils.normalize(df_i, data_params).copy(deep=True)
-        df_aux["ID"] = df_name
-        df_norm = pd.concat((df_norm, df_aux), ignore_index=True)
+    df, _, _, _ = df_utils.prep_or_copy_df(df, copy=False)
+    # Series ordered by ID, as when normalizing each series separately
+    df_names = sorted(df["ID"].unique())
+    codes = pd.Categorical(df["ID"], categories=df_names).codes
+    order = np.argsort(codes, kind="stable")
+    codes = codes[order]
+    # Single copy of the data, normalized in place
+    df_norm = df.drop(columns="ID").take(order).reset_index(drop=True)
+    data_params = [config_normalization.get_data_params(df_name) for df_name in df_names]
+    for name in list(df_norm.columns):
+        if any(name not in params.keys() for params in data_params):
+            raise ValueError(f"Unexpected column {name} in data")
+        new_name = name
+        if name == "ds":
+            new_name = "t"
+        if name == "y":
+            new_name = "y_scaled"
+        if df_norm[name].dtype == object:
+            # e.g. None in future values, only handled by scalar operations: normalize each series separately
+            offsets = np.searchsorted(codes, np.arange(len(df_names) + 1))
+            df_norm[new_name] = pd.concat(
+                [
+                    df_norm[name].iloc[offsets[i] : offsets[i + 1]].sub(params[name].shift).div(params[name].scale)
+                    for i, params in enumerate(data_params)
+                ]
+            )
+        else:
+            # shift and scale of the series of each row
+            shift = pd.Series([params[name].shift for params in data_params]).to_numpy()[codes]
+            scale = pd.Series([params[name].scale for params in data_params]).to_numpy()[codes]
+            df_norm[new_name] = df_norm[name].sub(shift).div(scale)
+    df_norm["ID"] = df["ID"].to_numpy()[order]
     return df_norm
@@ -3,8 +3,8 @@ from __future__ import annotations
 import logging
 import math
 from collections import OrderedDict
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, List, Optional, Tuple
+from dataclasses import dataclass, fields
+from typing import TYPE_CHECKING, List, Optional, Tuple, Union, cast
 
 import numpy as np
 import pandas as pd
@@ -22,12 +22,88 @@ class ShiftScale:
     scale: float = 1.0
 
 
-def prep_or_copy_df(df: pd.DataFrame) -> tuple[pd.DataFrame, bool, bool, list[str]]:
+# Calendar feature used by each prediction frequency key
+PREDICTION_FREQUENCY_CALENDAR_FEATURES = {
+    "hourly-minute": "minute",
+    "daily-hour": "hour",
+    "weekly-day": "dayofweek",
+    "monthly-day": "day",
+    "yearly-month": "month",
+}
+
+
+@dataclass
+class CalendarIndex:
+    """Calendar features of a datetime column as int8 arrays.
+
+    Computed once per dataframe and shared by all prediction frequency filters,
+    instead of re-deriving the datetime accessors for every filter.
+    """
+
+    minute: np.ndarray
+    hour: np.ndarray
+    dayofweek: np.ndarray
+    day: np.ndarray
+    month: np.ndarray
+    daysinmonth: np.ndarray
+
+    @classmethod
+    def from_ds(cls, ds) -> CalendarIndex:
+        """Create the calendar index of a datetime column.
+
+        Parameters
+        ----------
+            ds : pd.Series, pd.DatetimeIndex
+                datestamps
+
+        Returns
+        -------
+            CalendarIndex
+                calendar features, each of len(ds)
+        """
+        ds = pd.DatetimeIndex(pd.to_datetime(ds))
+        return cls(**{f.name: getattr(ds, f.name).to_numpy(dtype=np.int8) for f in fields(cls)})
+
+    def __len__(self) -> int:
+        return len(self.minute)
+
+    def __getitem__(self, key: Union[slice, np.ndarray]) -> CalendarIndex:
+        """Select rows of the calendar index, e.g. by slice or boolean mask."""
+        return CalendarIndex(**{f.name: getattr(self, f.name)[key] for f in fields(self)})
+
+
+def create_prediction_frequency_mask(calendar: CalendarIndex, prediction_frequency: dict) -> np.ndarray:
+    """Creates a mask of all datestamps matching every filter of the prediction frequency.
+
+    Parameters
+    ----------
+        calendar : CalendarIndex
+            calendar features of the datestamps
+        prediction_frequency : dict
+            identical to NeuralProphet
+
+    Returns
+    -------
+        np.array
+            boolean mask where all prediction frequency filters match
+    """
+    conditions = [np.ones(len(calendar), dtype=bool)]
+    for key, value in prediction_frequency.items():
+        if key not in PREDICTION_FREQUENCY_CALENDAR_FEATURES:
+            raise ValueError(f"Invalid prediction frequency: {key}")
+        conditions.append(getattr(calendar, PREDICTION_FREQUENCY_CALENDAR_FEATURES[key]) == value)
+    return np.logical_and.reduce(conditions)
+
+
+def prep_or_copy_df(df: pd.DataFrame, copy: bool = True) -> tuple[pd.DataFrame, bool, bool, list[str]]:
     """Copy df if it contains the ID column. Creates ID column with '__df__' if it is a df with a single time series.
     Parameters
     ----------
         df : pd.DataFrame
             df or dict containing data
+        copy : bool
+            whether to deep copy df. Stages receiving a df already prepared (and owned) by their caller, or only
+            reading it, pass ``False``: df is then returned as is, or as shallow copy if the ID column is added.
     Returns
     -------
         pd.DataFrames
@@ -42,10 +118,15 @@ def prep_or_copy_df(df: pd.DataFrame) -> tuple[pd.DataFrame, bool, bool, list[st
     if not isinstance(df, pd.DataFrame):
         raise ValueError("Provided DataFrame (df) must be of pd.DataFrame type.")
 
-    # Create a copy of the dataframe
-    df_copy = df.copy(deep=True)
+    df_has_id_column = "ID" in df.columns
 
-    df_has_id_column = "ID" in df_copy.columns
+    # Create a copy of the dataframe, unless it is already prepared and may be used as is
+    if copy:
+        df_copy = df.copy(deep=True)
+    elif not df_has_id_column:
+        df_copy = df.copy(deep=False)
+    else:
+        df_copy = df
 
     # If there is no ID column, then add one with a single value
     if not df_has_id_column:
@@ -80,10 +161,11 @@ def return_df_in_original_format(df, received_ID_col=False, received_single_time
         pd.Dataframe
             original input format
     """
-    new_df = df.copy(deep=True)
+    # df is created by the caller, a shallow copy suffices
+    new_df = df.copy(deep=False)
     if not received_ID_col and received_single_time_series:
         assert len(new_df["ID"].unique()) == 1
-        new_df.drop("ID", axis=1, inplace=True)
+        del new_df["ID"]
         log.info("Returning df with no ID column")
     return new_df
 
@@ -128,7 +210,7 @@ def merge_dataframes(df: pd.DataFrame) -> pd.DataFrame:
         raise ValueError("Can not join other than pd.DataFrames")
     if "ID" not in df.columns:
         raise ValueError("df does not contain 'ID' column")
-    df_merged = df.copy(deep=True).drop("ID", axis=1)
+    df_merged = df.drop("ID", axis=1)
     df_merged = df_merged.sort_values("ds")
     df_merged = df_merged.drop_duplicates(subset=["ds"])
     df_merged = df_merged.reset_index(drop=True)
@@ -308,8 +390,8 @@ def init_data_params(
             ShiftScale entries containing ``shift`` and ``scale`` parameters for each column
     """
     # Compute Global data params
-    df, _, _, _ = prep_or_copy_df(df)
-    df_merged = df.copy(deep=True).drop("ID", axis=1)
+    df, _, _, _ = prep_or_copy_df(df, copy=False)
+    df_merged = df.drop("ID", axis=1)
     global_data_params = data_params_definition(
         df_merged, normalize, config_lagged_regressors, config_regressors, config_events, config_seasonality
     )
@@ -1056,6 +1138,112 @@ def add_missing_dates_nan(df, freq):
     return df_resampled, num_added
 
 
+def get_series_offsets(ids: np.ndarray) -> np.ndarray:
+    """Gets the row offsets of each series, from the ``ID`` of rows which store every series contiguously.
+
+    Parameters
+    ----------
+        ids : np.array
+            ``ID`` of each row
+
+    Returns
+    -------
+        np.array
+            row offsets of length number of series + 1, series i is located at offsets[i]:offsets[i+1]
+    """
+    starts = np.flatnonzero(ids[1:] != ids[:-1]) + 1
+    return np.concatenate(([0], starts, [len(ids)])) if len(ids) > 0 else np.array([0])
+
+
+def _resampled_dates(first: np.ndarray, last: np.ndarray, freq: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Dates of ``resample(freq)`` between the first and last date of each series, concatenated.
+
+    Parameters
+    ----------
+        first, last : np.array
+            first and last date of each series, of dtype datetime64[ns]
+        freq : str
+            Frequency of data recording, any valid frequency for pd.date_range
+
+    Returns
+    -------
+        np.array
+            resampled dates of all series, of dtype datetime64[ns]
+        np.array
+            number of resampled dates of each series
+    """
+    offset = pd.tseries.frequencies.to_offset(freq)
+    if isinstance(offset, pd.offsets.Tick):
+        # resample bins fixed frequencies from midnight of the first day of a series
+        step = offset.nanos
+        origin = first.astype("datetime64[D]").astype("datetime64[ns]").view("i8")
+        start = first.view("i8") - (first.view("i8") - origin) % step
+        end = last.view("i8") - (last.view("i8") - origin) % step
+        counts = (end - start) // step + 1
+        series_starts = np.cumsum(counts) - counts
+        steps = np.arange(counts.sum()) - np.repeat(series_starts, counts)
+        return (np.repeat(start, counts) + steps * step).view("datetime64[ns]"), counts
+    # calendar frequencies: resample each distinct date range once
+    spans, inverse = np.unique(np.stack([first.view("i8"), last.view("i8")], axis=1), axis=0, return_inverse=True)
+    span_dates = [
+        pd.Series(0, index=pd.DatetimeIndex(np.unique(span).view("datetime64[ns]"))).resample(freq).asfreq().index
+        for span in spans
+    ]
+    counts = np.array([len(span_dates[i]) for i in inverse.reshape(-1)], dtype=np.int64)
+    dates = [span_dates[i].values for i in inverse.reshape(-1)]
+    return np.concatenate(dates) if dates else np.array([], dtype="datetime64[ns]"), counts
+
+
+def add_missing_dates_nan_by_id(df: pd.DataFrame, freq: str) -> Tuple[pd.DataFrame, int]:
+    """Fills missing datetimes in ``ds`` of each series, with NaN for all other columns except ``ID``.
+
+    Same as resampling each series like ``add_missing_dates_nan``, but the dates of all series are
+    created at once and the rows are reindexed in one go.
+
+    Parameters
+    ----------
+        df : pd.DataFrame
+            dataframe with columns ``ds`` datetimes and ``ID``, sorted by ``ID`` and ``ds``
+        freq : str
+            Frequency of data recording, any valid frequency for pd.date_range,
+            such as ``D`` or ``M``
+
+    Returns
+    -------
+        pd.DataFrame
+            dataframe without date-gaps but nan-values, with columns ``ID``, ``ds`` first
+        int
+            number of added rows
+    """
+    if len(df) == 0:
+        return df, 0
+    offsets = get_series_offsets(df["ID"].to_numpy())
+    ds = df["ds"].to_numpy(dtype="datetime64[ns]")
+    dates, counts = _resampled_dates(ds[offsets[:-1]], ds[offsets[1:] - 1], freq)
+    codes = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    date_codes = np.repeat(np.arange(len(offsets) - 1), counts)
+    # positions of the rows of each resampled date, -1 where a date is missing
+    indexer = pd.MultiIndex.from_arrays([codes, ds]).get_indexer(pd.MultiIndex.from_arrays([date_codes, dates]))
+    # resample relabels series which have the frequency already, but are not aligned with its dates
+    lengths = np.diff(offsets)
+    candidates = (counts == lengths) & (lengths >= 3)
+    if candidates.any():
+        candidate_offsets = np.concatenate(([0], np.cumsum(lengths[candidates])))
+        ds_candidates = ds[np.repeat(candidates, lengths)].view("i8")
+        dates_candidates = dates[np.repeat(candidates, counts)].view("i8")
+        irregular = np.ones(len(ds_candidates), dtype=bool)
+        irregular[1:] = np.diff(ds_candidates) != np.diff(dates_candidates)
+        irregular[candidate_offsets[:-1]] = False
+        regular = np.zeros(len(lengths), dtype=bool)
+        regular[candidates] = np.add.reduceat(irregular, candidate_offsets[:-1]) == 0
+        indexer[np.repeat(regular, counts)] = np.flatnonzero(np.repeat(regular, lengths))
+    df_resampled = df.drop(columns=["ID", "ds"]).reset_index(drop=True).reindex(np.where(indexer < 0, len(df), indexer))
+    df_resampled.reset_index(drop=True, inplace=True)
+    df_resampled.insert(0, "ds", dates)
+    df_resampled.insert(0, "ID", df["ID"].to_numpy()[offsets[date_codes]])
+    return df_resampled, len(df_resampled) - len(df)
+
+
 def create_dummy_datestamps(
     df, freq="S", startyear=1970, startmonth=1, startday=1, starthour=0, startminute=0, startsecond=0
 ):
@@ -1096,7 +1284,9 @@ def create_dummy_datestamps(
     return df_dummy
 
 
-def fill_linear_then_rolling_avg(series, limit_linear, rolling):
+def fill_linear_then_rolling_avg(
+    series: pd.Series, limit_linear: int, rolling: int, id_offsets: Optional[np.ndarray] = None
+) -> Tuple[pd.Series, int]:
     """Adds missing dates, fills missing values with linear imputation or trend.
 
     Parameters
@@ -1117,19 +1307,57 @@ def fill_linear_then_rolling_avg(series, limit_linear, rolling):
             ----
             window width is rolling + 2*limit_linear
 
+        id_offsets : np.array
+            row offsets of the time series stored contiguously in ``series``, see ``get_series_offsets``.
+            Each time series is imputed from its own values only. Default: ``series`` is a single time series.
+
     Returns
     -------
         pd.DataFrame
             manipulated dataframe containing filled values
     """
-    # impute small gaps linearly:
-    series = pd.to_numeric(series)
-    series = series.interpolate(method="linear", limit=limit_linear, limit_direction="both")
-    # fill remaining gaps with rolling avg
-    is_na = pd.isna(series)
-    rolling_avg = series.rolling(rolling + 2 * limit_linear, min_periods=2 * limit_linear, center=True).mean()
-    series.loc[is_na] = rolling_avg[is_na]
-    remaining_na = sum(series.isnull())
+    series = cast(pd.Series, pd.to_numeric(series))
+    if not series.isna().any():
+        return series, 0
+    if id_offsets is None:
+        id_offsets = np.array([0, len(series)])
+    values: np.ndarray = series.to_numpy(dtype="float64", copy=True)
+    positions = np.arange(len(values))
+    lengths = np.diff(id_offsets)
+    starts = np.repeat(id_offsets[:-1], lengths)
+    ends = np.repeat(id_offsets[1:], lengths)
+    is_na = np.isnan(values)
+    # closest valid values before and after each position, within its time series
+    prev_valid = np.maximum.accumulate(np.where(is_na, -1, positions))
+    next_valid = np.minimum.accumulate(np.where(is_na, len(values), positions)[::-1])[::-1]
+    has_prev = prev_valid >= starts
+    has_next = next_valid < ends
+    # impute small gaps linearly, like pd.Series.interpolate(method="linear", limit_direction="both")
+    near_prev = has_prev & (positions - prev_valid <= limit_linear)
+    near_next = has_next & (next_valid - positions <= limit_linear)
+    fill = is_na & (near_prev | near_next)
+    inner = fill & has_prev & has_next
+    a, b, x = prev_valid[inner], next_valid[inner], positions[inner]
+    slope = (values[b] - values[a]) / (b - a).astype(np.float64)
+    values[inner] = slope * (x - a).astype(np.float64) + values[a]
+    leading = fill & ~has_prev
+    values[leading] = values[next_valid[leading]]
+    trailing = fill & ~has_next
+    values[trailing] = values[prev_valid[trailing]]
+    # fill remaining gaps with centered rolling avg over the linearly imputed values
+    is_na = np.isnan(values)
+    if is_na.any():
+        window = rolling + 2 * limit_linear
+        rows = np.flatnonzero(is_na)
+        window_rows = rows[:, None] + np.arange(-(window // 2), (window - 1) // 2 + 1)
+        in_series = (window_rows >= starts[rows, None]) & (window_rows < ends[rows, None])
+        window_values = np.where(in_series, values[np.clip(window_rows, 0, len(values) - 1)], np.nan)
+        count = np.sum(~np.isnan(window_values), axis=1)
+        with np.errstate(invalid="ignore"):
+            rolling_avg = np.nansum(window_values, axis=1) / count
+        values[rows] = np.where((count >= 2 * limit_linear) & (count > 0), rolling_avg, np.nan)
+    series = pd.Series(values, index=series.index, name=series.name, dtype=series.dtype)
+    remaining_na = int(np.isnan(values).sum())
     return series, remaining_na
 
 
@@ -1390,9 +1618,9 @@ def infer_frequency(df, freq, n_lags, min_freq_percentage=0.7):
             Valid frequency tag according to major frequency.
 
     """
-    df, _, _, _ = prep_or_copy_df(df)
+    df, _, _, _ = prep_or_copy_df(df, copy=False)
     freq_df = list()
-    for df_name, df_i in df.groupby("ID"):
+    for df_name, df_i in df.loc[:, ["ds", "ID"]].groupby("ID"):
         freq_df.append(_infer_frequency(df_i, freq, min_freq_percentage))
     if len(set(freq_df)) != 1 and n_lags > 0:
         raise ValueError(
@@ -1628,7 +1856,9 @@ def add_weekday_condition(df: pd.DataFrame):
     return df
 
 
-def create_mask_for_prediction_frequency(prediction_frequency, ds, forecast_lag):
+def create_mask_for_prediction_frequency(
+    prediction_frequency: dict, ds: pd.Series, forecast_lag: int, calendar: Optional[CalendarIndex] = None
+) -> np.ndarray:
     """Creates a mask for the yhat array, to select the correct values for the prediction frequency.
     This method is only called in _reshape_raw_predictions_to_forecst_df within NeuralProphet.predict().
 
@@ -1640,13 +1870,17 @@ def create_mask_for_prediction_frequency(prediction_frequency, ds, forecast_lag)
             datestamps of the predictions
         forecast_lag : int
             current forecast lag
+        calendar : CalendarIndex
+            precomputed calendar features of ``ds``, computed from ``ds`` if not provided
 
     Returns
     -------
         np.array
             mask for the yhat array
     """
-    masks = []
+    if calendar is None:
+        calendar = CalendarIndex.from_ds(ds)
+    conditions = [np.ones(len(calendar), dtype=bool)]
     for count, (key, value) in enumerate(prediction_frequency.items()):
         if count > 0 and forecast_lag > 1:
             target_time = value + 1
@@ -1654,25 +1888,16 @@ def create_mask_for_prediction_frequency(prediction_frequency, ds, forecast_lag)
             target_time = value + forecast_lag
         if key == "daily-hour":
             target_time = target_time % 24
-            mask = ds.dt.hour == target_time
         elif key == "weekly-day":
             target_time = target_time % 7
-            mask = ds.dt.dayofweek == target_time
         elif key == "monthly-day":
-            num_days = ds.dt.daysinmonth
-            target_time = target_time % num_days
-            mask = (ds.dt.day == target_time).reset_index(drop=True)
+            target_time = target_time % calendar.daysinmonth.astype(np.int64)
         elif key == "yearly-month":
             target_time = target_time % 12 if target_time > 12 else target_time
             target_time = 1 if target_time == 0 else target_time
-            mask = ds.dt.month == target_time
         elif key == "hourly-minute":
             target_time = target_time % 60
-            mask = ds.dt.minute == target_time
         else:
             raise ValueError(f"prediction_frequency {key} not supported")
-        masks.append(mask)
-    mask = np.ones((len(ds),), dtype=bool)
-    for m in masks:
-        mask = mask & m
-    return mask
+        conditions.append(getattr(calendar, PREDICTION_FREQUENCY_CALENDAR_FEATURES[key]) == target_time)
+    return np.logical_and.reduce(conditions)
@@ -1,9 +1,20 @@
-from collections import defaultdict
-from typing import Iterable, Union
+import logging
+import os
+from collections import OrderedDict, defaultdict
+from typing import Dict, Iterable, List, Optional, Union
 
 import numpy as np
 import pandas as pd
 from holidays import country_holidays
+from holidays.version import __version__ as holidays_version
+
+log = logging.getLogger("NP.event_utils")
+
+# Directory to persist holiday calendars to, shared across processes. Calendars are kept in memory only if None.
+HOLIDAY_CACHE_DIR: Optional[str] = os.environ.get("NEURALPROPHET_HOLIDAY_CACHE_DIR")
+
+# Holiday calendars computed in this process, by (country, subdivision, first year, last year)
+_holiday_calendars: Dict[tuple, Dict[str, np.ndarray]] = {}
 
 
 def get_holiday_names(country: Union[str, Iterable[str]], df=None):
@@ -50,17 +61,9 @@ def get_all_holidays(years, country):
         pd.DataFrame
             Containing country specific holidays df with columns 'ds' and 'holiday'
     """
-    # convert to list if not already
-    if isinstance(country, str):
-        country = {country: None}
-    elif isinstance(country, list):
-        country = dict(zip(country, [None] * len(country)))
-
     all_holidays = defaultdict(list)
     # iterate over countries and get holidays for each country
-    for single_country, subdivision in country.items():
-        # For compatibility with Turkey as "TU" cases.
-        single_country = "TUR" if single_country == "TU" else single_country
+    for single_country, subdivision in _normalize_countries(country).items():
         # get dict of dates and their holiday name
         single_country_specific_holidays = country_holidays(
             country=single_country, subdiv=subdivision, years=years, expand=True, observed=False, language="en"
@@ -69,3 +72,141 @@ def get_all_holidays(years, country):
         for date, name in single_country_specific_holidays.items():
             all_holidays[name].append(pd.to_datetime(date))
     return all_holidays
+
+
+def _normalize_countries(country):
+    """Converts a country name, list of names or dict of names and subdivisions to a dict."""
+    if isinstance(country, str):
+        country = {country: None}
+    elif isinstance(country, list):
+        country = dict(zip(country, [None] * len(country)))
+    # For compatibility with Turkey as "TU" cases.
+    return OrderedDict(("TUR" if name == "TU" else name, subdivision) for name, subdivision in country.items())
+
+
+def _holiday_calendar_path(cache_dir, key):
+    country, subdivision, first_year, last_year = key
+    # the calendar depends on the version of the holidays package
+    return os.path.join(cache_dir, f"holidays_{country}_{subdivision}_{first_year}_{last_year}_{holidays_version}.npz")
+
+
+def _load_holiday_calendar(path):
+    with np.load(path) as data:
+        names, offsets, days = data["names"], data["offsets"], data["days"]
+        return {str(name): days[offsets[i] : offsets[i + 1]] for i, name in enumerate(names)}
+
+
+def _save_holiday_calendar(path, calendar):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    days = list(calendar.values())
+    offsets = np.concatenate(([0], np.cumsum([len(d) for d in days]))).astype(np.int64)
+    # write to a temporary file first, so that concurrent processes never read a partial file
+    tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez(tmp_path, names=np.array(list(calendar.keys()), dtype=str), offsets=offsets, days=np.concatenate(days))
+    os.replace(tmp_path, path)
+
+
+def _country_holiday_calendar(
+    country: str, subdivision: Optional[str], first_year: int, last_year: int, cache_dir: Optional[str] = None
+) -> Dict[str, np.ndarray]:
+    """Days of each holiday of a single country, computed once per process and optionally persisted."""
+    key = (country, subdivision, first_year, last_year)
+    if key in _holiday_calendars:
+        return _holiday_calendars[key]
+    path = _holiday_calendar_path(cache_dir, key) if cache_dir is not None else None
+    calendar = None
+    if path is not None and os.path.exists(path):
+        try:
+            calendar = _load_holiday_calendar(path)
+        except (OSError, KeyError, ValueError) as e:
+            log.warning(f"Could not read the holiday calendar {path}, computing it again: {e}")
+    if calendar is None:
+        dates = defaultdict(list)
+        for date, name in country_holidays(
+            country=country,
+            subdiv=subdivision,
+            years=range(first_year, last_year + 1),
+            expand=True,
+            observed=False,
+            language="en",
+        ).items():
+            dates[name].append(date)
+        calendar = {
+            name: np.unique(np.array(name_dates, dtype="datetime64[D]").astype(np.int64))
+            for name, name_dates in dates.items()
+        }
+        if path is not None:
+            try:
+                _save_holiday_calendar(path, calendar)
+            except OSError as e:
+                log.warning(f"Could not persist the holiday calendar to {path}: {e}")
+    _holiday_calendars[key] = calendar
+    return calendar
+
+
+def get_holiday_calendar(years, country, cache_dir: Optional[str] = None) -> Dict[str, np.ndarray]:
+    """
+    Get the days of each country specific holiday in the range of the given years.
+
+    Calendars are computed once per process for each country, subdivision and range of years,
+    and read from ``cache_dir`` if persisted there by another process before.
+
+    Parameters
+    ----------
+        years : list
+            List of years, holidays are retrieved for all years from the first to the last year
+        country : str, list, dict
+            List of country names and optional subdivisions
+        cache_dir : str
+            directory to persist the calendars in, defaults to ``HOLIDAY_CACHE_DIR``
+
+    Returns
+    -------
+        dict
+            holiday name, with sorted days since 1970-01-01 (int64) of all countries
+    """
+    if cache_dir is None:
+        cache_dir = HOLIDAY_CACHE_DIR
+    first_year, last_year = int(np.min(years)), int(np.max(years))
+    all_days = defaultdict(list)
+    for single_country, subdivision in _normalize_countries(country).items():
+        calendar = _country_holiday_calendar(single_country, subdivision, first_year, last_year, cache_dir)
+        for name, days in calendar.items():
+            all_days[name].append(days)
+    return {name: days[0] if len(days) == 1 else np.unique(np.concatenate(days)) for name, days in all_days.items()}
+
+
+def get_holiday_features(ds: pd.Series, holiday_names: List[str], calendar: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Flag the dates of the given holidays, with a single search over the holiday calendar.
+
+    Parameters
+    ----------
+        ds : pd.Series
+            datestamps, only midnight datestamps are matched with holidays
+        holiday_names : list
+            names of the holidays to flag
+        calendar : dict
+            days of each holiday, see ``get_holiday_calendar``
+
+    Returns
+    -------
+        np.array
+            float32 array of dims (len(ds), len(holiday_names)), 1.0 where the date is the holiday
+    """
+    features = np.zeros((len(ds), len(holiday_names)), dtype=np.float32)
+    if len(holiday_names) == 0 or len(ds) == 0:
+        return features
+    # sorted days of all holidays, with a membership row per day
+    days = [calendar[name] for name in holiday_names]
+    holiday_days = np.unique(np.concatenate(days))
+    membership = np.zeros((len(holiday_days), len(holiday_names)), dtype=np.float32)
+    for i, name_days in enumerate(days):
+        membership[np.searchsorted(holiday_days, name_days), i] = 1.0
+    nanoseconds = ds.to_numpy(dtype="datetime64[ns]").view(np.int64)
+    ns_per_day = 86_400_000_000_000
+    ds_days = nanoseconds // ns_per_day
+    positions = np.minimum(np.searchsorted(holiday_days, ds_days), len(holiday_days) - 1)
+    is_holiday = (holiday_days[positions] == ds_days) & (nanoseconds % ns_per_day == 0)
+    features[is_holiday] = membership[positions[is_holiday]]
+    return features
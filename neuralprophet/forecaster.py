@@ -2,6 +2,7 @@ import logging
 import os
 import time
 from collections import OrderedDict
+from itertools import islice
 from typing import Callable, List, Optional, Tuple, Type, Union
 
 import matplotlib
@@ -14,7 +15,7 @@ from matplotlib.axes import Axes
 from pytorch_lightning.tuner.tuning import Tuner
 from torch.utils.data import DataLoader
 
-from neuralprophet import configure, df_utils, np_types, time_dataset, time_net, utils, utils_metrics
+from neuralprophet import configure, df_utils, np_types, time_dataset, time_net, utils, utils_metrics, utils_torch
 from neuralprophet.data.process import (
     _check_dataframe,
     _convert_raw_predictions_to_raw_df,
@@ -25,6 +26,7 @@ from neuralprophet.data.process import (
     _validate_column_name,
 )
 from neuralprophet.data.split import _make_future_dataframe, _maybe_extend_df
+from neuralprophet.data.stream import DataFrameChunks, StreamingDataParams
 from neuralprophet.data.transform import _normalize
 from neuralprophet.logger import MetricsLogger
 from neuralprophet.plot_forecast_matplotlib import plot, plot_components
@@ -38,6 +40,9 @@ from neuralprophet.uncertainty import Conformal
 
 log = logging.getLogger("NP.forecaster")
 
+# Maximum number of training batches used by the "fast" learning rate finder
+LR_FINDER_MAX_BATCHES = 32
+
 
 class NeuralProphet:
     """NeuralProphet forecaster.
@@ -163,6 +168,14 @@ class NeuralProphet:
             Options
                 * (default) ``additive``
                 * ``multiplicative``
+        seasonality_computation : str
+            Specifies where the Fourier features of the seasonalities are computed
+
+            Options
+                * (default) ``fourier``: computed by the dataset and passed to the model for each sample
+                * ``fourier_fused``: computed by the model from the time of each sample, for all seasonalities
+                  in a single batched operation. Reduces the data passed to the model per time step from
+                  ``2 * resolution`` values per seasonality to a single value.
         seasonality_reg : float, optional
             Parameter modulating the strength of the seasonality model.
 
@@ -207,6 +220,17 @@ class NeuralProphet:
             Dimension of hidden layers in the neural network model for future regressors.
             Ignored if ``future_regressors_model`` is ``linear``.
 
+        COMMENT
+        Events
+        COMMENT
+        sparse_events : bool
+            whether to pass the features of events and holidays to the model as sparse tensors
+
+            Options
+                * (default) ``False``: dense features of dims (batch, n_lags + n_forecasts, n_event_features)
+                * ``True``: only the active (event offset, time step) pairs of each sample, saving memory and
+                  compute for models with many rare events. Forecasts are identical to the dense features.
+
         COMMENT
         AR Config
         COMMENT
@@ -243,6 +267,15 @@ class NeuralProphet:
             ----
             Default ``None``: Automatically sets the ``learning_rate`` based on a learning rate range test.
             For manual user input, (try values ~0.001-10).
+        lr_finder : str
+            Learning rate range test used when ``learning_rate`` is ``None``
+
+            Options
+                * (default) ``lightning``: the Lightning ``Tuner``, on the full training data
+                * ``fast``: a plain training loop on a bounded subsample of the training batches. The suggested
+                  learning rate is cached by the model architecture, training config and data shape, and reused by
+                  later fits with the same fingerprint, e.g. in a backtest. Set the environment variable
+                  ``NEURALPROPHET_LR_CACHE_DIR`` to persist the learning rates across processes.
         epochs : int
             Number of epochs (complete iterations over dataset) to train model.
 
@@ -366,6 +399,12 @@ class NeuralProphet:
             Provide `None` to deactivate the use of accelerators.
         trainer_config: dict
             Dictionary of additional trainer configuration parameters.
+
+            Note
+            ----
+            For data-parallel training in N processes on CPU, e.g. of a global model of many series, set
+            ``accelerator="cpu"`` and ``trainer_config={"strategy": "ddp", "devices": N}``. The processes are forked
+            from the fitting one, see ``utils.DDPMetricsStrategy``.
         prediction_frequency: dict
             Set a periodic interval in which forecasts should be made.
 
@@ -451,6 +490,9 @@ class NeuralProphet:
         accelerator: Optional[str] = None,
         trainer_config: dict = {},
         prediction_frequency: Optional[dict] = None,
+        sparse_events: bool = False,
+        seasonality_computation: str = "fourier",
+        lr_finder: str = "lightning",
     ):
         self.config = locals()
         self.config.pop("self")
@@ -459,6 +501,7 @@ class NeuralProphet:
         self.name = "NeuralProphet"
         self.n_forecasts = n_forecasts
         self.prediction_frequency = prediction_frequency
+        self.sparse_events = sparse_events
 
         # Data Normalization settings
         self.config_normalization = configure.Normalization(
@@ -516,11 +559,13 @@ class NeuralProphet:
             newer_samples_weight=newer_samples_weight,
             newer_samples_start=newer_samples_start,
             trend_reg_threshold=self.config_trend.trend_reg_threshold,
+            lr_finder=lr_finder,
         )
 
         # Seasonality
         self.config_seasonality = configure.ConfigSeasonality(
             mode=seasonality_mode,
+            computation=seasonality_computation,
             reg_lambda=seasonality_reg,
             yearly_arg=yearly_seasonality,
             weekly_arg=weekly_seasonality,
@@ -547,6 +592,8 @@ class NeuralProphet:
 
         # set during fit()
         self.data_freq = None
+        self.id_list = None
+        self.chunk_num_samples = None
 
         # Set during _train()
         self.fitted = False
@@ -907,7 +954,7 @@ class NeuralProphet:
 
     def fit(
         self,
-        df: pd.DataFrame,
+        df: Union[pd.DataFrame, DataFrameChunks],
         freq: str = "auto",
         validation_df: Optional[pd.DataFrame] = None,
         epochs: Optional[int] = None,
@@ -921,6 +968,7 @@ class NeuralProphet:
         continue_training: bool = False,
         num_workers: int = 0,
         deterministic: bool = False,
+        use_trainer: bool = True,
     ):
         """Train, and potentially evaluate model.
 
@@ -929,8 +977,14 @@ class NeuralProphet:
 
         Parameters
         ----------
-            df : pd.DataFrame
+            df : pd.DataFrame, DataFrameChunks
                 containing column ``ds``, ``y``, and optionally``ID`` with all data
+
+                Note
+                ----
+                Data larger than memory can be provided as ``DataFrameChunks`` (e.g. partitioned Parquet files),
+                which are streamed one chunk at a time. Each chunk must contain complete series. Streaming requires
+                a ``learning_rate`` and does not support a ``validation_df``.
             freq : str
                 Data step sizes. Frequency of data recording,
 
@@ -972,6 +1026,14 @@ class NeuralProphet:
                 Note: using multiple workers and therefore distributed training might significantly increase
                 the training time since each batch needs to be copied to each worker for each epoch. Keeping
                 all data on the main process might be faster for most datasets.
+            use_trainer : bool
+                whether to train with the Lightning Trainer
+
+                Options
+                    * (default) ``True``: train with ``trainer.fit``, including its callbacks and logging
+                    * ``False``: train in a plain PyTorch loop with the same optimizer, scheduler and regularization,
+                      much faster for small models. Collects the same metrics and supports ``early_stopping``, but
+                      not ``checkpointing``.
 
         Returns
         -------
@@ -1029,91 +1091,22 @@ class NeuralProphet:
             self.metrics = False
             progress = None
 
-        # Pre-processing
-        # Copy df and save list of unique time series IDs (the latter for global-local modelling if enabled)
-        df, _, _, self.id_list = df_utils.prep_or_copy_df(df)
-        df = _check_dataframe(self, df, check_y=True, exogenous=True)
-        self.data_freq = df_utils.infer_frequency(df, n_lags=self.max_lags, freq=freq)
-        df = _handle_missing_data(
-            df=df,
-            freq=self.data_freq,
-            n_lags=self.n_lags,
-            n_forecasts=self.n_forecasts,
-            config_missing=self.config_missing,
-            config_regressors=self.config_regressors,
-            config_lagged_regressors=self.config_lagged_regressors,
-            config_events=self.config_events,
-            config_seasonality=self.config_seasonality,
-            predicting=False,
-        )
-
-        # Setup for global-local modelling: If there is only a single time series, then self.id_list = ['__df__']
-        self.num_trends_modelled = len(self.id_list) if self.config_trend.trend_global_local == "local" else 1
-        self.num_seasonalities_modelled = (
-            len(self.id_list) if self.config_seasonality.global_local in ["glocal", "local"] else 1
-        )
-        self.num_seasonalities_modelled_dict = OrderedDict()
-        for season_i in self.config_seasonality.periods:
-            self.num_seasonalities_modelled_dict[season_i] = (
-                len(self.id_list) if self.config_seasonality.periods[season_i].global_local == "local" else 1
-            )
-        # check if any of the values of the dictionary self.num_seasonalities_modelled_dict is different from 1
-
-        self.meta_used_in_model = (
-            self.num_trends_modelled != 1
-            or self.num_seasonalities_modelled != 1
-            or any(value != 1 for value in self.num_seasonalities_modelled_dict.values())
+        df, df_val = self._prepare_fit_data(
+            df, freq=freq, validation_df=validation_df, continue_training=continue_training
         )
 
-        if self.fitted is True and not continue_training:
-            log.error("Model has already been fitted. Re-fitting may break or produce different results.")
-        self.max_lags = df_utils.get_max_num_lags(
-            n_lags=self.n_lags, config_lagged_regressors=self.config_lagged_regressors
-        )
-        if self.max_lags == 0 and self.n_forecasts > 1:
-            self.n_forecasts = 1
-            self.predict_steps = 1
-            log.warning(
-                "Changing n_forecasts to 1. Without lags, the forecast can be "
-                "computed for any future time, independent of lagged values"
-            )
-
         # Training
-        if validation_df is None:
-            metrics_df = self._train(
-                df,
-                progress_bar_enabled=bool(progress),
-                metrics_enabled=bool(self.metrics),
-                checkpointing_enabled=checkpointing,
-                continue_training=continue_training,
-                num_workers=num_workers,
-                deterministic=deterministic,
-            )
-        else:
-            df_val, _, _, _ = df_utils.prep_or_copy_df(validation_df)
-            df_val = _check_dataframe(self, df_val, check_y=False, exogenous=False)
-            df_val = _handle_missing_data(
-                df=df_val,
-                freq=self.data_freq,
-                n_lags=self.n_lags,
-                n_forecasts=self.n_forecasts,
-                config_missing=self.config_missing,
-                config_regressors=self.config_regressors,
-                config_lagged_regressors=self.config_lagged_regressors,
-                config_events=self.config_events,
-                config_seasonality=self.config_seasonality,
-                predicting=False,
-            )
-            metrics_df = self._train(
-                df,
-                df_val=df_val,
-                progress_bar_enabled=bool(progress),
-                metrics_enabled=bool(self.metrics),
-                checkpointing_enabled=checkpointing,
-                continue_training=continue_training,
-                num_workers=num_workers,
-                deterministic=deterministic,
-            )
+        metrics_df = self._train(
+            df,
+            df_val=df_val,
+            progress_bar_enabled=bool(progress),
+            metrics_enabled=bool(self.metrics),
+            checkpointing_enabled=checkpointing,
+            continue_training=continue_training,
+            num_workers=num_workers,
+            deterministic=deterministic,
+            use_trainer=use_trainer,
+        )
 
         # Show training plot
         if progress == "plot":
@@ -1130,7 +1123,9 @@ class NeuralProphet:
         self.fitted = True
         return metrics_df
 
-    def predict(self, df: pd.DataFrame, decompose: bool = True, raw: bool = False, auto_extend=True):
+    def predict(
+        self, df: pd.DataFrame, decompose: bool = True, raw: bool = False, auto_extend=True, use_trainer: bool = True
+    ):
         """Runs the model to make predictions.
 
         Expects all data needed to be present in dataframe.
@@ -1149,6 +1144,13 @@ class NeuralProphet:
                 Options
                     * (default) ``False``: returns forecasts sorted by target (highlighting forecast age)
                     * ``True``: return the raw forecasts sorted by forecast start date
+            use_trainer : bool
+                whether to run the prediction with the Lightning Trainer
+
+                Options
+                    * (default) ``True``: predict with ``trainer.predict``, including its callbacks and progress bar
+                    * ``False``: predict in a plain ``torch.inference_mode`` loop, much faster for small inputs.
+                      Does not require a trainer, e.g. for a model loaded with ``load(path, restore_trainer=False)``.
 
         Returns
         -------
@@ -1170,7 +1172,7 @@ class NeuralProphet:
             log.warning("Raw forecasts are incompatible with plotting utilities")
         if self.fitted is False:
             raise ValueError("Model has not been fitted. Predictions will be random.")
-        df, received_ID_col, received_single_time_series, _ = df_utils.prep_or_copy_df(df)
+        df, received_ID_col, received_single_time_series, _ = df_utils.prep_or_copy_df(df, copy=False)
         # to get all forecasteable values with df given, maybe extend into future:
         df, periods_added = _maybe_extend_df(
             df=df,
@@ -1183,11 +1185,16 @@ class NeuralProphet:
         df = _prepare_dataframe_to_predict(model=self, df=df, max_lags=self.max_lags, freq=self.data_freq)
         # normalize
         df = _normalize(df=df, config_normalization=self.config_normalization)
-        forecast = pd.DataFrame()
+        # predict all series at once
+        raw_predictions = self._predict_raw(
+            df,
+            include_components=decompose,
+            prediction_frequency=self.prediction_frequency,
+            use_trainer=use_trainer,
+        )
+        fcsts = []
         for df_name, df_i in df.groupby("ID"):
-            dates, predicted, components = self._predict_raw(
-                df_i, df_name, include_components=decompose, prediction_frequency=self.prediction_frequency
-            )
+            dates, predicted, components = raw_predictions[df_name]
             df_i = df_utils.drop_missing_from_df(
                 df_i, self.config_missing.drop_missing, self.predict_steps, self.n_lags
             )
@@ -1216,7 +1223,8 @@ class NeuralProphet:
                 )
                 if auto_extend and periods_added[df_name] > 0:
                     fcst = fcst[: -periods_added[df_name]]
-            forecast = pd.concat((forecast, fcst), ignore_index=True)
+            fcsts.append(fcst)
+        forecast = pd.concat(fcsts, ignore_index=True)
 
         df = df_utils.return_df_in_original_format(forecast, received_ID_col, received_single_time_series)
         self.predict_steps = self.n_forecasts
@@ -1236,7 +1244,7 @@ class NeuralProphet:
             pd.DataFrame
                 evaluation metrics
         """
-        df, _, _, _ = df_utils.prep_or_copy_df(df)
+        df, _, _, _ = df_utils.prep_or_copy_df(df, copy=False)
         if self.fitted is False:
             log.warning("Model has not been fitted. Test results will be random.")
         df = _check_dataframe(self, df, check_y=True, exogenous=True)
@@ -1378,7 +1386,7 @@ class NeuralProphet:
             1	2022-12-13	8.02	data2
             2	2022-12-13	8.30	data3
         """
-        df, received_ID_col, received_single_time_series, _ = df_utils.prep_or_copy_df(df)
+        df, received_ID_col, received_single_time_series, _ = df_utils.prep_or_copy_df(df, copy=False)
         df = _check_dataframe(self, df, check_y=False, exogenous=False)
         freq = df_utils.infer_frequency(df, n_lags=self.max_lags, freq=freq)
         df = _handle_missing_data(
@@ -1567,7 +1575,7 @@ class NeuralProphet:
             1	2022-12-10	8.25	data2
             2	2022-12-10	7.55	data3
         """
-        df, received_ID_col, received_single_time_series, _ = df_utils.prep_or_copy_df(df)
+        df, received_ID_col, received_single_time_series, _ = df_utils.prep_or_copy_df(df, copy=False)
         df = _check_dataframe(self, df, check_y=False, exogenous=False)
         freq = df_utils.infer_frequency(df, n_lags=self.max_lags, freq=freq)
         df = _handle_missing_data(
@@ -1631,7 +1639,7 @@ class NeuralProphet:
             tuple of k tuples [(folds_val, folds_test), …]
                 elements same as :meth:`crossvalidation_split_df` returns
         """
-        df, _, _, _ = df_utils.prep_or_copy_df(df)
+        df, _, _, _ = df_utils.prep_or_copy_df(df, copy=False)
         df = _check_dataframe(self, df, check_y=False, exogenous=False)
         freq = df_utils.infer_frequency(df, n_lags=self.max_lags, freq=freq)
         df = _handle_missing_data(
@@ -1677,7 +1685,7 @@ class NeuralProphet:
                 "The events configs should be added to the NeuralProphet object (add_events fn)"
                 "before creating the data with events features"
             )
-        df, received_ID_col, received_single_time_series, _ = df_utils.prep_or_copy_df(df)
+        df, received_ID_col, received_single_time_series, _ = df_utils.prep_or_copy_df(df, copy=False)
         df = _check_dataframe(self, df, check_y=True, exogenous=False)
         df_dict_events = df_utils.create_dict_for_events_or_regressors(df, events_df, "events")
         df_created = pd.DataFrame()
@@ -1836,19 +1844,17 @@ class NeuralProphet:
         if quantile is not None and not (0 < quantile < 1):
             raise ValueError("The quantile specified need to be a float in-between (0,1)")
 
-        df, received_ID_col, received_single_time_series, _ = df_utils.prep_or_copy_df(df)
+        df, received_ID_col, received_single_time_series, _ = df_utils.prep_or_copy_df(df, copy=False)
         df = _check_dataframe(self, df, check_y=False, exogenous=False)
         df = _normalize(df=df, config_normalization=self.config_normalization)
         df_trend = pd.DataFrame()
         for df_name, df_i in df.groupby("ID"):
             t = torch.from_numpy(np.expand_dims(df_i["t"].values, 1))  # type: ignore
 
-            # Creating and passing meta, in this case the meta['df_name'] is the ID of the dataframe
+            # Creating and passing meta, in this case the integer code of the ID of the dataframe
             # Note: meta is only used on the trend method if trend_global_local is not "global"
-            meta = OrderedDict()
-            meta["df_name"] = [df_name for _ in range(t.shape[0])]
             if self.meta_used_in_model:
-                meta_name_tensor = torch.tensor([self.model.id_dict[i] for i in meta["df_name"]])  # type: ignore
+                meta_name_tensor = torch.full((t.shape[0],), self.model.id_dict[df_name])  # type: ignore
             else:
                 meta_name_tensor = None
 
@@ -1880,7 +1886,7 @@ class NeuralProphet:
         if quantile is not None and not (0 < quantile < 1):
             raise ValueError("The quantile specified need to be a float in-between (0,1)")
 
-        df, received_ID_col, received_single_time_series, _ = df_utils.prep_or_copy_df(df)
+        df, received_ID_col, received_single_time_series, _ = df_utils.prep_or_copy_df(df, copy=False)
         df = _check_dataframe(self, df, check_y=False, exogenous=False)
         df = _normalize(df=df, config_normalization=self.config_normalization)
         df_seasonal = pd.DataFrame()
@@ -1900,7 +1906,7 @@ class NeuralProphet:
                 config_missing=self.config_missing,
                 # config_train=self.config_train, # no longer needed since JIT tabularization.
             )
-            loader = DataLoader(dataset, batch_size=min(4096, len(df)), shuffle=False, drop_last=False)
+            loader = time_dataset.create_batched_loader(dataset, batch_size=min(4096, len(df)), shuffle=False)
             predicted = {}
             for name in self.config_seasonality.periods:
                 predicted[name] = list()
@@ -1909,14 +1915,13 @@ class NeuralProphet:
                 if self.model.config_seasonality is None:
                     meta_name_tensor = None
                 elif self.model.config_seasonality.global_local in ["local", "glocal"]:
-                    meta = OrderedDict()
-                    meta["df_name"] = [df_name for _ in range(inputs["time"].shape[0])]
-                    meta_name_tensor = torch.tensor([self.model.id_dict[i] for i in meta["df_name"]])  # type: ignore
+                    meta_name_tensor = torch.full((inputs["time"].shape[0],), self.model.id_dict[df_name])  # type: ignore
                 else:
                     meta_name_tensor = None
 
+                seasonalities = self.model.seasonality.compute_features(inputs["seasonalities"])
                 for name in self.config_seasonality.periods:
-                    features = inputs["seasonalities"][name]
+                    features = seasonalities[name]
                     quantile_index = self.config_train.quantiles.index(quantile)
                     y_season = torch.squeeze(
                         self.model.seasonality.compute_fourier(features=features, name=name, meta=meta_name_tensor)[
@@ -2619,6 +2624,112 @@ class NeuralProphet:
                 forecast_in_focus=forecast_in_focus,
             )
 
+    def _prepare_fit_data(
+        self,
+        df: Union[pd.DataFrame, DataFrameChunks],
+        freq: str = "auto",
+        validation_df: Optional[pd.DataFrame] = None,
+        continue_training: bool = False,
+    ):
+        """Checks the training (and validation) data and sets up the data dependent configuration of ``fit``.
+
+        Parameters
+        ----------
+            df : pd.DataFrame, DataFrameChunks
+                containing column ``ds``, ``y``, and optionally``ID`` with all data
+            freq : str
+                data step sizes, see ``fit``
+            validation_df : pd.DataFrame
+                containing column ``ds``, ``y``, and optionally``ID`` with validation data
+            continue_training : bool
+                whether training continues from the last checkpoint
+
+        Returns
+        -------
+            pd.DataFrame, DataFrameChunks
+                training data, with missing data handled
+            pd.DataFrame
+                validation data, with missing data handled, None without ``validation_df``
+        """
+        # Pre-processing
+        if isinstance(df, DataFrameChunks):
+            if validation_df is not None:
+                raise NotImplementedError("Validation is not supported when fitting on DataFrameChunks.")
+            if not self.config_train.learning_rate:
+                raise ValueError(
+                    "Please provide a learning_rate when fitting on DataFrameChunks, the learning rate finder requires "
+                    "all data in memory."
+                )
+            # Pre-processing of each chunk happens in a streaming pass over the data
+            self._init_streaming_data(df, freq=freq)
+        else:
+            # Copy df and save list of unique time series IDs (the latter for global-local modelling if enabled)
+            df, _, _, self.id_list = df_utils.prep_or_copy_df(df, copy=False)
+            df = _check_dataframe(self, df, check_y=True, exogenous=True)
+            self.data_freq = df_utils.infer_frequency(df, n_lags=self.max_lags, freq=freq)
+            df = _handle_missing_data(
+                df=df,
+                freq=self.data_freq,
+                n_lags=self.n_lags,
+                n_forecasts=self.n_forecasts,
+                config_missing=self.config_missing,
+                config_regressors=self.config_regressors,
+                config_lagged_regressors=self.config_lagged_regressors,
+                config_events=self.config_events,
+                config_seasonality=self.config_seasonality,
+                predicting=False,
+            )
+        assert self.id_list is not None and self.data_freq is not None
+
+        # Setup for global-local modelling: If there is only a single time series, then self.id_list = ['__df__']
+        self.num_trends_modelled = len(self.id_list) if self.config_trend.trend_global_local == "local" else 1
+        self.num_seasonalities_modelled = (
+            len(self.id_list) if self.config_seasonality.global_local in ["glocal", "local"] else 1
+        )
+        self.num_seasonalities_modelled_dict = OrderedDict()
+        for season_i in self.config_seasonality.periods:
+            self.num_seasonalities_modelled_dict[season_i] = (
+                len(self.id_list) if self.config_seasonality.periods[season_i].global_local == "local" else 1
+            )
+        # check if any of the values of the dictionary self.num_seasonalities_modelled_dict is different from 1
+
+        self.meta_used_in_model = (
+            self.num_trends_modelled != 1
+            or self.num_seasonalities_modelled != 1
+            or any(value != 1 for value in self.num_seasonalities_modelled_dict.values())
+        )
+
+        if self.fitted is True and not continue_training:
+            log.error("Model has already been fitted. Re-fitting may break or produce different results.")
+        self.max_lags = df_utils.get_max_num_lags(
+            n_lags=self.n_lags, config_lagged_regressors=self.config_lagged_regressors
+        )
+        if self.max_lags == 0 and self.n_forecasts > 1:
+            self.n_forecasts = 1
+            self.predict_steps = 1
+            log.warning(
+                "Changing n_forecasts to 1. Without lags, the forecast can be "
+                "computed for any future time, independent of lagged values"
+            )
+
+        df_val = None
+        if validation_df is not None:
+            df_val, _, _, _ = df_utils.prep_or_copy_df(validation_df, copy=False)
+            df_val = _check_dataframe(self, df_val, check_y=False, exogenous=False)
+            df_val = _handle_missing_data(
+                df=df_val,
+                freq=self.data_freq,
+                n_lags=self.n_lags,
+                n_forecasts=self.n_forecasts,
+                config_missing=self.config_missing,
+                config_regressors=self.config_regressors,
+                config_lagged_regressors=self.config_lagged_regressors,
+                config_events=self.config_events,
+                config_seasonality=self.config_seasonality,
+                predicting=False,
+            )
+        return df, df_val
+
     def _init_model(self):
         """Build Pytorch model with configured hyperparamters.
 
@@ -2626,6 +2737,7 @@ class NeuralProphet:
         -------
             TimeNet model
         """
+        assert self.id_list is not None
         self.model = time_net.TimeNet(
             config_train=self.config_train,
             config_trend=self.config_trend,
@@ -2665,7 +2777,7 @@ class NeuralProphet:
         -------
             torch DataLoader
         """
-        df, _, _, _ = df_utils.prep_or_copy_df(df)  # TODO: Can this call be avoided?
+        df, _, _, _ = df_utils.prep_or_copy_df(df, copy=False)
         # if not self.fitted:
         self.config_normalization.init_data_params(
             df=df,
@@ -2677,12 +2789,7 @@ class NeuralProphet:
 
         df = _normalize(df=df, config_normalization=self.config_normalization)
         # if not self.fitted:
-        if self.config_trend.changepoints is not None:
-            # scale user-specified changepoint times
-            df_aux = pd.DataFrame({"ds": pd.Series(self.config_trend.changepoints)})
-
-            df_normalized = _normalize(df=df_aux, config_normalization=self.config_normalization)
-            self.config_trend.changepoints = df_normalized["t"].values  # type: ignore
+        self._normalize_changepoints()
 
         # df_merged, _ = df_utils.join_dataframes(df)
         # df_merged = df_merged.sort_values("ds")
@@ -2699,7 +2806,7 @@ class NeuralProphet:
         # Determine the max_number of epochs
         self.config_train.set_auto_batch_epoch(n_data=len(dataset))
 
-        loader = DataLoader(
+        loader = time_dataset.create_batched_loader(
             dataset,
             batch_size=self.config_train.batch_size,
             shuffle=True,
@@ -2708,6 +2815,167 @@ class NeuralProphet:
 
         return loader
 
+    def _normalize_changepoints(self):
+        """Scales user-specified changepoint times with the normalization of the training data."""
+        if self.config_trend.changepoints is not None:
+            # scale user-specified changepoint times
+            df_aux = pd.DataFrame({"ds": pd.Series(self.config_trend.changepoints)})
+
+            df_normalized = _normalize(df=df_aux, config_normalization=self.config_normalization)
+            self.config_trend.changepoints = df_normalized["t"].values  # type: ignore
+
+    def _init_streaming_data(self, chunks: DataFrameChunks, freq: str = "auto"):
+        """Executes the data dependent configuration of fit in one streaming pass over chunks of training data.
+
+        Sets the IDs, data frequency, normalization data params, auto seasonalities and holidays like the
+        pre-processing of a dataframe in ``fit`` and ``_init_train_loader``, keeping one chunk in memory at a time.
+        Counts the training samples of each chunk in the same pass, see ``_init_streaming_train_loader``.
+
+        Note
+        ----
+        Regressors with a single value are not removed automatically, as this is only known after the pass.
+
+        Parameters
+        ----------
+            chunks : DataFrameChunks
+                training data, each chunk containing complete series
+            freq : str
+                Data step sizes, see ``fit``
+        """
+        streaming_data_params = StreamingDataParams(
+            normalize=self.config_normalization.normalize,
+            config_lagged_regressors=self.config_lagged_regressors,
+            config_regressors=self.config_regressors,
+            config_events=self.config_events,
+            config_seasonality=self.config_seasonality,
+            global_normalization=self.config_normalization.global_normalization,
+        )
+        id_list = []
+        chunk_num_samples = []
+        dates = np.array([], dtype="datetime64[ns]")
+        for df in chunks:
+            df, _, _, chunk_id_list = df_utils.prep_or_copy_df(df, copy=False)
+            df = self._check_chunk(df)
+            chunk_freq = df_utils.infer_frequency(df, n_lags=self.max_lags, freq=freq)
+            if self.data_freq is None:
+                self.data_freq = chunk_freq
+            elif chunk_freq != self.data_freq:
+                raise ValueError(f"Chunks have different data frequencies: {self.data_freq} and {chunk_freq}.")
+            df = _handle_missing_data(
+                df=df,
+                freq=self.data_freq,
+                n_lags=self.n_lags,
+                n_forecasts=self.n_forecasts,
+                config_missing=self.config_missing,
+                config_regressors=self.config_regressors,
+                config_lagged_regressors=self.config_lagged_regressors,
+                config_events=self.config_events,
+                config_seasonality=self.config_seasonality,
+                predicting=False,
+            )
+            streaming_data_params.update(df)
+            chunk_num_samples.append(
+                time_dataset.count_samples(
+                    df,
+                    n_lags=self.n_lags,
+                    n_forecasts=self.n_forecasts,
+                    prediction_frequency=self.prediction_frequency,
+                    config_events=self.config_events,
+                    config_regressors=self.config_regressors,
+                    config_lagged_regressors=self.config_lagged_regressors,
+                    config_missing=self.config_missing,
+                )
+            )
+            id_list.extend(chunk_id_list)
+            dates = np.union1d(dates, df["ds"].to_numpy())
+        self.id_list = id_list
+        self.chunk_num_samples = chunk_num_samples
+
+        self.config_normalization.init_data_params_from_stream(streaming_data_params)
+        self._normalize_changepoints()
+        df_dates = pd.DataFrame({"ds": dates})
+        self.config_seasonality = utils.set_auto_seasonalities(df_dates, config_seasonality=self.config_seasonality)
+        if self.config_country_holidays is not None:
+            self.config_country_holidays.init_holidays(df_dates)
+
+    def _check_chunk(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Checks a chunk of training data, without removing regressors which are constant within the chunk."""
+        df, _, _ = df_utils.check_dataframe(
+            df=df,
+            check_y=True,
+            covariates=self.config_lagged_regressors,
+            regressors=self.config_regressors.regressors,
+            events=self.config_events,
+            seasonalities=self.config_seasonality,
+            future=True,
+        )
+        return df
+
+    def _create_chunk_dataset(self, df: pd.DataFrame, precompute_tensors: bool = True):
+        """Executes the data preparation steps of training on a chunk of data and creates its dataset.
+
+        Parameters
+        ----------
+            df : pd.DataFrame
+                chunk of training data, containing complete series
+            precompute_tensors : bool
+                convert model inputs once into float32 tensors, see ``TimeDataset``
+
+        Returns
+        -------
+            GlobalTimeDataset
+        """
+        assert self.data_freq is not None
+        df, _, _, _ = df_utils.prep_or_copy_df(df, copy=False)
+        df = self._check_chunk(df)
+        df = _handle_missing_data(
+            df=df,
+            freq=self.data_freq,
+            n_lags=self.n_lags,
+            n_forecasts=self.n_forecasts,
+            config_missing=self.config_missing,
+            config_regressors=self.config_regressors,
+            config_lagged_regressors=self.config_lagged_regressors,
+            config_events=self.config_events,
+            config_seasonality=self.config_seasonality,
+            predicting=False,
+        )
+        df = _normalize(df=df, config_normalization=self.config_normalization)
+        return _create_dataset(
+            self,
+            df,
+            predict_mode=False,
+            prediction_frequency=self.prediction_frequency,
+            precompute_tensors=precompute_tensors,
+        )
+
+    def _init_streaming_train_loader(self, chunks: DataFrameChunks, num_workers: int = 0):
+        """Creates a loader streaming the training batches of chunks of data.
+
+        Parameters
+        ----------
+            chunks : DataFrameChunks
+                training data, each chunk containing complete series
+            num_workers : int
+                number of workers for data loading, each processing a subset of the chunks
+
+        Returns
+        -------
+            torch DataLoader
+        """
+        assert self.chunk_num_samples is not None
+        dataset = time_dataset.StreamingTimeDataset(
+            chunks,
+            create_dataset=self._create_chunk_dataset,
+            chunk_num_samples=self.chunk_num_samples,
+            shuffle=True,
+        )
+        # Determine the max_number of epochs
+        self.config_train.set_auto_batch_epoch(n_data=dataset.num_samples)
+        dataset.batch_size = self.config_train.batch_size
+        # batch_size=None disables the per-sample collation, the dataset yields batches already
+        return DataLoader(dataset, batch_size=None, num_workers=num_workers)
+
     def _init_val_loader(self, df):
         """Executes data preparation steps and initiates evaluation procedure.
 
@@ -2720,15 +2988,70 @@ class NeuralProphet:
         -------
             torch DataLoader
         """
-        df, _, _, _ = df_utils.prep_or_copy_df(df)
+        df, _, _, _ = df_utils.prep_or_copy_df(df, copy=False)
         df = _normalize(df=df, config_normalization=self.config_normalization)
         dataset = _create_dataset(self, df, predict_mode=False)
-        loader = DataLoader(dataset, batch_size=min(1024, len(dataset)), shuffle=False, drop_last=False)
+        loader = time_dataset.create_batched_loader(dataset, batch_size=min(1024, len(dataset)), shuffle=False)
         return loader
 
-    def _train(
+    def _find_learning_rate(
+        self, train_loader: DataLoader, dataset_size: int, val_loader=None, use_trainer: bool = True
+    ) -> float:
+        """Runs a learning rate range test and suggests a learning rate, see ``lr_finder``.
+
+        Parameters
+        ----------
+            train_loader : DataLoader
+                training data
+            dataset_size : int
+                number of rows of the training data
+            val_loader : DataLoader
+                validation data, only used by the ``lightning`` learning rate finder
+            use_trainer : bool
+                whether the model is trained with the Lightning Trainer. Otherwise, as in data-parallel training, the
+                ``lightning`` learning rate finder runs the range test of the ``fast`` one in this process, on all
+                training batches and without caching.
+
+        Returns
+        -------
+            float
+                suggested learning rate
+        """
+        # Set parameters for the learning rate finder
+        self.config_train.set_lr_finder_args(dataset_size=dataset_size, num_batches=len(train_loader))
+        fingerprint = None
+        if self.config_train.lr_finder == "fast":
+            fingerprint = utils.lr_finder_fingerprint(
+                self.model, self.config_train, dataset_size=dataset_size, num_batches=len(train_loader)
+            )
+            lr_suggestion = utils.get_cached_learning_rate(fingerprint)
+            if lr_suggestion is not None:
+                log.info(f"Reusing the learning rate {lr_suggestion:.3e} found before for this model and data shape.")
+                return lr_suggestion
+            # a bounded subsample of the (shuffled) training batches, cycled through by the range test
+            batches = list(islice(train_loader, LR_FINDER_MAX_BATCHES))
+            results = utils_torch.lr_range_test(self.model, batches, **self.config_train.lr_finder_args)
+        elif not use_trainer or self.trainer.world_size > 1:
+            results = utils_torch.lr_range_test(self.model, train_loader, **self.config_train.lr_finder_args)
+        else:
+            tuner = Tuner(self.trainer)
+            lr_finder = tuner.lr_find(
+                model=self.model,
+                train_dataloaders=train_loader,
+                val_dataloaders=val_loader,
+                **self.config_train.lr_finder_args,
+            )
+            assert lr_finder is not None
+            results = lr_finder.results
+        # Estimate the optimal learning rate from the loss curve
+        _, _, lr_suggestion = utils.smooth_loss_and_suggest(results)
+        if fingerprint is not None:
+            utils.cache_learning_rate(fingerprint, lr_suggestion)
+        return lr_suggestion
+
+    def _init_training(
         self,
-        df: pd.DataFrame,
+        df: Union[pd.DataFrame, DataFrameChunks],
         df_val: Optional[pd.DataFrame] = None,
         progress_bar_enabled: bool = True,
         metrics_enabled: bool = False,
@@ -2736,14 +3059,14 @@ class NeuralProphet:
         continue_training=False,
         num_workers=0,
         deterministic: bool = False,
+        use_trainer: bool = True,
     ):
-        """
-        Execute model training procedure for a configured number of epochs.
+        """Sets up the data loaders, the model, the Trainer and the learning rate for ``_train``.
 
         Parameters
         ----------
-            df : pd.DataFrame
-                dataframe containing column ``ds``, ``y``, and optionally``ID`` with all data
+            df : pd.DataFrame, DataFrameChunks
+                dataframe containing column ``ds``, ``y``, and optionally``ID`` with all data, or chunks thereof
             df_val : pd.DataFrame
                 dataframe containing column ``ds``, ``y``, and optionally``ID`` with validation data
             progress_bar_enabled : bool
@@ -2756,16 +3079,28 @@ class NeuralProphet:
                 whether to continue training from the last checkpoint
             num_workers : int
                 number of workers for data loading
+            use_trainer : bool
+                whether to train with the Lightning Trainer, or in a plain PyTorch loop
 
         Returns
         -------
-            pd.DataFrame
-                metrics
+            DataLoader
+                training data
+            DataLoader
+                validation data, None without ``df_val``
+            ModelCheckpoint
+                checkpoint callback of the Trainer, None without checkpointing
         """
+        if not use_trainer and checkpointing_enabled:
+            raise NotImplementedError("Checkpointing requires training with the Lightning Trainer.")
         # Set up data the training dataloader
-        df, _, _, _ = df_utils.prep_or_copy_df(df)  # TODO: Can this call be removed?
-        train_loader = self._init_train_loader(df, num_workers)
-        dataset_size = len(df)  # train_loader.dataset
+        if isinstance(df, DataFrameChunks):
+            train_loader = self._init_streaming_train_loader(df, num_workers)
+            dataset_size = self.config_train.n_data
+        else:
+            df, _, _, _ = df_utils.prep_or_copy_df(df, copy=False)
+            train_loader = self._init_train_loader(df, num_workers)
+            dataset_size = len(df)  # train_loader.dataset
 
         # Internal flag to check if validation is enabled
         validation_enabled = df_val is not None
@@ -2795,29 +3130,73 @@ class NeuralProphet:
             num_batches_per_epoch=len(train_loader),
             deterministic=deterministic,
         )
+        if isinstance(df, DataFrameChunks) and self.trainer.world_size > 1:
+            raise NotImplementedError("Data-parallel training does not support training on chunks of data.")
 
-        # Tune hyperparams and train
         if validation_enabled:
             # Set up data the validation dataloader
-            df_val, _, _, _ = df_utils.prep_or_copy_df(df_val)
+            df_val, _, _, _ = df_utils.prep_or_copy_df(df_val, copy=False)
             val_loader = self._init_val_loader(df_val)
+        else:
+            val_loader = None
 
-            if not continue_training and not self.config_train.learning_rate:
-                # Set parameters for the learning rate finder
-                self.config_train.set_lr_finder_args(dataset_size=dataset_size, num_batches=len(train_loader))
-                # Find suitable learning rate
-                tuner = Tuner(self.trainer)
-                lr_finder = tuner.lr_find(
-                    model=self.model,
-                    train_dataloaders=train_loader,
-                    val_dataloaders=val_loader,
-                    **self.config_train.lr_finder_args,
-                )
-                # Estimate the optimal learning rate from the loss curve
-                assert lr_finder is not None
-                _, _, lr_suggestion = utils.smooth_loss_and_suggest(lr_finder.results)
-                self.model.learning_rate = lr_suggestion
-            start = time.time()
+        if not continue_training and not self.config_train.learning_rate:
+            # Find suitable learning rate
+            self.model.learning_rate = self._find_learning_rate(train_loader, dataset_size, val_loader, use_trainer)
+        return train_loader, val_loader, checkpoint_callback
+
+    def _train(
+        self,
+        df: Union[pd.DataFrame, DataFrameChunks],
+        df_val: Optional[pd.DataFrame] = None,
+        progress_bar_enabled: bool = True,
+        metrics_enabled: bool = False,
+        checkpointing_enabled: bool = False,
+        continue_training=False,
+        num_workers=0,
+        deterministic: bool = False,
+        use_trainer: bool = True,
+    ):
+        """
+        Execute model training procedure for a configured number of epochs.
+
+        Parameters
+        ----------
+            df : pd.DataFrame, DataFrameChunks
+                dataframe containing column ``ds``, ``y``, and optionally``ID`` with all data, or chunks thereof
+            df_val : pd.DataFrame
+                dataframe containing column ``ds``, ``y``, and optionally``ID`` with validation data
+            progress_bar_enabled : bool
+                whether to show a progress bar during training
+            metrics_enabled : bool
+                whether to collect metrics during training
+            checkpointing_enabled : bool
+                whether to save checkpoints during training
+            continue_training : bool
+                whether to continue training from the last checkpoint
+            num_workers : int
+                number of workers for data loading
+            use_trainer : bool
+                whether to train with the Lightning Trainer, or in a plain PyTorch loop
+
+        Returns
+        -------
+            pd.DataFrame
+                metrics
+        """
+        train_loader, val_loader, checkpoint_callback = self._init_training(
+            df,
+            df_val=df_val,
+            progress_bar_enabled=progress_bar_enabled,
+            metrics_enabled=metrics_enabled,
+            checkpointing_enabled=checkpointing_enabled,
+            continue_training=continue_training,
+            num_workers=num_workers,
+            deterministic=deterministic,
+            use_trainer=use_trainer,
+        )
+        start = time.time()
+        if use_trainer:
             self.trainer.fit(
                 self.model,
                 train_loader,
@@ -2825,26 +3204,18 @@ class NeuralProphet:
                 ckpt_path=self.metrics_logger.checkpoint_path if continue_training else None,
             )
         else:
-            if not continue_training and not self.config_train.learning_rate:
-                # Set parameters for the learning rate finder
-                self.config_train.set_lr_finder_args(dataset_size=dataset_size, num_batches=len(train_loader))
-                # Find suitable learning rate
-                tuner = Tuner(self.trainer)
-                lr_finder = tuner.lr_find(
-                    model=self.model,
-                    train_dataloaders=train_loader,
-                    **self.config_train.lr_finder_args,
-                )
-                assert lr_finder is not None
-                # Estimate the optimal learning rate from the loss curve
-                _, _, lr_suggestion = utils.smooth_loss_and_suggest(lr_finder.results)
-                self.model.learning_rate = lr_suggestion
-            start = time.time()
-            self.trainer.fit(
+            assert self.config_train.epochs is not None
+            history = utils_torch.train_model(
                 self.model,
                 train_loader,
-                ckpt_path=self.metrics_logger.checkpoint_path if continue_training else None,
+                epochs=self.config_train.epochs,
+                val_loader=val_loader,
+                metrics_enabled=metrics_enabled,
+                early_stopping=self.early_stopping,
+                progress_bar_enabled=progress_bar_enabled,
             )
+            for name, values in history.items():
+                self.metrics_logger.history[name].extend(values)
 
         log.debug("Train Time: {:8.3f}".format(time.time() - start))
 
@@ -2895,18 +3266,17 @@ class NeuralProphet:
         log.info("AR parameters: ", self.true_ar_weights, "\n", "Model weights: ", weights)
         return sTPE
 
-    def _predict_raw(self, df, df_name, include_components=False, prediction_frequency=None):
+    def _predict_raw(self, df, include_components=False, prediction_frequency=None, use_trainer=True):
         """Runs the model to make predictions.
 
         Predictions are returned in raw vector format without decomposition.
         Predictions are given on a forecast origin basis, not on a target basis.
+        All series are predicted at once, with a single dataset and prediction loop.
 
         Parameters
         ----------
             df : pd.DataFrame
-                dataframe containing column ``ds``, ``y``, and optionally``ID`` with all data
-            df_name : str
-                name of the data params from which the current dataframe refers to (only in case of local_normalization)
+                dataframe containing column ``ds``, ``y``, and ``ID`` with all data
             include_components : bool
                 whether to return individual components of forecast
         prediction_frequency: dict
@@ -2923,53 +3293,52 @@ class NeuralProphet:
 
             value: int
                 forecast origin of the predictions to be made, e.g. 7 for 7am in case of 'daily-hour'.
+            use_trainer : bool
+                whether to predict with the Lightning Trainer, or in a plain ``torch.inference_mode`` loop. A
+                data-parallel Trainer is not used, all predictions being needed in this process.
 
         Returns
         -------
-            pd.Series
-                timestamps referring to the start of the predictions.
-            np.array
-                array containing the forecasts
-            dict[np.array]
-                Dictionary of components containing an array of each components contribution to the forecast
+            OrderedDict
+                for each series (``ID``), a tuple of
+
+                    * ``pd.Series``: timestamps referring to the start of the predictions.
+                    * ``np.array``: array containing the forecasts
+                    * ``dict[np.array]``: Dictionary of components containing an array of each components
+                      contribution to the forecast, None if not ``include_components``
         """
-        # Receives df with single ID column
-        assert len(df["ID"].unique()) == 1
         if "y_scaled" not in df.columns or "t" not in df.columns:
             raise ValueError("Received unprepared dataframe to predict. " "Please call predict_dataframe_to_predict.")
         dataset = _create_dataset(self, df, predict_mode=True, prediction_frequency=prediction_frequency)
-        loader = DataLoader(dataset, batch_size=min(1024, len(df)), shuffle=False, drop_last=False)
-        if self.n_forecasts > 1:
-            dates = df["ds"].iloc[self.max_lags : -self.n_forecasts + 1]
-        else:
-            dates = df["ds"].iloc[self.max_lags :]
+        loader = time_dataset.create_batched_loader(dataset, batch_size=min(1024, len(df)), shuffle=False)
 
         # Pass the include_components flag to the model
         if include_components:
             self.model.set_compute_components(include_components)
             self.model.set_covar_weights(self.model.get_covar_weights())
         # Compute the predictions and components (if requested)
-        result = self.trainer.predict(self.model, loader)
+        if use_trainer and self.trainer.world_size == 1:
+            result = self.trainer.predict(self.model, loader)
+        else:
+            result = utils_torch.predict_batches(self.model, loader)
         # Extract the prediction and components
         predicted, component_vectors = zip(*result)
         predicted = np.concatenate(predicted)
 
-        # Post-process and normalize the predictions
-        data_params = self.config_normalization.get_data_params(df_name)
-        scale_y, shift_y = data_params["y"].scale, data_params["y"].shift
-        predicted = predicted * scale_y + shift_y
+        # Post-process and normalize the predictions, with the data params of the series of each sample
+        data_params = [self.config_normalization.get_data_params(df_name) for df_name in dataset.df_names]
+        scale_y = np.array([params["y"].scale for params in data_params])[dataset.sample_series_index]
+        shift_y = np.array([params["y"].shift for params in data_params])[dataset.sample_series_index]
+
+        def per_sample(values, array):
+            # broadcast per sample values along the remaining dimensions of array, keeping its precision
+            return values.astype(array.dtype, copy=False).reshape((-1,) + (1,) * (array.ndim - 1))
+
+        predicted = predicted * per_sample(scale_y, predicted) + per_sample(shift_y, predicted)
 
         if include_components:
             component_keys = component_vectors[0].keys()
-            components = {key: None for key in component_keys}
-            # Transform the components list into a dictionary
-            for batch in component_vectors:
-                for key in component_keys:
-                    components[key] = (
-                        np.concatenate([components[key], batch[key]])  # type: ignore
-                        if (components[key] is not None)
-                        else batch[key]
-                    )
+            components = {key: np.concatenate([batch[key] for batch in component_vectors]) for key in component_keys}
             for name, value in components.items():
                 multiplicative = False  # Flag for multiplicative components
                 if "trend" in name:
@@ -3004,18 +3373,33 @@ class NeuralProphet:
 
                 # scale additive components
                 if not multiplicative:
-                    components[name] = value * scale_y
+                    components[name] = value * per_sample(scale_y, value)
                     if "trend" in name:
-                        components[name] += shift_y
+                        components[name] += per_sample(shift_y, value)
                 # scale multiplicative components
                 elif multiplicative:
                     # output absolute value of respective additive component
-                    components[name] = value * trend * scale_y  # type: ignore
+                    components[name] = value * trend * per_sample(scale_y, value)  # type: ignore
 
         else:
             components = None
 
-        return dates, predicted, components
+        # Split the samples into the series
+        sample_offsets = np.searchsorted(dataset.sample_series_index, np.arange(len(dataset.df_names) + 1))
+        raw_predictions = OrderedDict()
+        for i, (df_name, df_i) in enumerate(df.groupby("ID")):
+            assert df_name == dataset.df_names[i]
+            if self.n_forecasts > 1:
+                dates = df_i["ds"].iloc[self.max_lags : -self.n_forecasts + 1]
+            else:
+                dates = df_i["ds"].iloc[self.max_lags :]
+            samples = slice(sample_offsets[i], sample_offsets[i + 1])
+            raw_predictions[df_name] = (
+                dates,
+                predicted[samples],
+                None if components is None else {name: value[samples] for name, value in components.items()},
+            )
+        return raw_predictions
 
     def conformal_predict(
         self,
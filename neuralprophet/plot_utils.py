@@ -1,6 +1,5 @@
 import logging
 import warnings
-from collections import OrderedDict
 from typing import Optional
 
 import numpy as np
@@ -90,9 +89,7 @@ def predict_one_season(m, quantile, name, n_steps=100, df_name="__df__"):
     if df_name == "__df__":
         meta_name_tensor = None
     else:
-        meta = OrderedDict()
-        meta["df_name"] = [df_name for _ in range(n_steps + 1)]
-        meta_name_tensor = torch.tensor([m.model.id_dict[i] for i in meta["df_name"]])
+        meta_name_tensor = torch.full((n_steps + 1,), m.model.id_dict[df_name])
 
     quantile_index = m.model.quantiles.index(quantile)
     predicted = m.model.seasonality.compute_fourier(features=features, name=name, meta=meta_name_tensor)[
@@ -134,9 +131,7 @@ def predict_season_from_dates(m, dates, name, quantile, df_name="__df__"):
     if df_name == "__df__":
         meta_name_tensor = None
     else:
-        meta = OrderedDict()
-        meta["df_name"] = [df_name for _ in range(len(dates))]
-        meta_name_tensor = torch.tensor([m.model.id_dict[i] for i in meta["df_name"]])
+        meta_name_tensor = torch.full((len(dates),), m.model.id_dict[df_name])
 
     quantile_index = m.model.quantiles.index(quantile)
     predicted = m.model.seasonality.compute_fourier(features=features, name=name, meta=meta_name_tensor)[
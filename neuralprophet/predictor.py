@@ -0,0 +1,310 @@
+import logging
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import torch
+
+from neuralprophet import df_utils, utils, utils_torch
+from neuralprophet.data.process import _prepare_dataframe_to_predict, _reshape_raw_predictions_to_forecst_df
+from neuralprophet.data.transform import _normalize
+
+log = logging.getLogger("NP.predictor")
+
+
+class Predictor:
+    """Makes predictions with a fitted NeuralProphet model, without a Lightning Trainer.
+
+    The model runs in a plain ``torch.inference_mode`` loop, which avoids the setup of a Trainer,
+    its hooks, callbacks and progress bar on every call. Meant for serving, where latency matters.
+
+    Examples
+    --------
+    Wrap a fitted model, or load a saved model without restoring its Trainer
+        >>> from neuralprophet import Predictor
+        >>> predictor = Predictor(m)
+        >>> predictor = Predictor.load("test_save_model.np")
+        >>> forecast = predictor.predict(df)
+    """
+
+    def __init__(self, forecaster):
+        """
+        Parameters
+        ----------
+            forecaster : np.forecaster.NeuralProphet
+                fitted model
+        """
+        if not forecaster.fitted:
+            raise ValueError("Model has not been fitted. Predictions will be random.")
+        self.forecaster = forecaster
+        self.model = forecaster.model
+
+    @classmethod
+    def load(cls, path: utils.FILE_LIKE, map_location=None):
+        """Loads a model saved by ``save``, without restoring its Trainer.
+
+        Parameters
+        ----------
+            path : FILE_LIKE
+                Path and filename of the saved model, or an in-memory buffer.
+            map_location : str, optional
+                specifying the location where the model should be loaded, see ``load``
+
+        Returns
+        -------
+            Predictor
+        """
+        return cls(utils.load(path, map_location=map_location, restore_trainer=False))
+
+    def predict(self, df: pd.DataFrame, decompose: bool = True, raw: bool = False, auto_extend=True):
+        """Runs the model to make predictions, like ``NeuralProphet.predict``.
+
+        Parameters
+        ----------
+            df : pd.DataFrame
+                dataframe containing column ``ds``, ``y``, and optionally``ID`` with data
+            decompose : bool
+                whether to add individual components of forecast to the dataframe
+            raw : bool
+                whether to return the raw forecasts sorted by forecast start date
+            auto_extend : bool
+                whether to drop the future periods added to get all forecastable values
+
+        Returns
+        -------
+            pd.DataFrame
+                forecast, see ``NeuralProphet.predict``
+        """
+        return self.forecaster.predict(df, decompose=decompose, raw=raw, auto_extend=auto_extend, use_trainer=False)
+
+    def predict_batch(self, inputs: dict, meta: Optional[dict] = None) -> torch.Tensor:
+        """Runs the model on a batch of pre-tabularized inputs.
+
+        Parameters
+        ----------
+            inputs : OrderedDict
+                model inputs, e.g. as returned by ``TimeDataset.get_batch``
+            meta : OrderedDict
+                meta information of the batch, containing ``df_id``, if the model has local components
+
+        Returns
+        -------
+            torch.Tensor
+                normalized predictions of dims (batch, n_forecasts, n_quantiles)
+        """
+        predicted, _ = utils_torch.predict_batches(self.model, [(inputs, None, meta)])[0]
+        return predicted
+
+
+class _RingBuffer:
+    """Fixed-capacity buffer of the latest rows of one time series, stored column-wise."""
+
+    def __init__(self, columns: dict, capacity: int):
+        """
+        Parameters
+        ----------
+            columns : dict
+                dtype of each column
+            capacity : int
+                maximum number of rows kept
+        """
+        self.capacity = capacity
+        self.columns = OrderedDict((name, np.empty(capacity, dtype=dtype)) for name, dtype in columns.items())
+        self.n_rows = 0  # number of rows appended in total
+
+    def __len__(self):
+        return min(self.n_rows, self.capacity)
+
+    def append(self, df: pd.DataFrame):
+        """Appends rows, overwriting the oldest rows beyond capacity."""
+        df = df.iloc[-self.capacity :]
+        positions = (self.n_rows + np.arange(len(df))) % self.capacity
+        for name, values in self.columns.items():
+            if name == "ds":
+                values[positions] = df[name].to_numpy()
+            else:
+                values[positions] = df[name].to_numpy(dtype=np.float64, na_value=np.nan)
+        self.n_rows += len(df)
+
+    def last(self, name: str):
+        """Value of the newest row in a column."""
+        return self.columns[name][(self.n_rows - 1) % self.capacity]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Rows in chronological order."""
+        positions = (self.n_rows - len(self) + np.arange(len(self))) % self.capacity
+        return pd.DataFrame(OrderedDict((name, values[positions]) for name, values in self.columns.items()))
+
+
+class ForecastSession:
+    """Keeps the latest forecast of a fitted NeuralProphet model up to date, as new observations arrive.
+
+    Only the newest rows of each series are kept, in a ring buffer of ``max_lags`` rows plus the rows
+    needed to impute missing values the same way as on the full history. Each call accepts the newly arrived
+    rows only and forecasts from the newest origin only, so that the work per call is O(n_lags + n_forecasts)
+    instead of preprocessing and predicting the full history again.
+
+    For the full history ``df``, the forecast matches
+    ``m.get_latest_forecast(m.predict(m.make_future_dataframe(df, n_historic_predictions=True)))``.
+
+    Examples
+    --------
+    Start a session with the history, then forecast with each batch of new observations
+        >>> from neuralprophet import ForecastSession
+        >>> session = ForecastSession(m, df)
+        >>> forecast = session.predict(df_new)
+    """
+
+    def __init__(self, forecaster, df: Optional[pd.DataFrame] = None):
+        """
+        Parameters
+        ----------
+            forecaster : np.forecaster.NeuralProphet
+                fitted model with lags
+            df : pd.DataFrame
+                dataframe containing column ``ds``, ``y``, and optionally``ID`` with the history to date
+        """
+        if not forecaster.fitted:
+            raise ValueError("Model has not been fitted. Predictions will be random.")
+        if forecaster.max_lags == 0:
+            raise ValueError("Forecast sessions require a model with lags. Use predict instead.")
+        if forecaster.prediction_frequency is not None:
+            raise NotImplementedError("Forecast sessions do not support a prediction_frequency.")
+        self.forecaster = forecaster
+        config_missing = forecaster.config_missing
+        imputation_context = 0
+        if config_missing.impute_missing:
+            # linear imputation and the rolling average over it reach back this many rows at most
+            imputation_context = config_missing.impute_rolling + 3 * config_missing.impute_linear
+        self.history_size = forecaster.max_lags + imputation_context
+        self.buffers: OrderedDict = OrderedDict()
+        self.received_ID_col = False
+        self.received_single_time_series = True
+        if df is not None:
+            self.update(df)
+
+    def update(self, df: pd.DataFrame):
+        """Appends newly arrived observations.
+
+        Parameters
+        ----------
+            df : pd.DataFrame
+                dataframe containing column ``ds``, ``y``, and optionally``ID`` with rows after the previous rows
+                of each series
+        """
+        df, received_ID_col, received_single_time_series, _ = df_utils.prep_or_copy_df(df)
+        if len(self.buffers) == 0:
+            self.received_ID_col = received_ID_col
+            self.received_single_time_series = received_single_time_series
+        if df.loc[:, "ds"].isnull().any():
+            raise ValueError("Found NaN in column ds.")
+        if not np.issubdtype(df["ds"].to_numpy().dtype, np.datetime64):
+            df["ds"] = pd.to_datetime(df.loc[:, "ds"], utc=True).dt.tz_convert(None)
+        for name in df.columns:
+            if name not in ["ds", "ID"] and not np.issubdtype(df.loc[:, name].dtype, np.number):
+                df[name] = pd.to_numeric(df[name])
+        for df_name, df_i in df.groupby("ID", sort=False):
+            df_i = df_i.sort_values("ds")
+            if df_i["ds"].duplicated().any():
+                raise ValueError("Column ds has duplicate values. Please remove duplicates.")
+            if df_name not in self.buffers:
+                # values are stored as float64 whatever the dtype of the first rows, keeping NaN and fractions of
+                # later rows of an integer column
+                columns = OrderedDict(
+                    (name, df_i[name].dtype if name == "ds" else np.float64) for name in df_i.columns if name != "ID"
+                )
+                self.buffers[df_name] = _RingBuffer(columns, capacity=self.history_size)
+            buffer = self.buffers[df_name]
+            if buffer.n_rows > 0 and df_i["ds"].iloc[0] <= buffer.last("ds"):
+                raise ValueError(f"Received rows of {df_name} which are not newer than the rows received before.")
+            buffer.append(df_i)
+
+    def predict(
+        self,
+        df: Optional[pd.DataFrame] = None,
+        events_df: Optional[pd.DataFrame] = None,
+        regressors_df: Optional[pd.DataFrame] = None,
+    ) -> pd.DataFrame:
+        """Appends newly arrived observations and forecasts from the newest origin.
+
+        Parameters
+        ----------
+            df : pd.DataFrame
+                dataframe containing column ``ds``, ``y``, and optionally``ID`` with the newly arrived rows, if any
+            events_df : pd.DataFrame
+                future event occurrences of the next ``n_forecasts`` steps, see ``make_future_dataframe``
+            regressors_df : pd.DataFrame
+                future regressor values of the next ``n_forecasts`` steps, see ``make_future_dataframe``
+
+        Returns
+        -------
+            pd.DataFrame
+                latest forecast with columns ``ds``, ``y`` and ``origin-0``, see ``get_latest_forecast``
+        """
+        if df is not None:
+            self.update(df)
+        if len(self.buffers) == 0:
+            raise ValueError("No observations received. Please supply the history to date.")
+        m = self.forecaster
+        history = pd.concat(
+            [buffer.to_frame().assign(ID=df_name) for df_name, buffer in self.buffers.items()], ignore_index=True
+        )
+        if m.config_regressors.regressors is not None and regressors_df is None:
+            raise ValueError("Future values of all user specified regressors not provided")
+        events_dict = df_utils.create_dict_for_events_or_regressors(history, events_df, "events")
+        regressors_dict = df_utils.create_dict_for_events_or_regressors(history, regressors_df, "regressors")
+        frames = []
+        for df_name, df_i in history.groupby("ID", sort=False):
+            if len(df_i) < m.max_lags:
+                raise ValueError(
+                    "Insufficient input data for a prediction."
+                    "Please supply historic observations (number of rows) of at least max_lags."
+                )
+            # forward-fill missing values at the end, like make_future_dataframe
+            y = df_i["y"].to_numpy(copy=True)
+            nan_at_end = len(y) - 1 - np.flatnonzero(~np.isnan(y)).max(initial=-1)
+            if nan_at_end > 0:
+                if nan_at_end + 1 >= m.max_lags:
+                    raise ValueError(f"{nan_at_end + 1} missing values were detected at the end of {df_name}.")
+                y[-nan_at_end:] = y[-nan_at_end - 1]
+                df_i = df_i.assign(y=y)
+            future_df = df_utils.make_future_df(
+                df_columns=df_i.columns,
+                last_date=df_i["ds"].iloc[-1],
+                periods=m.n_forecasts,
+                freq=m.data_freq,
+                config_events=m.config_events,
+                events_df=events_dict[df_name],
+                config_regressors=m.config_regressors,
+                regressors_df=regressors_dict[df_name],
+            )
+            future_df["ID"] = df_name
+            frames.extend((df_i, future_df))
+        df = pd.concat(frames, ignore_index=True)
+        df = _prepare_dataframe_to_predict(model=m, df=df, max_lags=m.max_lags, freq=m.data_freq)
+        # the newest origin only needs the last max_lags observations and the future rows of each series
+        df = df.groupby("ID", sort=False).tail(m.max_lags + m.n_forecasts).reset_index(drop=True)
+        df = _normalize(df=df, config_normalization=m.config_normalization)
+        raw_predictions = m._predict_raw(df, include_components=False, use_trainer=False)
+        fcsts = []
+        for df_name, df_i in df.groupby("ID"):
+            dates, predicted, _ = raw_predictions[df_name]
+            df_i = df_utils.drop_missing_from_df(df_i, m.config_missing.drop_missing, m.n_forecasts, m.n_lags)
+            fcst = _reshape_raw_predictions_to_forecst_df(
+                df=df_i,
+                predicted=predicted,
+                components=None,
+                prediction_frequency=None,
+                dates=dates,
+                n_forecasts=m.n_forecasts,
+                max_lags=m.max_lags,
+                freq=m.data_freq,
+                quantiles=m.config_train.quantiles,
+                config_lagged_regressors=m.config_lagged_regressors,
+            )
+            fcst = utils.fcst_df_to_latest_forecast(fcst[-m.n_forecasts :], m.config_train.quantiles, n_last=1)
+            fcst["ID"] = df_name
+            fcsts.append(fcst)
+        forecast = pd.concat(fcsts, ignore_index=True)
+        return df_utils.return_df_in_original_format(forecast, self.received_ID_col, self.received_single_time_series)
@@ -1,4 +1,5 @@
 import logging
+import math
 from collections import OrderedDict
 from datetime import datetime
 from typing import List, Optional
@@ -7,11 +8,21 @@ import numpy as np
 import pandas as pd
 import torch
 from numpy.lib.stride_tricks import sliding_window_view
+from torch.utils.data import (
+    BatchSampler,
+    DataLoader,
+    IterableDataset,
+    RandomSampler,
+    Sampler,
+    SequentialSampler,
+    default_collate,
+    get_worker_info,
+)
 from torch.utils.data.dataset import Dataset
 
-from neuralprophet import configure, utils
+from neuralprophet import configure, df_utils, utils
 from neuralprophet.df_utils import get_max_num_lags
-from neuralprophet.event_utils import get_all_holidays
+from neuralprophet.event_utils import get_holiday_calendar, get_holiday_features
 
 log = logging.getLogger("NP.time_dataset")
 
@@ -33,36 +44,52 @@ class TimeDataset(Dataset):
         config_regressors,
         config_lagged_regressors,
         config_missing,
+        precompute_tensors: bool = True,
+        id_list: Optional[List[str]] = None,
+        sparse_events: bool = False,
     ):
         """Initialize Timedataset from time-series df.
         Parameters
         ----------
             df : pd.DataFrame
-                Time series data
+                Time series data of a single series (``ID``). Multiple series are only supported through
+                ``GlobalTimeDataset``, which stores them contiguously sorted by ``ID`` and ``ds``.
+            precompute_tensors : bool
+                Convert all model input columns once into contiguous float32 tensors, which are then sliced
+                in ``__getitem__``. If ``False``, every sample is tabularized from the dataframe.
+            id_list : list
+                IDs of all series known to the model, the position of an ID is its integer code in the meta
+                information ``df_id`` of each sample. IDs not in the list are coded as -1.
+                Defaults to the sorted IDs of df.
+            sparse_events : bool
+                Store the event features as their nonzero entries only, and return the events of mini-batches
+                (see ``get_batch``) as sparse COO tensors. Single samples keep dense event features.
         """
         # Outcome after a call to init (summary):
-        # - add events and holidays columns to df
+        # - create the features of events and holidays
         # - calculated the number of usable samples (accounting for nan and filters)
         # - creates mapping of sample index to df index
 
         # Context Notes
         # Currently done to df before it arrives here:
-        # -> fit calls prep_or_copy_df, _check_dataframe, and _handle_missing_data, passes to _train
-        # -> _train calls prep_or_copy_df, then passes to init_train_loader, which returns the train_loader
-        # -> init_train_loader calls prep_or_copy_df, _normalize, _create_dataset (returns TimeDataset), returns dataset wrapped in DataLoader
-        # ->_create_dataset calls prep_or_copy_df, then returns GlobalTimeDataset
+        # -> fit calls prep_or_copy_df, _check_dataframe (copies df), and _handle_missing_data, passes to _train
+        # -> _train passes to init_train_loader, which returns the train_loader
+        # -> init_train_loader calls _normalize (copies df), _create_dataset (returns TimeDataset),
+        #    returns dataset wrapped in DataLoader
+        # ->_create_dataset returns GlobalTimeDataset
+        # Stages after the first copy pass prepared df on with prep_or_copy_df(df, copy=False).
         # Future TODO: integrate some of these preprocessing steps happening outside?
 
-        self.df = df.reset_index(drop=True)  # Needed for index based operations in __getitem__
+        # Shallow copy, self.df is not modified
+        self.df = df.copy(deep=False)
+        self.df.index = pd.RangeIndex(len(df))  # Needed for index based operations in __getitem__
         if "index" in list(self.df.columns):  # should not be the case
             self.df = self.df.drop("index", axis=1)
-        df_names = list(np.unique(df.loc[:, "ID"].values))
-        assert len(df_names) == 1
-        assert isinstance(df_names[0], str)
-        self.df_name = df_names[0]
-
-        self.meta = OrderedDict({})
-        self.meta["df_name"] = self.df_name
+        # Row offsets of each series in self.df, series i is located at id_offsets[i]:id_offsets[i+1]
+        self.df_names, self.id_offsets = get_id_offsets(self.df)
+        # Integer code of each series, the only form in which IDs are passed on to the model
+        id_dict = {df_name: i for i, df_name in enumerate(sorted(self.df_names) if id_list is None else id_list)}
+        self.df_ids = np.array([id_dict.get(df_name, -1) for df_name in self.df_names], dtype=np.int64)
 
         self.predict_mode = predict_mode
         self.n_lags = n_lags
@@ -75,21 +102,24 @@ class TimeDataset(Dataset):
         self.config_regressors = config_regressors
         self.config_lagged_regressors = config_lagged_regressors
         self.config_missing = config_missing
+        self.precompute_tensors = precompute_tensors
+        self.sparse_events = sparse_events
 
         self.max_lags = get_max_num_lags(n_lags=self.n_lags, config_lagged_regressors=self.config_lagged_regressors)
         if self.max_lags == 0:
             assert self.n_forecasts == 1
         self.two_level_inputs = ["seasonalities", "covariates", "events", "regressors"]
 
-        # Preprocessing of events and holidays features (added to self.df)
+        # Preprocessing of events and holidays features, one float32 matrix of all offsets per mode
         (
-            self.df,
+            self.event_features,
             self.additive_event_and_holiday_names,
             self.multiplicative_event_and_holiday_names,
-        ) = add_event_features_to_df(
+        ) = create_event_features(
             self.df,
             self.config_events,
             self.config_country_holidays,
+            self.id_offsets,
         )
         # pre-sort additive/multiplicative regressors
         self.additive_regressors_names, self.multiplicative_regressors_names = sort_regressor_names(
@@ -98,6 +128,12 @@ class TimeDataset(Dataset):
 
         # Construct index map
         self.sample2index_map, self.length = self.create_sample2index_map(self.df)
+        # Series of each sample, given by the segment containing its origin
+        self.sample_series_index = np.searchsorted(self.id_offsets, self.sample2index_map, side="right") - 1
+        self.sample_df_ids = torch.as_tensor(self.df_ids[self.sample_series_index])
+
+        # Columnar float32 tensors of all model inputs, sliced in __getitem__
+        self.df_tensors = self.create_df_tensors(self.df) if self.precompute_tensors else None
 
     def __getitem__(self, index):
         """Overrides parent class method to get an item at index.
@@ -126,13 +162,31 @@ class TimeDataset(Dataset):
         np.array, float
             Targets to be predicted of same length as each of the model inputs, dims: (num_samples, n_forecasts)
         OrderedDict
-            Meta information: static information about the local dataset
+            Meta information: integer code ``df_id`` of the series of the sample
         """
+        if np.ndim(index) > 0:
+            # whole mini-batch requested by a batch sampler
+            return self.get_batch(index)
+
         # Convert dataset sample index to valid dataframe positional index
         # - sample index is any index up to len(dataset)
         # - dataframe positional index is given by position of first target in dataframe for given sample index
         df_index = self.sample_index_to_df_index(index)
 
+        if self.df_tensors is not None:
+            # Slice precomputed tensors at given target index position
+            inputs, target = tabularize_univariate_datetime_single_index_from_tensors(
+                df_tensors=self.df_tensors,
+                origin_index=df_index,
+                predict_mode=self.predict_mode,
+                n_lags=self.n_lags,
+                max_lags=self.max_lags,
+                n_forecasts=self.n_forecasts,
+                config_seasonality=self.config_seasonality,
+                config_lagged_regressors=self.config_lagged_regressors,
+            )
+            return inputs, target, self.get_meta(index)
+
         # Tabularize - extract features from dataframe at given target index position
         inputs, target = tabularize_univariate_datetime_single_index(
             df=self.df,
@@ -143,65 +197,150 @@ class TimeDataset(Dataset):
             n_forecasts=self.n_forecasts,
             config_seasonality=self.config_seasonality,
             config_lagged_regressors=self.config_lagged_regressors,
-            additive_event_and_holiday_names=self.additive_event_and_holiday_names,
-            multiplicative_event_and_holiday_names=self.multiplicative_event_and_holiday_names,
+            event_features=self.event_features,
             additive_regressors_names=self.additive_regressors_names,
             multiplicative_regressors_names=self.multiplicative_regressors_names,
         )
-        return inputs, target, self.meta
+        return inputs, target, self.get_meta(index)
+
+    def get_batch(self, indices):
+        """Get a whole mini-batch of samples at once.
+
+        Parameters
+        ----------
+            indices : list, np.array
+                Sample locations in dataset
+
+        Returns
+        -------
+            OrderedDict, torch.Tensor, OrderedDict
+                Model inputs, targets and meta information with the batch as first dimension.
+                Identical to collating the individual samples with the default torch collate function.
+        """
+        if self.df_tensors is None:
+            inputs, targets, meta = default_collate([self.__getitem__(index) for index in indices])
+            return inputs, targets, meta
+        origin_indices = self.sample2index_map[np.asarray(indices, dtype=np.int64)]
+        inputs, targets = tabularize_univariate_datetime_batch_from_tensors(
+            df_tensors=self.df_tensors,
+            origin_indices=origin_indices,
+            predict_mode=self.predict_mode,
+            n_lags=self.n_lags,
+            max_lags=self.max_lags,
+            n_forecasts=self.n_forecasts,
+            config_seasonality=self.config_seasonality,
+            config_lagged_regressors=self.config_lagged_regressors,
+        )
+        return inputs, targets, self.get_meta(indices)
+
+    def get_meta(self, indices):
+        """Meta information of a sample or a mini-batch of samples.
+
+        Parameters
+        ----------
+            indices : int, list, np.array
+                Sample location(s) in dataset
+
+        Returns
+        -------
+            OrderedDict
+                ``df_id``: int64 code(s) of the series (see ``id_list``)
+        """
+        meta = OrderedDict({})
+        meta["df_id"] = self.sample_df_ids[torch.as_tensor(indices, dtype=torch.int64)]
+        return meta
 
     def __len__(self):
         """Overrides Parent class method to get data length."""
         return self.length
 
-    def sample_index_to_df_index(self, sample_index):
+    def sample_index_to_df_index(self, sample_index: int) -> int:
         """Translates a single outer sample to dataframe index"""
-        return self.sample2index_map[sample_index]
+        return int(self.sample2index_map[sample_index])
 
-    def create_sample2index_map(self, df):
-        """creates mapping of sample index to corresponding df index at prediction origin.
-        (prediction origin: last observation before forecast / future period starts).
-        return created mapping to sample2index_map and number of samples.
+    def create_df_tensors(self, df):
+        """Converts all columns used as model inputs once into contiguous float32 tensors.
+
+        Parameters
+        ----------
+            df : pd.DataFrame
+                Time series data with normalized columns
+
+        Returns
+        -------
+            OrderedDict
+                Columnar storage of model inputs, each of len(df) in the first dimension
+
+                Note
+                ----
+                Contains the following data:
+                    * ``t`` (torch.Tensor, float), dims: (len(df))
+                    * ``y_scaled`` (torch.Tensor, float), dims: (len(df)), only if present in df
+                    * ``covariates`` (OrderedDict), named lagged regressors, each of dims: (len(df))
+                    * ``regressors`` (OrderedDict), ``additive`` and ``multiplicative`` future regressors,
+                    each of dims: (len(df), n_regressors)
+                    * ``events`` (OrderedDict), ``additive`` and ``multiplicative`` events and holidays,
+                    each of dims: (len(df), n_events), as ``SparseRows`` if ``sparse_events``
+                    * ``seasonalities`` (OrderedDict), named seasonalities with condition values applied,
+                    each of dims: (len(df), n_features[name]), see ``compute_seasonality_features``
         """
 
-        # Limit target range due to input lags and number of forecasts
-        df_length = len(df)
-        origin_start_end_mask = create_origin_start_end_mask(
-            df_length=df_length, max_lags=self.max_lags, n_forecasts=self.n_forecasts
+        def to_tensor(names):
+            return torch.from_numpy(np.ascontiguousarray(df.loc[:, names].to_numpy(dtype=np.float32)))
+
+        df_tensors = OrderedDict({})
+        df_tensors["t"] = to_tensor("t")
+        if "y_scaled" in df.columns:
+            df_tensors["y_scaled"] = to_tensor("y_scaled")
+
+        if self.config_lagged_regressors is not None:
+            df_tensors["covariates"] = OrderedDict({})
+            for name in df.columns:
+                if name in self.config_lagged_regressors:
+                    df_tensors["covariates"][name] = to_tensor(name)
+
+        df_tensors["regressors"] = OrderedDict({})
+        for mode, names in zip(
+            ("additive", "multiplicative"), (self.additive_regressors_names, self.multiplicative_regressors_names)
+        ):
+            if len(names) > 0:
+                df_tensors["regressors"][mode] = to_tensor(names)
+
+        # event features are float32 arrays already
+        df_tensors["events"] = OrderedDict(
+            (mode, SparseRows.from_dense(features) if self.sparse_events else torch.from_numpy(features))
+            for mode, features in self.event_features.items()
         )
 
-        # Prediction Frequency
-        # Filter missing samples and prediction frequency (does not actually drop, but creates indexmapping)
-        prediction_frequency_mask = create_prediction_frequency_filter_mask(df, self.prediction_frequency)
+        if self.config_seasonality is not None:
+            # Fourier features are computed once per row, samples only slice their window
+            df_tensors["seasonalities"] = OrderedDict({})
+            for name, features in compute_seasonality_features(df, self.config_seasonality).items():
+                df_tensors["seasonalities"][name] = torch.from_numpy(np.ascontiguousarray(features, dtype=np.float32))
+        return df_tensors
 
-        # Combine prediction origin masks
-        valid_prediction_mask = np.logical_and(prediction_frequency_mask, origin_start_end_mask)
-
-        # Create NAN-free index mapping of sample index to df index
-        nan_mask = create_nan_mask(
-            df=df,
+    def create_sample2index_map(self, df):
+        """creates mapping of sample index to corresponding df index at prediction origin.
+        (prediction origin: last observation before forecast / future period starts).
+        return created mapping to sample2index_map and number of samples.
+        """
+        valid_sample_mask = create_sample_mask(
+            df,
+            id_offsets=self.id_offsets,
             predict_mode=self.predict_mode,
             max_lags=self.max_lags,
             n_lags=self.n_lags,
             n_forecasts=self.n_forecasts,
+            prediction_frequency=self.prediction_frequency,
             config_lagged_regressors=self.config_lagged_regressors,
             future_regressor_names=self.additive_regressors_names + self.multiplicative_regressors_names,
-            event_names=self.additive_event_and_holiday_names + self.multiplicative_event_and_holiday_names,
-        )  # boolean array where NAN are False
-
-        # Filter NAN
-        valid_sample_mask = np.logical_and(valid_prediction_mask, nan_mask)
-        n_clean_data_samples = sum(valid_prediction_mask)
-        n_real_data_samples = sum(valid_sample_mask)
-        nan_samples_to_drop = n_clean_data_samples - n_real_data_samples
-        if nan_samples_to_drop > 0 and not self.config_missing.drop_missing:
-            raise ValueError(
-                f"NANs found. {nan_samples_to_drop} samples affected. Set `drop_missing` to `True` to drop these samples."
-            )
+            event_features=self.event_features,
+            config_missing=self.config_missing,
+        )
 
         # Convert boolean valid_sample to list of the positinal index of all true/one entries
         #   e.g. [0,0,1,1,0,1,0] -> [2,3,5]
-        index_range = np.arange(0, df_length)
+        index_range = np.arange(0, len(df))
         sample_index_2_df_origin_index = index_range[valid_sample_mask]
 
         num_samples = np.sum(valid_sample_mask)
@@ -225,54 +364,323 @@ class GlobalTimeDataset(TimeDataset):
         config_regressors,
         config_lagged_regressors,
         config_missing,
+        precompute_tensors: bool = True,
+        id_list: Optional[List[str]] = None,
+        sparse_events: bool = False,
     ):
         """Initialize Timedataset from time-series df.
+
+        All series are sorted once by ``ID`` and ``ds`` and share one set of columns (and tensors),
+        each series being addressed by its row offsets instead of a separate copy.
+
         Parameters
         ----------
             df : pd.DataFrame
                 dataframe containing column ``ds``, ``y``, and optionally``ID`` and
                 normalized columns normalized columns ``ds``, ``y``, ``t``, ``y_scaled``
+            precompute_tensors : bool
+                Convert model inputs once into float32 tensors (see ``TimeDataset``)
+            id_list : list
+                IDs of all series known to the model, defining their integer codes (see ``TimeDataset``)
+            sparse_events : bool
+                Return the events of mini-batches as sparse COO tensors (see ``TimeDataset``)
 
         """
-        self.df_names = sorted(list(np.unique(df.loc[:, "ID"].values)))
-        self.datasets = OrderedDict({})
-        for df_name in self.df_names:
-            self.datasets[df_name] = TimeDataset(
-                df=df[df["ID"] == df_name],
-                predict_mode=predict_mode,
-                n_lags=n_lags,
-                n_forecasts=n_forecasts,
-                prediction_frequency=prediction_frequency,
-                predict_steps=predict_steps,
-                config_seasonality=config_seasonality,
-                config_events=config_events,
-                config_country_holidays=config_country_holidays,
-                config_regressors=config_regressors,
-                config_lagged_regressors=config_lagged_regressors,
-                config_missing=config_missing,
+        df = sort_by_id_and_ds(df)
+        super().__init__(
+            df=df,
+            predict_mode=predict_mode,
+            n_lags=n_lags,
+            n_forecasts=n_forecasts,
+            prediction_frequency=prediction_frequency,
+            predict_steps=predict_steps,
+            config_seasonality=config_seasonality,
+            config_events=config_events,
+            config_country_holidays=config_country_holidays,
+            config_regressors=config_regressors,
+            config_lagged_regressors=config_lagged_regressors,
+            config_missing=config_missing,
+            precompute_tensors=precompute_tensors,
+            id_list=id_list,
+            sparse_events=sparse_events,
+        )
+
+
+class SparseRows:
+    """Nonzero entries of a float32 feature matrix, stored row by row (compressed sparse rows)."""
+
+    def __init__(self, row_offsets: torch.Tensor, columns: torch.Tensor, values: torch.Tensor, n_columns: int):
+        """
+        Parameters
+        ----------
+            row_offsets : torch.Tensor
+                int64 offsets of length n_rows + 1, the entries of row i are located at row_offsets[i]:row_offsets[i+1]
+            columns : torch.Tensor
+                int64 column of each entry, ascending within each row
+            values : torch.Tensor
+                float32 value of each entry
+            n_columns : int
+                number of columns of the matrix
+        """
+        self.row_offsets = row_offsets
+        self.columns = columns
+        self.values = values
+        self.n_columns = n_columns
+
+    @classmethod
+    def from_dense(cls, features: np.ndarray):
+        """Stores the nonzero entries of a matrix of dims (n_rows, n_columns)."""
+        rows, columns = np.nonzero(features)
+        row_offsets = np.zeros(features.shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=features.shape[0]), out=row_offsets[1:])
+        return cls(
+            row_offsets=torch.from_numpy(row_offsets),
+            columns=torch.from_numpy(columns.astype(np.int64)),
+            values=torch.from_numpy(np.ascontiguousarray(features[rows, columns], dtype=np.float32)),
+            n_columns=features.shape[1],
+        )
+
+    def __len__(self):
+        return len(self.row_offsets) - 1
+
+    def gather(self, row_indices: torch.Tensor) -> torch.Tensor:
+        """Gathers the given rows into a sparse COO tensor.
+
+        Parameters
+        ----------
+            row_indices : torch.Tensor
+                int64 rows to gather, of dims (batch_size, window_length)
+
+        Returns
+        -------
+            torch.Tensor
+                sparse COO tensor of dims (batch_size, window_length, n_columns), with sorted unique indices
+        """
+        window_length = row_indices.shape[1]
+        rows = row_indices.reshape(-1)
+        starts = self.row_offsets[rows]
+        counts = self.row_offsets[rows + 1] - starts
+        # position of the row in the flattened row_indices, and the index of the entry, for each gathered entry
+        positions = torch.repeat_interleave(counts)
+        first_entries = torch.cumsum(counts, dim=0) - counts
+        entries = starts[positions] + torch.arange(len(positions)) - first_entries[positions]
+        indices = torch.stack(
+            (
+                torch.div(positions, window_length, rounding_mode="floor"),
+                positions % window_length,
+                self.columns[entries],
             )
-        self.length = sum(dataset.length for (name, dataset) in self.datasets.items())
-        global_sample_to_local_ID = []
-        global_sample_to_local_sample = []
-        for name, dataset in self.datasets.items():
-            global_sample_to_local_ID.append(np.full(shape=dataset.length, fill_value=name))
-            global_sample_to_local_sample.append(np.arange(dataset.length))
-        self.global_sample_to_local_ID = np.concatenate(global_sample_to_local_ID)
-        self.global_sample_to_local_sample = np.concatenate(global_sample_to_local_sample)
+        )
+        return torch.sparse_coo_tensor(
+            indices,
+            self.values[entries],
+            size=(row_indices.shape[0], window_length, self.n_columns),
+            check_invariants=False,
+        )
+
+    def to_dense(self, start: int, end: int) -> torch.Tensor:
+        """Rows start:end as a dense tensor of dims (end - start, n_columns)."""
+        return self.gather(torch.arange(start, end).unsqueeze(0)).to_dense()[0]
+
+
+def sort_by_id_and_ds(df):
+    """Sorts df by ``ID`` and ``ds``, without copying if it is sorted already.
+
+    Parameters
+    ----------
+        df : pd.DataFrame
+            dataframe containing columns ``ds`` and ``ID``
+
+    Returns
+    -------
+        pd.DataFrame
+            dataframe with all rows of each series stored contiguously in chronological order
+    """
+    codes, _ = pd.factorize(df["ID"], sort=True)
+    order = np.lexsort((df["ds"].values, codes))
+    if np.array_equal(order, np.arange(len(order))):
+        return df
+    return df.take(order)
+
+
+def get_id_offsets(df):
+    """Gets the row offsets of each series in a df which stores every series contiguously.
+
+    Parameters
+    ----------
+        df : pd.DataFrame
+            dataframe containing column ``ID``, sorted by ``ID``
+
+    Returns
+    -------
+        list
+            IDs of the series in order of their occurrence
+        np.array
+            row offsets of length len(IDs) + 1, series i is located at offsets[i]:offsets[i+1]
+    """
+    ids = df.loc[:, "ID"].values
+    offsets = df_utils.get_series_offsets(ids)
+    df_names = list(ids[offsets[:-1]])
+    assert len(set(df_names)) == len(df_names), "rows of each series (ID) must be contiguous"
+    assert all(isinstance(df_name, str) for df_name in df_names)
+    return df_names, offsets
+
+
+class StreamingTimeDataset(IterableDataset):
+    """Iterates over the mini-batches of partitioned data, keeping only one chunk of data in memory at a time."""
+
+    def __init__(
+        self,
+        chunks,
+        create_dataset,
+        chunk_num_samples: List[int],
+        batch_size: Optional[int] = None,
+        shuffle: bool = False,
+    ):
+        """Initialize the streaming dataset.
+
+        Parameters
+        ----------
+            chunks : DataFrameChunks
+                Sequence of chunks, each loaded when accessed
+            create_dataset : callable
+                Prepares a chunk and returns its ``TimeDataset``, called as
+                ``create_dataset(df, precompute_tensors=...)``
+            chunk_num_samples : list
+                Number of samples of each chunk, counted in the pass over the data for its statistics (see
+                ``count_samples``) instead of creating the dataset of each chunk twice
+            batch_size : int
+                Number of samples per batch, required for iterating. Batches do not span chunks.
+            shuffle : bool
+                Whether to reshuffle the order of the chunks and the samples within each chunk every epoch
+        """
+        self.chunks = chunks
+        self.create_dataset = create_dataset
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.chunk_num_samples = list(chunk_num_samples)
+        self.num_samples = sum(self.chunk_num_samples)
 
     def __len__(self):
-        return self.length
+        """Number of batches per epoch."""
+        assert self.batch_size is not None
+        return sum(math.ceil(num_samples / self.batch_size) for num_samples in self.chunk_num_samples)
+
+    def __iter__(self):
+        assert self.batch_size is not None
+        worker_info = get_worker_info()
+        # all workers share the chunk order of an epoch, each worker processing a subset of the chunks
+        if worker_info is None:
+            seed = int(torch.randint(2**31, ()).item())
+        else:
+            seed = worker_info.seed - worker_info.id
+        rng = np.random.default_rng(seed)
+        order = rng.permutation(len(self.chunks)) if self.shuffle else np.arange(len(self.chunks))
+        if worker_info is not None:
+            order = order[worker_info.id :: worker_info.num_workers]
+        for chunk_index in order:
+            if self.chunk_num_samples[chunk_index] == 0:
+                continue
+            dataset = self.create_dataset(self.chunks[chunk_index], precompute_tensors=True)
+            if self.shuffle:
+                generator = torch.Generator().manual_seed(int(rng.integers(2**31)))
+                sampler = RandomSampler(dataset, generator=generator)
+            else:
+                sampler = SequentialSampler(dataset)
+            for indices in BatchSampler(sampler, batch_size=self.batch_size, drop_last=False):
+                yield dataset.get_batch(indices)
+
+
+class DistributedBatchSampler(Sampler):
+    """Samples the mini-batches of a dataset, split between the processes of data-parallel training (DDP).
+
+    Outside of an initialized ``torch.distributed`` process group, batches all samples like ``BatchSampler``. Within
+    one, each process iterates over its share of an epoch: the processes shuffle alike, with a seed broadcast from
+    rank 0, and the samples are padded by repeating the first ones to the same number per process, like
+    ``DistributedSampler``. Each process thereby runs the same number of equally sized batches, and the gradients of
+    the mean batch losses, averaged by DDP, are those of the mean loss of the global batch.
+    """
+
+    def __init__(self, dataset, batch_size: int, shuffle: bool = False, drop_last: bool = False):
+        """Initialize the sampler of the batches of ``dataset``.
 
-    def __getitem__(self, idx):
-        """Overrides parent class method to get an item at index.
         Parameters
         ----------
-            index : int
-                Sample location in dataset, starting at 0
+            dataset : TimeDataset, GlobalTimeDataset
+                Dataset to sample from
+            batch_size : int
+                Number of samples per batch and process
+            shuffle : bool
+                Whether to reshuffle the samples every epoch
+            drop_last : bool
+                Whether to drop the last incomplete batch
         """
-        df_name = self.global_sample_to_local_ID[idx]
-        local_pos = self.global_sample_to_local_sample[idx]
-        return self.datasets[df_name].__getitem__(local_pos)
+        self.num_samples = len(dataset)
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        sampler = RandomSampler(dataset) if shuffle else SequentialSampler(dataset)
+        self.batch_sampler = BatchSampler(sampler, batch_size=batch_size, drop_last=drop_last)
+
+    @staticmethod
+    def _get_rank_and_world_size():
+        # resolved when iterating, as the process group is set up in the processes launched by the Trainer
+        if torch.distributed.is_available() and torch.distributed.is_initialized():
+            return torch.distributed.get_rank(), torch.distributed.get_world_size()
+        return 0, 1
+
+    def __len__(self):
+        """Number of batches per epoch of this process."""
+        _, world_size = self._get_rank_and_world_size()
+        if world_size == 1:
+            return len(self.batch_sampler)
+        num_samples = math.ceil(self.num_samples / world_size)
+        return num_samples // self.batch_size if self.drop_last else math.ceil(num_samples / self.batch_size)
+
+    def __iter__(self):
+        rank, world_size = self._get_rank_and_world_size()
+        if world_size == 1 or self.num_samples == 0:
+            yield from self.batch_sampler
+            return
+        if self.shuffle:
+            seed = torch.empty((), dtype=torch.int64).random_()
+            torch.distributed.broadcast(seed, src=0)
+            indices = torch.randperm(self.num_samples, generator=torch.Generator().manual_seed(int(seed)))
+        else:
+            indices = torch.arange(self.num_samples)
+        num_samples = math.ceil(self.num_samples / world_size)
+        indices = indices.repeat(math.ceil(num_samples * world_size / self.num_samples))[: num_samples * world_size]
+        for batch in indices[rank::world_size].split(self.batch_size):
+            if self.drop_last and len(batch) < self.batch_size:
+                break
+            yield batch.tolist()
+
+
+def create_batched_loader(dataset, batch_size, shuffle=False, drop_last=False, **kwargs):
+    """Create a DataLoader which fetches each mini-batch with a single call to ``dataset.get_batch``.
+
+    In data-parallel training, each process loads its share of the batches, see ``DistributedBatchSampler``.
+
+    Parameters
+    ----------
+        dataset : TimeDataset, GlobalTimeDataset
+            Dataset to load samples from
+        batch_size : int
+            Number of samples per batch
+        shuffle : bool
+            Whether to reshuffle the samples every epoch
+        drop_last : bool
+            Whether to drop the last incomplete batch
+        **kwargs
+            Further arguments passed to ``torch.utils.data.DataLoader``
+
+    Returns
+    -------
+        torch.utils.data.DataLoader
+    """
+    batch_sampler = DistributedBatchSampler(dataset, batch_size=batch_size, shuffle=shuffle, drop_last=drop_last)
+    # batch_size=None disables the per-sample collation, the dataset returns batches already
+    return DataLoader(dataset, sampler=batch_sampler, batch_size=None, **kwargs)
 
 
 def get_sample_targets(df, origin_index, n_forecasts, max_lags, predict_mode):
@@ -306,28 +714,126 @@ def get_sample_lagged_regressors(df, origin_index, config_lagged_regressors):
     return lagged_regressors
 
 
+def get_seasonality_time(dates):
+    """Converts dates to the time in days used for seasonality features.
+
+    Parameters
+    ----------
+        dates : pd.Series
+            Containing time stamps
+
+    Returns
+    -------
+        np.array
+            float32 days since 1900-01-01
+    """
+    return np.array((dates - datetime(1900, 1, 1)).dt.total_seconds().astype(np.float32)) / (3600 * 24.0)
+
+
+def get_seasonality_features(dates, period, computation="fourier"):
+    """Computes the features of a single seasonality for the given dates.
+
+    Parameters
+    ----------
+        dates : pd.Series
+            Containing time stamps
+        period : configure.Season
+            Seasonality configuration with ``period`` and ``resolution``
+        computation : str
+            Type of seasonality features, only ``fourier`` is supported
+
+    Returns
+    -------
+        np.array
+            Matrix with seasonality features, dims: (len(dates), 2*resolution)
+    """
+    if computation != "fourier":
+        raise NotImplementedError
+    # Compute Fourier series components with the specified frequency and order.
+    t = get_seasonality_time(dates)
+    # features: Matrix with dims (length len(dates), 2*resolution)
+    features = np.column_stack(
+        [np.sin(2.0 * (i + 1) * np.pi * t / period.period) for i in range(period.resolution)]
+        + [np.cos(2.0 * (i + 1) * np.pi * t / period.period) for i in range(period.resolution)]
+    )
+    return features
+
+
+def compute_seasonality_features(df, config_seasonality):
+    """Computes the features of all seasonalities once for every row of df, with condition values applied.
+
+    Parameters
+    ----------
+        df : pd.DataFrame
+            dataframe containing column ``ds`` and the seasonality condition columns
+        config_seasonality : configure.ConfigSeasonality
+            Configuration for seasonalities
+
+    Returns
+    -------
+        OrderedDict
+            named seasonalities, each with features (np.array, float) - dims: (len(df), n_features[name]).
+            With ``fourier_fused`` computation, the features are computed by the model instead, from ``ds`` with
+            the time in days and the values of the seasonality conditions, each of dims (len(df))
+    """
+    seasonalities = OrderedDict({})
+    dates = pd.Series(pd.to_datetime(df.loc[:, "ds"]).values)
+    if config_seasonality.computation == "fourier_fused":
+        return get_seasonality_time_and_conditions(df, dates, config_seasonality)
+    for name, period in config_seasonality.periods.items():
+        if period.resolution > 0:
+            features = get_seasonality_features(dates, period, config_seasonality.computation)
+            if period.condition_name is not None:
+                # multiply seasonality features with condition mask/values
+                features = features * df.loc[:, period.condition_name].values[:, np.newaxis]
+            seasonalities[name] = features
+    return seasonalities
+
+
+def get_seasonality_time_and_conditions(df, dates, config_seasonality):
+    """Time in days and seasonality conditions, from which the model computes the features of all seasonalities.
+
+    Parameters
+    ----------
+        df : pd.DataFrame
+            dataframe containing the seasonality condition columns, aligned with dates
+        dates : pd.Series
+            Containing time stamps
+        config_seasonality : configure.ConfigSeasonality
+            Configuration for seasonalities
+
+    Returns
+    -------
+        OrderedDict
+            ``ds`` with the time in days (see ``get_seasonality_time``) and the values of each condition, each
+            (np.array, float) of dims (len(dates))
+    """
+    seasonalities = OrderedDict({"ds": get_seasonality_time(dates)})
+    for period in config_seasonality.periods.values():
+        if period.resolution > 0 and period.condition_name is not None:
+            seasonalities[period.condition_name] = df.loc[:, period.condition_name].to_numpy(dtype=np.float32)
+    return seasonalities
+
+
 def get_sample_seasonalities(df, origin_index, n_forecasts, max_lags, n_lags, config_seasonality):
-    # TODO: precompute and save fourier features and only tabularize / slide windows when calling __getitem_
+    # Note: TimeDataset with precompute_tensors caches these features via compute_seasonality_features
     seasonalities = OrderedDict({})
     if max_lags == 0:
         dates = pd.Series(df.at[origin_index, "ds"])
     else:
         # Note: df.loc is inclusive of slice end, while df.iloc is not.
         dates = pd.Series(df.loc[origin_index - n_lags + 1 : origin_index + n_forecasts, "ds"].values)
+    if config_seasonality.computation == "fourier_fused":
+        if max_lags == 0:
+            window = df.loc[[origin_index]]
+        else:
+            window = df.loc[origin_index - n_lags + 1 : origin_index + n_forecasts]
+        inputs = get_seasonality_time_and_conditions(window, dates, config_seasonality)
+        return OrderedDict((name, torch.as_tensor(values, dtype=torch.float32)) for name, values in inputs.items())
     # Seasonality features
     for name, period in config_seasonality.periods.items():
         if period.resolution > 0:
-            if config_seasonality.computation == "fourier":
-                # Compute Fourier series components with the specified frequency and order.
-                # convert to days since epoch
-                t = np.array((dates - datetime(1900, 1, 1)).dt.total_seconds().astype(np.float32)) / (3600 * 24.0)
-                # features: Matrix with dims (length len(dates), 2*resolution)
-                features = np.column_stack(
-                    [np.sin(2.0 * (i + 1) * np.pi * t / period.period) for i in range(period.resolution)]
-                    + [np.cos(2.0 * (i + 1) * np.pi * t / period.period) for i in range(period.resolution)]
-                )
-            else:
-                raise NotImplementedError
+            features = get_seasonality_features(dates, period, config_seasonality.computation)
             if period.condition_name is not None:
                 # multiply seasonality features with condition mask/values
                 if max_lags == 0:
@@ -368,41 +874,16 @@ def get_sample_future_regressors(
     return regressors
 
 
-def get_sample_future_events(
-    df,
-    origin_index,
-    n_forecasts,
-    max_lags,
-    n_lags,
-    additive_event_and_holiday_names,
-    multiplicative_event_and_holiday_names,
-):
+def get_sample_future_events(event_features, origin_index, n_forecasts, max_lags, n_lags):
     events = OrderedDict({})
     if max_lags == 0:
         # forecasts are at origin_index
-        if len(additive_event_and_holiday_names) > 0:
-            features = df.loc[origin_index, additive_event_and_holiday_names].values
-            events["additive"] = torch.as_tensor(
-                np.expand_dims(np.array(features, dtype=np.float32), axis=0), dtype=torch.float32
-            )
-        if len(multiplicative_event_and_holiday_names) > 0:
-            features = df.loc[origin_index, multiplicative_event_and_holiday_names].values
-            events["multiplicative"] = torch.as_tensor(
-                np.expand_dims(np.array(features, dtype=np.float32), axis=0), dtype=torch.float32
-            )
+        start, end = origin_index, origin_index + 1
     else:
         # forecasts are at origin_index + 1 up to origin_index + n_forecasts
-        if len(additive_event_and_holiday_names) > 0:
-            features = df.loc[
-                origin_index + 1 - n_lags : origin_index + n_forecasts, additive_event_and_holiday_names
-            ].values
-            events["additive"] = torch.as_tensor(np.array(features, dtype=np.float32), dtype=torch.float32)
-
-        if len(multiplicative_event_and_holiday_names) > 0:
-            features = df.loc[
-                origin_index + 1 - n_lags : origin_index + n_forecasts, multiplicative_event_and_holiday_names
-            ].values
-            events["multiplicative"] = torch.as_tensor(np.array(features, dtype=np.float32), dtype=torch.float32)
+        start, end = origin_index + 1 - n_lags, origin_index + n_forecasts + 1
+    for mode, features in event_features.items():
+        events[mode] = torch.as_tensor(features[start:end], dtype=torch.float32)
     return events
 
 
@@ -431,8 +912,7 @@ def tabularize_univariate_datetime_single_index(
     n_forecasts: int = 1,
     config_seasonality: Optional[configure.ConfigSeasonality] = None,
     config_lagged_regressors: Optional[configure.ConfigLaggedRegressors] = None,
-    additive_event_and_holiday_names: List[str] = [],
-    multiplicative_event_and_holiday_names: List[str] = [],
+    event_features: Optional[OrderedDict] = None,
     additive_regressors_names: List[str] = [],
     multiplicative_regressors_names: List[str] = [],
 ):
@@ -546,16 +1026,13 @@ def tabularize_univariate_datetime_single_index(
     # FUTURE EVENTS: get the events features
     # create numpy array of values of additive and multiplicative events, at correct indexes
     # features dims: (n_forecasts, n_features)
-    any_events = 0 < len(additive_event_and_holiday_names + multiplicative_event_and_holiday_names)
-    if any_events:
+    if event_features is not None and len(event_features) > 0:
         inputs["events"] = get_sample_future_events(
-            df=df,
+            event_features=event_features,
             origin_index=origin_index,
             n_forecasts=n_forecasts,
             max_lags=max_lags,
             n_lags=n_lags,
-            additive_event_and_holiday_names=additive_event_and_holiday_names,
-            multiplicative_event_and_holiday_names=multiplicative_event_and_holiday_names,
         )
 
     # ONLY FOR DEBUGGING
@@ -564,6 +1041,178 @@ def tabularize_univariate_datetime_single_index(
     return inputs, targets
 
 
+def tabularize_univariate_datetime_single_index_from_tensors(
+    df_tensors: OrderedDict,
+    origin_index: int,
+    predict_mode: bool = False,
+    n_lags: int = 0,
+    max_lags: int = 0,
+    n_forecasts: int = 1,
+    config_seasonality: Optional[configure.ConfigSeasonality] = None,
+    config_lagged_regressors: Optional[configure.ConfigLaggedRegressors] = None,
+):
+    """Create a tabular data sample by slicing precomputed columnar tensors, used for mini-batch creation.
+    Note
+    ----
+    Equivalent to ``tabularize_univariate_datetime_single_index``, without any pandas operations per sample.
+    ----------
+        df_tensors : OrderedDict
+            Columnar float32 tensors of all model inputs, as created by ``TimeDataset.create_df_tensors``
+        origin_index: int:
+            dataframe index position of last observed lag before forecast starts.
+        n_forecasts : int
+            Number of steps to forecast into future
+        n_lags : int
+            Number of lagged values of series to include as model inputs (aka AR-order)
+        config_seasonality : configure.ConfigSeasonality
+            Configuration for seasonalities
+        config_lagged_regressors : configure.ConfigLaggedRegressors
+            Configurations for lagged regressors
+        predict_mode : bool
+            Chooses the prediction mode
+            Options
+                * (default) ``False``: Includes target values
+                * ``True``: Does not include targets but includes entire dataset as input
+    Returns
+    -------
+        OrderedDict
+            Model inputs, see ``tabularize_univariate_datetime_single_index``
+        torch.Tensor, float
+            Targets to be predicted of same length as each of the model inputs, dims: (n_forecasts, 1)
+    """
+    # Note: if max_lags == 0, then n_forecasts == 1
+    if max_lags == 0:
+        # features are only taken at origin_index
+        start, end = origin_index, origin_index + 1
+    else:
+        # n_lags steps before and including origin_index and n_forecasts steps after origin_index
+        start, end = origin_index - n_lags + 1, origin_index + n_forecasts + 1
+
+    inputs = OrderedDict({})
+
+    # TARGETS
+    if predict_mode:
+        targets = torch.zeros((n_forecasts, 1), dtype=torch.float32)
+    elif max_lags == 0:
+        targets = df_tensors["y_scaled"][origin_index : origin_index + 1].unsqueeze(1)
+    else:
+        targets = df_tensors["y_scaled"][origin_index + 1 : origin_index + n_forecasts + 1].unsqueeze(1)
+
+    # TIME
+    inputs["time"] = df_tensors["t"][start:end]
+
+    # LAGS
+    if n_lags >= 1 and "y_scaled" in df_tensors:
+        inputs["lags"] = df_tensors["y_scaled"][origin_index - n_lags + 1 : origin_index + 1]
+
+    # COVARIATES / LAGGED REGRESSORS
+    if config_lagged_regressors is not None:
+        inputs["covariates"] = OrderedDict({})
+        for name, values in df_tensors["covariates"].items():
+            covar_lags = config_lagged_regressors[name].n_lags
+            assert covar_lags > 0
+            inputs["covariates"][name] = values[origin_index - covar_lags + 1 : origin_index + 1]
+
+    # SEASONALITIES, FUTURE REGRESSORS and EVENTS, dims: (n_lags + n_forecasts, n_features)
+    for key in ("seasonalities", "regressors", "events"):
+        if len(df_tensors.get(key, {})) > 0:
+            inputs[key] = OrderedDict(
+                {
+                    mode: values.to_dense(start, end) if isinstance(values, SparseRows) else values[start:end]
+                    for mode, values in df_tensors[key].items()
+                }
+            )
+
+    return inputs, targets
+
+
+def tabularize_univariate_datetime_batch_from_tensors(
+    df_tensors: OrderedDict,
+    origin_indices: np.ndarray,
+    predict_mode: bool = False,
+    n_lags: int = 0,
+    max_lags: int = 0,
+    n_forecasts: int = 1,
+    config_seasonality: Optional[configure.ConfigSeasonality] = None,
+    config_lagged_regressors: Optional[configure.ConfigLaggedRegressors] = None,
+):
+    """Create a mini-batch of tabular data samples with one vectorized gather per feature group.
+    Note
+    ----
+    Identical to stacking the samples of ``tabularize_univariate_datetime_single_index_from_tensors``.
+    ----------
+        df_tensors : OrderedDict
+            Columnar float32 tensors of all model inputs, as created by ``TimeDataset.create_df_tensors``
+        origin_indices: np.array
+            dataframe index positions of last observed lag before forecast starts, one per sample.
+        n_forecasts : int
+            Number of steps to forecast into future
+        n_lags : int
+            Number of lagged values of series to include as model inputs (aka AR-order)
+        config_seasonality : configure.ConfigSeasonality
+            Configuration for seasonalities
+        config_lagged_regressors : configure.ConfigLaggedRegressors
+            Configurations for lagged regressors
+        predict_mode : bool
+            Chooses the prediction mode
+            Options
+                * (default) ``False``: Includes target values
+                * ``True``: Does not include targets but includes entire dataset as input
+    Returns
+    -------
+        OrderedDict
+            Model inputs, with an additional first dimension of size batch_size
+        torch.Tensor, float
+            Targets to be predicted, dims: (batch_size, n_forecasts, 1)
+    """
+    origins = torch.as_tensor(origin_indices, dtype=torch.int64).unsqueeze(1)
+    batch_size = origins.shape[0]
+
+    # Window positions of each sample, dims: (batch_size, window_length)
+    if max_lags == 0:
+        window_indices = origins
+    else:
+        window_indices = origins + torch.arange(-n_lags + 1, n_forecasts + 1)
+
+    inputs = OrderedDict({})
+
+    # TARGETS
+    if predict_mode:
+        targets = torch.zeros((batch_size, n_forecasts, 1), dtype=torch.float32)
+    elif max_lags == 0:
+        targets = df_tensors["y_scaled"][origins].unsqueeze(2)
+    else:
+        targets = df_tensors["y_scaled"][origins + torch.arange(1, n_forecasts + 1)].unsqueeze(2)
+
+    # TIME
+    inputs["time"] = df_tensors["t"][window_indices]
+
+    # LAGS
+    if n_lags >= 1 and "y_scaled" in df_tensors:
+        inputs["lags"] = df_tensors["y_scaled"][origins + torch.arange(-n_lags + 1, 1)]
+
+    # COVARIATES / LAGGED REGRESSORS
+    if config_lagged_regressors is not None:
+        inputs["covariates"] = OrderedDict({})
+        for name, values in df_tensors["covariates"].items():
+            covar_lags = config_lagged_regressors[name].n_lags
+            assert covar_lags > 0
+            inputs["covariates"][name] = values[origins + torch.arange(-covar_lags + 1, 1)]
+
+    # SEASONALITIES, FUTURE REGRESSORS and EVENTS, dims: (batch_size, n_lags + n_forecasts, n_features)
+    # sparse events are gathered into sparse COO tensors
+    for key in ("seasonalities", "regressors", "events"):
+        if len(df_tensors.get(key, {})) > 0:
+            inputs[key] = OrderedDict(
+                {
+                    mode: values.gather(window_indices) if isinstance(values, SparseRows) else values[window_indices]
+                    for mode, values in df_tensors[key].items()
+                }
+            )
+
+    return inputs, targets
+
+
 def fourier_series(dates, period, series_order):
     """Provides Fourier series components with the specified frequency and order.
     Note
@@ -637,13 +1286,18 @@ def get_event_offset_features(event, config, feature):
     return events
 
 
-def add_event_features_to_df(
+def create_event_features(
     df,
     config_events: Optional[configure.ConfigEvents] = None,
     config_country_holidays: Optional[configure.ConfigCountryHolidays] = None,
+    id_offsets: Optional[np.ndarray] = None,
 ):
     """
-    Construct columns containing the features of each event, added to df.
+    Construct the features of each event and holiday offset, as one float32 matrix per mode.
+
+    Each offset feature is the event (or holiday) feature shifted by the offset within each series,
+    filled with zeros where the shift reaches beyond the start or end of the series.
+
     Parameters
     ----------
         df : pd.DataFrame
@@ -652,12 +1306,17 @@ def add_event_features_to_df(
             User specified events, each with their upper, lower windows (int), regularization
         config_country_holidays : configure.ConfigCountryHolidays
             Configurations (holiday_names, upper, lower windows, regularization) for country specific holidays
+        id_offsets : np.array
+            row offsets of each series in df, see ``get_id_offsets``. Defaults to a single series.
     Returns
     -------
-        np.array
-            All additive event features (both user specified and country specific)
-        np.array
-            All multiplicative event features (both user specified and country specific)
+        OrderedDict
+            ``additive`` and ``multiplicative`` event features (np.array, float32), each of dims (len(df), n_names),
+            only containing the modes with any features
+        list
+            Names of all additive event and holiday offsets (both user specified and country specific), sorted
+        list
+            Names of all multiplicative event and holiday offsets (both user specified and country specific), sorted
     """
 
     def normalize_holiday_name(name):
@@ -666,49 +1325,65 @@ def add_event_features_to_df(
             return name.replace(" (observed)", "")
         return name
 
-    # create all additional user specified offest events
-    additive_events_names = []
-    multiplicative_events_names = []
+    # features of all user specified events and country specific holidays, before applying offsets
+    base_features = []
+    # (offset name, index of base feature, offset) of each mode
+    offset_features = OrderedDict({"additive": [], "multiplicative": []})
     if config_events is not None:
         for event in sorted(list(config_events.keys())):
-            feature = df[event]
             config = config_events[event]
-            mode = config.mode
+            base_features.append(df[event].to_numpy(dtype=np.float32))
             for offset in range(config.lower_window, config.upper_window + 1):
                 event_offset_name = utils.create_event_names_for_offsets(event, offset)
-                df[event_offset_name] = feature.shift(periods=offset, fill_value=0.0)
-                if mode == "additive":
-                    additive_events_names.append(event_offset_name)
-                else:
-                    multiplicative_events_names.append(event_offset_name)
+                offset_features[config.mode].append((event_offset_name, len(base_features) - 1, offset))
 
-    # create all country specific holidays and their offsets.
-    additive_holiday_names = []
-    multiplicative_holiday_names = []
     if config_country_holidays is not None:
-        year_list = list({x.year for x in df.ds})
-        country_holidays_dict = get_all_holidays(year_list, config_country_holidays.country)
+        ds_years = df["ds"].dt.year
+        calendar = get_holiday_calendar([ds_years.min(), ds_years.max()], config_country_holidays.country)
         config = config_country_holidays
-        mode = config.mode
-        for holiday in config_country_holidays.holiday_names:
-            feature = pd.Series(np.zeros(df.shape[0], dtype=np.float32))
-            holiday = normalize_holiday_name(holiday)
-            if holiday in country_holidays_dict.keys():
-                dates = country_holidays_dict[holiday]
-                feature[df.ds.isin(dates)] = 1.0
-            else:
+        holiday_names = [normalize_holiday_name(holiday) for holiday in config_country_holidays.holiday_names]
+        for holiday in holiday_names:
+            if holiday not in calendar:
                 raise ValueError(f"Holiday {holiday} not found in {config_country_holidays.country} holidays")
+        # flag all holidays with a single search over the calendar
+        features = get_holiday_features(df["ds"], holiday_names, calendar)
+        for i, holiday in enumerate(holiday_names):
+            base_features.append(features[:, i])
             for offset in range(config.lower_window, config.upper_window + 1):
                 holiday_offset_name = utils.create_event_names_for_offsets(holiday, offset)
-                df[holiday_offset_name] = feature.shift(periods=offset, fill_value=0.0)
-                if mode == "additive":
-                    additive_holiday_names.append(holiday_offset_name)
-                else:
-                    multiplicative_holiday_names.append(holiday_offset_name)
-    # Future TODO: possibly undo merge of events and holidays.
-    additive_event_and_holiday_names = sorted(additive_events_names + additive_holiday_names)
-    multiplicative_event_and_holiday_names = sorted(multiplicative_events_names + multiplicative_holiday_names)
-    return df, additive_event_and_holiday_names, multiplicative_event_and_holiday_names
+                offset_features[config.mode].append((holiday_offset_name, len(base_features) - 1, offset))
+
+    event_features = OrderedDict({})
+    if len(base_features) == 0:
+        return event_features, [], []
+    # rows shifted in from another series are zeroed, by the position of each row within its series
+    if id_offsets is None:
+        id_offsets = np.array([0, len(df)])
+    series_lengths = np.diff(id_offsets)
+    position = np.arange(len(df)) - np.repeat(id_offsets[:-1], series_lengths)
+    remaining = np.repeat(series_lengths, series_lengths) - position
+    names = OrderedDict({})
+    for mode, mode_features in offset_features.items():
+        # Future TODO: possibly undo merge of events and holidays.
+        mode_features = sorted(mode_features)
+        names[mode] = [name for name, _, _ in mode_features]
+        if len(mode_features) == 0:
+            continue
+        # filled column by column, each a contiguous copy in column-major order
+        features = np.zeros((len(df), len(mode_features)), dtype=np.float32, order="F")
+        for j, (_, i, offset) in enumerate(mode_features):
+            if offset >= 0:
+                features[offset:, j] = base_features[i][: max(len(df) - offset, 0)]
+            else:
+                features[:offset, j] = base_features[i][-offset:]
+        for offset in {offset for _, _, offset in mode_features}:
+            columns = np.array([j for j, (_, _, column_offset) in enumerate(mode_features) if column_offset == offset])
+            outside = np.flatnonzero(position < offset if offset >= 0 else remaining <= -offset)
+            if len(outside) > 0:
+                features[np.ix_(outside, columns)] = 0.0
+        # samples slice rows, which are contiguous in row-major order
+        event_features[mode] = np.ascontiguousarray(features)
+    return event_features, names["additive"], names["multiplicative"]
 
 
 def create_origin_start_end_mask(df_length, max_lags, n_forecasts):
@@ -727,7 +1402,126 @@ def create_origin_start_end_mask(df_length, max_lags, n_forecasts):
     return target_start_end_mask
 
 
-def create_prediction_frequency_filter_mask(df: pd.DataFrame, prediction_frequency=None):
+def create_sample_mask(
+    df,
+    id_offsets,
+    predict_mode,
+    max_lags,
+    n_lags,
+    n_forecasts,
+    prediction_frequency,
+    config_lagged_regressors,
+    future_regressor_names,
+    event_features,
+    config_missing,
+):
+    """Creates a boolean mask of the valid prediction origins of df, those with all lags and targets available.
+
+    Parameters
+    ----------
+        df : pd.DataFrame
+            Time series data sorted by ``ID`` and ``ds``, with normalized columns ``t`` and ``y_scaled``
+        id_offsets : np.array
+            Row offsets of each series in df, see ``get_id_offsets``
+        future_regressor_names : list
+            Names of the additive and multiplicative future regressors
+        event_features : OrderedDict
+            Features of events and holidays, see ``create_event_features``
+
+    Returns
+    -------
+        np.array
+            boolean mask of len(df), True at valid prediction origins
+    """
+    # Limit target range due to input lags and number of forecasts, within each series
+    origin_start_end_mask = np.concatenate(
+        [
+            create_origin_start_end_mask(df_length=end - start, max_lags=max_lags, n_forecasts=n_forecasts)
+            for start, end in zip(id_offsets[:-1], id_offsets[1:])
+        ]
+    )
+
+    # Prediction Frequency
+    # Filter missing samples and prediction frequency (does not actually drop, but creates indexmapping)
+    prediction_frequency_mask = create_prediction_frequency_filter_mask(df, prediction_frequency)
+
+    # Combine prediction origin masks
+    valid_prediction_mask = np.logical_and(prediction_frequency_mask, origin_start_end_mask)
+
+    # Create NAN-free index mapping of sample index to df index
+    # Note: windows of origins within origin_start_end_mask never cross the boundaries between series,
+    # therefore the NaN mask can be computed across all series at once.
+    nan_mask = create_nan_mask(
+        df=df,
+        predict_mode=predict_mode,
+        max_lags=max_lags,
+        n_lags=n_lags,
+        n_forecasts=n_forecasts,
+        config_lagged_regressors=config_lagged_regressors,
+        future_regressor_names=future_regressor_names,
+        event_features=event_features,
+    )  # boolean array where NAN are False
+
+    # Filter NAN
+    valid_sample_mask = np.logical_and(valid_prediction_mask, nan_mask)
+    n_clean_data_samples = sum(valid_prediction_mask)
+    n_real_data_samples = sum(valid_sample_mask)
+    nan_samples_to_drop = n_clean_data_samples - n_real_data_samples
+    if nan_samples_to_drop > 0 and not config_missing.drop_missing:
+        raise ValueError(
+            f"NANs found. {nan_samples_to_drop} samples affected. Set `drop_missing` to `True` to drop these samples."
+        )
+    return valid_sample_mask
+
+
+def count_samples(
+    df,
+    n_lags,
+    n_forecasts,
+    prediction_frequency,
+    config_events,
+    config_regressors,
+    config_lagged_regressors,
+    config_missing,
+):
+    """Counts the training samples of a dataframe, as in its ``GlobalTimeDataset``, without creating the dataset.
+
+    The valid samples only depend on which values are missing, so that they can be counted before normalizing.
+
+    Parameters
+    ----------
+        df : pd.DataFrame
+            Time series data with missing data handled, containing column ``ds``, ``y``, and ``ID``
+
+    Returns
+    -------
+        int
+            number of samples
+    """
+    # normalized time and targets are missing where dates and values are
+    df = sort_by_id_and_ds(df).assign(t=lambda df: df["ds"], y_scaled=lambda df: df["y"])
+    df.index = pd.RangeIndex(len(df))
+    _, id_offsets = get_id_offsets(df)
+    # the features of holidays are never missing, only those of events are needed
+    event_features, _, _ = create_event_features(df, config_events, None, id_offsets)
+    additive_regressors_names, multiplicative_regressors_names = sort_regressor_names(config_regressors)
+    valid_sample_mask = create_sample_mask(
+        df,
+        id_offsets=id_offsets,
+        predict_mode=False,
+        max_lags=get_max_num_lags(n_lags=n_lags, config_lagged_regressors=config_lagged_regressors),
+        n_lags=n_lags,
+        n_forecasts=n_forecasts,
+        prediction_frequency=prediction_frequency,
+        config_lagged_regressors=config_lagged_regressors,
+        future_regressor_names=additive_regressors_names + multiplicative_regressors_names,
+        event_features=event_features,
+        config_missing=config_missing,
+    )
+    return int(np.sum(valid_sample_mask))
+
+
+def create_prediction_frequency_filter_mask(df: pd.DataFrame, prediction_frequency=None, calendar=None):
     """Filters prediction origin index from df based on the forecast frequency setting.
 
     Filter based on timestamp last lag before targets start
@@ -740,36 +1534,20 @@ def create_prediction_frequency_filter_mask(df: pd.DataFrame, prediction_frequen
         ----
         E.g. if prediction_frequency=7, forecasts are only made on every 7th step (once in a week in case of daily
         resolution).
+        calendar : df_utils.CalendarIndex
+            precomputed calendar features of ``df["ds"]``, computed if not provided
 
     Returns boolean mask where prediction origin indexes to be included are True, and the rest False.
     """
-    mask = np.ones((len(df),), dtype=bool)
-
     # Basic case: no filter
     if prediction_frequency is None:
-        return mask
+        return np.ones((len(df),), dtype=bool)
     else:
         assert isinstance(prediction_frequency, dict)
 
-    timestamps = pd.to_datetime(df.loc[:, "ds"])
-    filter_masks = []
-    for key, value in prediction_frequency.items():
-        if key == "hourly-minute":
-            mask = timestamps.dt.minute == value
-        elif key == "daily-hour":
-            mask = timestamps.dt.hour == value
-        elif key == "weekly-day":
-            mask = timestamps.dt.dayofweek == value
-        elif key == "monthly-day":
-            mask = timestamps.dt.day == value
-        elif key == "yearly-month":
-            mask = timestamps.dt.month == value
-        else:
-            raise ValueError(f"Invalid prediction frequency: {key}")
-        filter_masks.append(mask)
-    for m in filter_masks:
-        mask = np.logical_and(mask, m)
-    return mask
+    if calendar is None:
+        calendar = df_utils.CalendarIndex.from_ds(df.loc[:, "ds"])
+    return df_utils.create_prediction_frequency_mask(calendar, prediction_frequency)
 
 
 def create_nan_mask(
@@ -780,7 +1558,7 @@ def create_nan_mask(
     n_forecasts,
     config_lagged_regressors,
     future_regressor_names,
-    event_names,
+    event_features=None,
 ):
     """Creates mask for each prediction origin,
     accounting for corresponding input lags / forecast targets containing any NaN values.
@@ -841,19 +1619,27 @@ def create_nan_mask(
     # TIME: TREND & SEASONALITY: the time at each sample's lags and forecasts
     # FUTURE REGRESSORS
     # # EVENTS
-    names = ["t"] + future_regressor_names + event_names
-    valid_columns = mask_origin_without_nan_for_columns(df_isna, names, max_lags, n_lags, n_forecasts)
+    names = ["t"] + future_regressor_names
+    features_isna = None
+    if event_features is not None and len(event_features) > 0:
+        features_isna = np.any([np.isnan(features).any(axis=1) for features in event_features.values()], axis=0)
+    valid_columns = mask_origin_without_nan_for_columns(
+        df_isna, names, max_lags, n_lags, n_forecasts, features_isna=features_isna
+    )
     valid_origins = np.logical_and(valid_origins, valid_columns)
 
     return valid_origins
 
 
-def mask_origin_without_nan_for_columns(df_isna, names, max_lags, n_lags, n_forecasts):
+def mask_origin_without_nan_for_columns(df_isna, names, max_lags, n_lags, n_forecasts, features_isna=None):
     # assert len(names) > 0
     contains_nan = df_isna.loc[:, names]
     # if len(contains_nan.shape) > 1:
     #     assert len(contains_nan.shape) == 2
     contains_nan = contains_nan.any(axis=1)
+    if features_isna is not None:
+        # rows with NaN in features which are not columns of df
+        contains_nan = contains_nan.values | features_isna
     if max_lags > 0:
         if n_lags == 0 and n_forecasts == 1:
             contains_nan = contains_nan[1:]
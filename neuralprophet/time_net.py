@@ -2,7 +2,7 @@ import logging
 import math
 from collections import OrderedDict
 from functools import reduce
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
 import numpy as np
 import pytorch_lightning as pl
@@ -455,6 +455,8 @@ class TimeNet(pl.LightningModule):
             torch.Tensor
                 Forecast component of dims (batch, n_forecasts, n_quantiles)
         """
+        if features.is_sparse:
+            return self.sparse_scalar_features_effects(features, params, indices)
         if indices is not None:
             features = features[:, :, indices]
             params = params[:, indices]
@@ -463,6 +465,37 @@ class TimeNet(pl.LightningModule):
         out = torch.sum(features.unsqueeze(dim=2) * params.unsqueeze(dim=0).unsqueeze(dim=0), dim=-1)
         return out  # dims (batch, n_forecasts, n_quantiles)
 
+    def sparse_scalar_features_effects(
+        self, features: torch.Tensor, params: nn.Parameter, indices=None
+    ) -> torch.Tensor:
+        """
+        Computes events component of the model from sparse features, by gathering the params of the nonzero entries
+        Parameters
+        ----------
+            features : torch.Tensor, float
+                Sparse COO features (either additive or multiplicative) related to event component
+                dims (batch, n_forecasts, n_features)
+            params : nn.Parameter
+                Params (either additive or multiplicative) related to events dims (n_quantiles, n_features)
+            indices : list of int
+                Indices in the feature tensors related to a particular event
+        Returns
+        -------
+            torch.Tensor
+                Forecast component of dims (batch, n_forecasts, n_quantiles), identical to the dense features
+        """
+        batch_size, n_steps, _ = features.shape
+        # entries dims: (3, nnz) of (sample, step, feature), values dims: (nnz)
+        entries, values = features._indices(), features._values()
+        if indices is not None:
+            selected = torch.isin(entries[2], torch.as_tensor(indices, device=entries.device))
+            entries, values = entries[:, selected], values[selected]
+        # effects of the entries dims: (nnz, n_quantiles), summed per sample and step
+        effects = values.unsqueeze(dim=1) * params[:, entries[2]].t()
+        out = torch.zeros(batch_size * n_steps, params.shape[0], dtype=effects.dtype, device=effects.device)
+        out = out.index_add(0, entries[0] * n_steps + entries[1], effects)
+        return out.reshape(batch_size, n_steps, params.shape[0])
+
     def auto_regression(self, lags: Union[torch.Tensor, float]) -> torch.Tensor:
         """Computes auto-regessive model component AR-Net.
         Parameters
@@ -526,17 +559,15 @@ class TimeNet(pl.LightningModule):
                     * ``time`` (torch.Tensor , loat), normalized time, dims: (batch, n_forecasts)
                     * ``lags`` (torch.Tensor, float), dims: (batch, n_lags)
                     * ``seasonalities`` (torch.Tensor, float), dict of named seasonalities (keys) with their features
-                    (values), dims of each dict value (batch, n_forecasts, n_features)
+                    (values), dims of each dict value (batch, n_forecasts, n_features), or the time and conditions
+                    to compute them from with ``fourier_fused`` computation (see ``FourierSeasonality``)
                     * ``covariates`` (torch.Tensor, float), dict of named covariates (keys) with their features
                     (values), dims of each dict value: (batch, n_lags)
                     * ``events`` (torch.Tensor, float), all event features, dims (batch, n_forecasts, n_features)
                     * ``regressors``(torch.Tensor, float), all regressor features, dims (batch, n_forecasts, n_features)
                     * ``predict_mode`` (bool), optional and only passed during prediction
-            meta : dict, default=None
-                Metadata about the all the samples of the model input batch.
-                Contains the following:
-                Model Meta:
-                    * ``df_name`` (list, str), time series ID corresponding to each sample of the input batch.
+            meta : torch.Tensor, default=None
+                Integer code (see ``id_dict``) of the time series ID corresponding to each sample of the input batch.
                 Note
                 ----
                 The meta is sorted in the same way the inputs are sorted.
@@ -559,9 +590,7 @@ class TimeNet(pl.LightningModule):
         # Turnaround to avoid issues when the meta argument is None and meta_used_in_model
         if meta is None and self.meta_used_in_model:
             name_id_dummy = self.id_list[0]
-            meta = OrderedDict()
-            meta["df_name"] = [name_id_dummy for _ in range(inputs["time"].shape[0])]
-            meta = torch.tensor([self.id_dict[i] for i in meta["df_name"]], device=self.device)
+            meta = torch.full((inputs["time"].shape[0],), self.id_dict[name_id_dummy], device=self.device)
 
         components = {}
         additive_components = torch.zeros(
@@ -581,9 +610,9 @@ class TimeNet(pl.LightningModule):
         if "seasonalities" in inputs:
             s = self.seasonality(s=inputs["seasonalities"], meta=meta)
             if self.config_seasonality.mode == "additive":
-                additive_components_nonstationary += s
+                additive_components_nonstationary = additive_components_nonstationary + s
             elif self.config_seasonality.mode == "multiplicative":
-                multiplicative_components_nonstationary += s
+                multiplicative_components_nonstationary = multiplicative_components_nonstationary + s
             components["seasonalities"] = s
 
         if "events" in inputs:
@@ -591,25 +620,29 @@ class TimeNet(pl.LightningModule):
                 additive_events = self.scalar_features_effects(
                     inputs["events"]["additive"], self.event_params["additive"]
                 )
-                additive_components_nonstationary += additive_events
+                additive_components_nonstationary = additive_components_nonstationary + additive_events
                 components["additive_events"] = additive_events
             if "multiplicative" in inputs["events"].keys():
                 multiplicative_events = self.scalar_features_effects(
                     inputs["events"]["multiplicative"], self.event_params["multiplicative"]
                 )
-                multiplicative_components_nonstationary += multiplicative_events
+                multiplicative_components_nonstationary = (
+                    multiplicative_components_nonstationary + multiplicative_events
+                )
                 components["multiplicative_events"] = multiplicative_events
 
         if "regressors" in inputs:
             if "additive" in inputs["regressors"].keys():
                 additive_regressors = self.future_regressors(inputs["regressors"]["additive"], "additive")
-                additive_components_nonstationary += additive_regressors
+                additive_components_nonstationary = additive_components_nonstationary + additive_regressors
                 components["additive_regressors"] = additive_regressors
             if "multiplicative" in inputs["regressors"].keys():
                 multiplicative_regressors = self.future_regressors(
                     inputs["regressors"]["multiplicative"], "multiplicative"
                 )
-                multiplicative_components_nonstationary += multiplicative_regressors
+                multiplicative_components_nonstationary = (
+                    multiplicative_components_nonstationary + multiplicative_regressors
+                )
                 components["multiplicative_regressors"] = multiplicative_regressors
 
         # stationarized input
@@ -622,12 +655,12 @@ class TimeNet(pl.LightningModule):
             )
             stationarized_lags = inputs["lags"] - nonstationary_components
             lags = self.auto_regression(lags=stationarized_lags)
-            additive_components += lags
+            additive_components = additive_components + lags
             components["lags"] = lags
 
         if "covariates" in inputs:
             covariates = self.forward_covar_net(covariates=inputs["covariates"])
-            additive_components += covariates
+            additive_components = additive_components + covariates
             components["covariates"] = covariates
 
         # combine all non-stationary components over forecast range
@@ -685,7 +718,7 @@ class TimeNet(pl.LightningModule):
 
         components["trend"] = components_raw["trend"][:, self.n_lags : inputs["time"].shape[1], :]
         if self.config_trend is not None and "seasonalities" in inputs:
-            for name, features in inputs["seasonalities"].items():
+            for name, features in self.seasonality.compute_features(inputs["seasonalities"]).items():
                 components[f"season_{name}"] = self.seasonality.compute_fourier(
                     features=features[:, self.n_lags : inputs["time"].shape[1], :], name=name, meta=meta
                 )
@@ -724,14 +757,15 @@ class TimeNet(pl.LightningModule):
                 mode = configs["mode"]
                 indices = configs["event_indices"]
                 if mode == "additive":
-                    features = inputs["events"]["additive"][:, self.n_lags : inputs["time"].shape[1], :]
+                    features = inputs["events"]["additive"]
                     params = self.event_params["additive"]
                 else:
-                    features = inputs["events"]["multiplicative"][:, self.n_lags : inputs["time"].shape[1], :]
+                    features = inputs["events"]["multiplicative"]
                     params = self.event_params["multiplicative"]
+                # sparse features can not be sliced, the effects are sliced to the forecast range instead
                 components[f"event_{event}"] = self.scalar_features_effects(
                     features=features, params=params, indices=indices
-                )
+                )[:, self.n_lags : inputs["time"].shape[1], :]
         if self.config_regressors.regressors is not None and "regressors" in inputs:
             if "additive" in inputs["regressors"].keys():
                 components["future_regressors_additive"] = components_raw["additive_regressors"][
@@ -757,7 +791,12 @@ class TimeNet(pl.LightningModule):
     def set_compute_components(self, compute_components_flag):
         self.compute_components_flag = compute_components_flag
 
-    def loss_func(self, inputs, predicted, targets):
+    def loss_func(self, inputs, predicted, targets, epoch=None, progress_in_epoch=None):
+        """Computes the loss of a batch, including the regularization.
+
+        The training progress for the delayed regularization is taken from the Trainer, unless ``epoch`` and
+        ``progress_in_epoch`` are given, e.g. when training without a Trainer.
+        """
         loss = None
         # Compute loss. no reduction.
         loss = self.config_train.loss_func(predicted, targets)
@@ -766,20 +805,45 @@ class TimeNet(pl.LightningModule):
         loss = loss.sum(dim=2).mean()
         # Regularize.
         if self.reg_enabled:
-            steps_per_epoch = math.ceil(self.trainer.estimated_stepping_batches / self.trainer.max_epochs)
-            progress_in_epoch = 1 - ((steps_per_epoch * (self.current_epoch + 1) - self.global_step) / steps_per_epoch)
-            loss, reg_loss = self._add_batch_regularizations(loss, self.current_epoch, progress_in_epoch)
+            if epoch is None:
+                epoch = self.current_epoch
+                steps_per_epoch = math.ceil(self.trainer.estimated_stepping_batches / self.trainer.max_epochs)
+                progress_in_epoch = 1 - ((steps_per_epoch * (epoch + 1) - self.global_step) / steps_per_epoch)
+            loss, reg_loss = self._add_batch_regularizations(loss, epoch, progress_in_epoch)
         else:
             reg_loss = torch.tensor(0.0, device=self.device)
         return loss, reg_loss
 
+    def get_meta_name_tensor(self, meta: Dict) -> Optional[torch.Tensor]:
+        """Gets the integer codes of the time series IDs of a batch, as used by the global-local components.
+
+        Parameters
+        ----------
+            meta : dict
+                Meta information of a batch, with the int64 code ``df_id`` (see ``id_dict``) of each sample
+
+        Returns
+        -------
+            torch.Tensor
+                ID codes of dims (batch), None if the model uses no global-local components
+        """
+        if not self.meta_used_in_model:
+            return None
+        meta_name_tensor = meta["df_id"]
+        if (meta_name_tensor < 0).any():
+            raise ValueError("Batch contains a time series ID which was not present during fitting.")
+        return meta_name_tensor.to(self.device)
+
+    def setup(self, stage: str):
+        # Average the logged losses and metrics over the processes of data-parallel training
+        self.sync_dist = self.trainer.world_size > 1
+        if self.metrics_enabled:
+            self.log_args["sync_dist"] = self.sync_dist
+
     def training_step(self, batch, batch_idx):
         inputs, targets, meta = batch
         # Global-local
-        if self.meta_used_in_model:
-            meta_name_tensor = torch.tensor([self.id_dict[i] for i in meta["df_name"]], device=self.device)
-        else:
-            meta_name_tensor = None
+        meta_name_tensor = self.get_meta_name_tensor(meta)
         # Run forward calculation
         predicted, _ = self.forward(inputs, meta_name_tensor)
         # Store predictions in self for later network visualization
@@ -797,8 +861,15 @@ class TimeNet(pl.LightningModule):
         scheduler.step()
 
         # Manually track the loss for the lr finder
-        self.log("train_loss", loss, on_step=False, on_epoch=True, prog_bar=True, logger=True)
-        self.log("reg_loss", reg_loss, on_step=False, on_epoch=True, prog_bar=True, logger=True)
+        log_args: Dict[str, Any] = {
+            "on_step": False,
+            "on_epoch": True,
+            "prog_bar": True,
+            "logger": True,
+            "sync_dist": self.sync_dist,
+        }
+        self.log("train_loss", loss, **log_args)
+        self.log("reg_loss", reg_loss, **log_args)
 
         # Metrics
         if self.metrics_enabled:
@@ -812,10 +883,7 @@ class TimeNet(pl.LightningModule):
     def validation_step(self, batch, batch_idx):
         inputs, targets, meta = batch
         # Global-local
-        if self.meta_used_in_model:
-            meta_name_tensor = torch.tensor([self.id_dict[i] for i in meta["df_name"]], device=self.device)
-        else:
-            meta_name_tensor = None
+        meta_name_tensor = self.get_meta_name_tensor(meta)
         # Run forward calculation
         predicted, _ = self.forward(inputs, meta_name_tensor)
         # Calculate loss
@@ -831,10 +899,7 @@ class TimeNet(pl.LightningModule):
     def test_step(self, batch, batch_idx):
         inputs, targets, meta = batch
         # Global-local
-        if self.meta_used_in_model:
-            meta_name_tensor = torch.tensor([self.id_dict[i] for i in meta["df_name"]], device=self.device)
-        else:
-            meta_name_tensor = None
+        meta_name_tensor = self.get_meta_name_tensor(meta)
         # Run forward calculation
         predicted, _ = self.forward(inputs, meta_name_tensor)
         # Calculate loss
@@ -850,10 +915,7 @@ class TimeNet(pl.LightningModule):
     def predict_step(self, batch, batch_idx, dataloader_idx=0):
         inputs, _, meta = batch
         # Global-local
-        if self.meta_used_in_model:
-            meta_name_tensor = torch.tensor([self.id_dict[i] for i in meta["df_name"]], device=self.device)
-        else:
-            meta_name_tensor = None
+        meta_name_tensor = self.get_meta_name_tensor(meta)
         # Add predict_mode flag to dataset
         inputs["predict_mode"] = True
         # Run forward calculation
@@ -891,6 +953,10 @@ class TimeNet(pl.LightningModule):
 
     def _add_batch_regularizations(self, loss, epoch, progress):
         """Add regularization terms to loss, if applicable
+
+        In data-parallel training, every process adds the same terms, computed from the weights synchronized by DDP
+        and the training progress shared by the processes, so that DDP averages identical gradients of the terms.
+
         Parameters
         ----------
             loss : torch.Tensor, scalar
@@ -911,7 +977,7 @@ class TimeNet(pl.LightningModule):
             if self.max_lags > 0 and self.config_ar.reg_lambda is not None:
                 reg_ar = self.config_ar.regularize(self.ar_weights)
                 reg_ar = torch.sum(reg_ar).squeeze() / self.n_forecasts
-                reg_loss += self.config_ar.reg_lambda * reg_ar
+                reg_loss = reg_loss + self.config_ar.reg_lambda * reg_ar
 
             # Regularize trend to be smoother/sparse
             l_trend = self.config_trend.trend_reg
@@ -920,7 +986,7 @@ class TimeNet(pl.LightningModule):
                     weights=self.trend.get_trend_deltas,
                     threshold=self.config_train.trend_reg_threshold,
                 )
-                reg_loss += l_trend * reg_trend
+                reg_loss = reg_loss + l_trend * reg_trend
 
             # Regularize seasonality: sparsify fourier term coefficients
             if self.config_seasonality:
@@ -928,17 +994,17 @@ class TimeNet(pl.LightningModule):
                 if self.seasonality.season_dims is not None and l_season is not None and l_season > 0:
                     for name in self.seasonality.season_params.keys():
                         reg_season = reg_func_season(self.seasonality.season_params[name])
-                        reg_loss += l_season * reg_season
+                        reg_loss = reg_loss + l_season * reg_season
 
             # Regularize events: sparsify events features coefficients
             if self.config_events is not None or self.config_holidays is not None:
                 reg_events_loss = reg_func_events(self.config_events, self.config_holidays, self)
-                reg_loss += reg_events_loss
+                reg_loss = reg_loss + reg_events_loss
 
             # Regularize regressors: sparsify regressor features coefficients
             if self.config_regressors.regressors is not None:
                 reg_regressor_loss = reg_func_regressors(self.config_regressors.regressors, self)
-                reg_loss += reg_regressor_loss
+                reg_loss = reg_loss + reg_regressor_loss
 
         trend_glocal_loss = torch.zeros(1, dtype=torch.float, requires_grad=False)
         # Glocal Trend
@@ -947,7 +1013,7 @@ class TimeNet(pl.LightningModule):
                 trend_glocal_loss = reg_func_trend_glocal(
                     self.trend.trend_k0, self.trend.trend_deltas, self.config_trend.trend_local_reg
                 )
-                reg_loss += trend_glocal_loss
+                reg_loss = reg_loss + trend_glocal_loss
         # Glocal Seasonality
         if self.config_seasonality is not None:
             if (
@@ -957,7 +1023,7 @@ class TimeNet(pl.LightningModule):
                 seasonality_glocal_loss = reg_func_seasonality_glocal(
                     self.seasonality.season_params, self.config_seasonality.seasonality_local_reg
                 )
-                reg_loss += seasonality_glocal_loss
+                reg_loss = reg_loss + seasonality_glocal_loss
         loss = loss + reg_loss
         return loss, reg_loss
 
@@ -1,20 +1,25 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
 import math
 import os
 import sys
 from collections import OrderedDict
-from typing import IO, TYPE_CHECKING, BinaryIO, Optional, Union
+from typing import IO, TYPE_CHECKING, BinaryIO, Dict, Literal, Optional, Union, cast
 
 import numpy as np
 import pandas as pd
 import pytorch_lightning as pl
 import torch
 from lightning_fabric.utilities.seed import seed_everything
+from pytorch_lightning.strategies import DDPStrategy
+from pytorch_lightning.strategies.launchers.multiprocessing import _MultiProcessingLauncher
 
 from neuralprophet import utils_torch
-from neuralprophet.logger import ProgressBar
+from neuralprophet._version import __version__
+from neuralprophet.logger import MetricsLogger, ProgressBar
 
 if TYPE_CHECKING:
     from neuralprophet.configure import ConfigEvents, ConfigLaggedRegressors, ConfigSeasonality, Train
@@ -23,6 +28,12 @@ log = logging.getLogger("NP.utils")
 
 FILE_LIKE = Union[str, os.PathLike, BinaryIO, IO[bytes]]
 
+# Directory to persist the learning rates suggested by the "fast" learning rate finder in, if any
+LR_CACHE_DIR: Optional[str] = os.environ.get("NEURALPROPHET_LR_CACHE_DIR")
+
+# Learning rates suggested by the "fast" learning rate finder in this process, by fingerprint
+_learning_rates: dict = {}
+
 
 def save(forecaster, path: FILE_LIKE):
     """Save a fitted Neural Prophet model to disk.
@@ -74,7 +85,7 @@ def save(forecaster, path: FILE_LIKE):
                 setattr(forecaster.model, attr, value)
 
 
-def load(path: FILE_LIKE, map_location=None):
+def load(path: FILE_LIKE, map_location=None, restore_trainer: bool = True):
     """retrieve a fitted model from a .np file or buffer that was saved by save.
 
     Parameters
@@ -86,6 +97,9 @@ def load(path: FILE_LIKE, map_location=None):
             If you are running on a CPU-only machine, set map_location='cpu' to map your storages to the CPU.
             If you are running on CUDA, set map_location='cuda:device_id' (e.g. 'cuda:2').
             Default is None, which means the model is loaded to the same device as it was saved on.
+        restore_trainer : bool
+            whether to restore the Lightning Trainer. Not needed to predict with ``use_trainer=False``,
+            or with a ``Predictor``.
     Returns
     -------
         np.forecaster.NeuralProphet
@@ -102,7 +116,8 @@ def load(path: FILE_LIKE, map_location=None):
         torch_map_location = torch.device(map_location)
 
     m = torch.load(path, map_location=torch_map_location)
-    m.restore_trainer(accelerator=map_location)
+    if restore_trainer:
+        m.restore_trainer(accelerator=map_location)
     return m
 
 
@@ -370,7 +385,7 @@ def config_seasonality_to_model_dims(config_seasonality: ConfigSeasonality):
     seasonal_dims = OrderedDict({})
     for name, period in config_seasonality.periods.items():
         resolution = period.resolution
-        if config_seasonality.computation == "fourier":
+        if config_seasonality.computation in ["fourier", "fourier_fused"]:
             resolution = 2 * resolution
         seasonal_dims[name] = resolution
     return seasonal_dims
@@ -809,6 +824,212 @@ def _smooth_loss(loss, beta=0.9):
     return smoothed_loss
 
 
+def lr_finder_fingerprint(model, config_train: Train, dataset_size: int, num_batches: int) -> str:
+    """
+    Fingerprint of the model architecture and config, training config and data shape, which determine the learning
+    rate test.
+
+    Parameters
+    ----------
+        model : TimeNet
+            initialized model
+        config_train : configure.Train
+            training config, with ``lr_finder_args`` set
+        dataset_size : int
+            number of rows of the training data
+        num_batches : int
+            number of batches per epoch
+
+    Returns
+    -------
+        str
+            hex digest identifying the learning rate test
+    """
+    fingerprint = [
+        __version__,
+        type(model).__name__,
+        [(name, tuple(param.shape)) for name, param in model.named_parameters()],
+        config_train.loss_func_name,
+        str(config_train.optimizer),
+        sorted(config_train.optimizer_args.items()),
+        config_train.batch_size,
+        config_train.quantiles,
+        config_train.newer_samples_weight,
+        config_train.newer_samples_start,
+        sorted(config_train.lr_finder_args.items()),
+        config_train.reg_lambda_trend,
+        config_train.trend_reg_threshold,
+        config_train.reg_delay_pct,
+        dataset_size,
+        num_batches,
+        *_model_config_fingerprint(model),
+    ]
+    return hashlib.sha1(repr(fingerprint).encode()).hexdigest()
+
+
+def _model_config_fingerprint(model) -> list:
+    # the model config changing the loss, not the parameter shapes, e.g. modes and regularization strengths
+    config_trend = model.config_trend
+    config_seasonality = model.config_seasonality
+    config_holidays = model.config_holidays
+    config_regressors = model.config_regressors.regressors or {}
+    return [
+        model.n_forecasts,
+        model.max_lags,
+        model.config_normalization.normalize,
+        model.config_normalization.global_normalization,
+        model.config_normalization.global_time_normalization,
+        config_trend
+        and (
+            config_trend.growth,
+            config_trend.changepoints,
+            config_trend.n_changepoints,
+            config_trend.changepoints_range,
+            config_trend.trend_reg,
+            config_trend.trend_reg_threshold,
+            config_trend.trend_global_local,
+            config_trend.trend_local_reg,
+        ),
+        config_seasonality
+        and (
+            config_seasonality.mode,
+            config_seasonality.computation,
+            config_seasonality.reg_lambda,
+            config_seasonality.global_local,
+            config_seasonality.seasonality_local_reg,
+            [(name, season.period, season.global_local) for name, season in config_seasonality.periods.items()],
+        ),
+        model.config_ar and model.config_ar.ar_reg,
+        [
+            (name, event.mode, event.reg_lambda, event.lower_window, event.upper_window)
+            for name, event in (model.config_events or {}).items()
+        ],
+        config_holidays
+        and (
+            config_holidays.mode,
+            config_holidays.reg_lambda,
+            config_holidays.lower_window,
+            config_holidays.upper_window,
+        ),
+        [(name, reg.mode, reg.reg_lambda, reg.normalize) for name, reg in config_regressors.items()],
+        [
+            (name, reg.reg_lambda, reg.normalize, reg.as_scalar)
+            for name, reg in (model.config_lagged_regressors or {}).items()
+        ],
+    ]
+
+
+def _learning_rate_path(cache_dir, fingerprint):
+    return os.path.join(cache_dir, f"learning_rate_{fingerprint}.json")
+
+
+def get_cached_learning_rate(fingerprint: str, cache_dir: Optional[str] = None) -> Optional[float]:
+    """
+    Get the learning rate suggested before for a fingerprint, see ``lr_finder_fingerprint``.
+
+    Parameters
+    ----------
+        fingerprint : str
+            fingerprint of the learning rate test
+        cache_dir : str
+            directory the learning rates are persisted in, defaults to ``LR_CACHE_DIR``
+
+    Returns
+    -------
+        float
+            suggested learning rate, ``None`` if not found
+    """
+    if fingerprint in _learning_rates:
+        return _learning_rates[fingerprint]
+    if cache_dir is None:
+        cache_dir = LR_CACHE_DIR
+    if cache_dir is None:
+        return None
+    path = _learning_rate_path(cache_dir, fingerprint)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path) as f:
+            learning_rate = float(json.load(f)["learning_rate"])
+    except (OSError, KeyError, TypeError, ValueError) as e:
+        log.warning(f"Could not read the learning rate {path}, finding it again: {e}")
+        return None
+    _learning_rates[fingerprint] = learning_rate
+    return learning_rate
+
+
+def cache_learning_rate(fingerprint: str, learning_rate: float, cache_dir: Optional[str] = None):
+    """
+    Keep a suggested learning rate for later fits with the same fingerprint, see ``lr_finder_fingerprint``.
+
+    Parameters
+    ----------
+        fingerprint : str
+            fingerprint of the learning rate test
+        learning_rate : float
+            suggested learning rate
+        cache_dir : str
+            directory to persist the learning rate in, defaults to ``LR_CACHE_DIR``
+    """
+    _learning_rates[fingerprint] = float(learning_rate)
+    if cache_dir is None:
+        cache_dir = LR_CACHE_DIR
+    if cache_dir is None:
+        return
+    path = _learning_rate_path(cache_dir, fingerprint)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # write to a temporary file first, so that concurrent processes never read a partial file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"learning_rate": float(learning_rate)}, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        log.warning(f"Could not persist the learning rate to {path}: {e}")
+
+
+# start methods of the processes of data-parallel training on CPU, by the name of the Lightning strategy
+DDP_START_METHODS: Dict[str, Literal["fork", "spawn"]] = {
+    "ddp": "fork",
+    "ddp_fork": "fork",
+    "ddp_notebook": "fork",
+    "ddp_spawn": "spawn",
+}
+
+
+class _MetricsHistoryLauncher(_MultiProcessingLauncher):
+    """Launches the processes of ``DDPMetricsStrategy``, returning the metrics history of rank 0 with its results."""
+
+    def get_extra_results(self, trainer: pl.Trainer) -> dict:
+        extra = super().get_extra_results(trainer)
+        if isinstance(trainer.logger, MetricsLogger):
+            extra["metrics_history"] = dict(trainer.logger.history)
+        return extra
+
+    def update_main_process_results(self, trainer: pl.Trainer, extra: dict) -> None:
+        super().update_main_process_results(trainer, extra)
+        if "metrics_history" in extra and isinstance(trainer.logger, MetricsLogger):
+            # the launched processes started from a copy of the history, continuing it
+            trainer.logger.history.clear()
+            trainer.logger.history.update(extra["metrics_history"])
+
+
+class DDPMetricsStrategy(DDPStrategy):
+    """Data-parallel training (DDP) in processes launched from this one, on CPU with the gloo backend.
+
+    The metrics are logged by rank 0 only (see ``MetricsLogger.log_metrics``), its history being returned to the
+    ``MetricsLogger`` of this process, as are the fitted weights to the model.
+    """
+
+    def __init__(self, start_method: Literal["spawn", "fork", "forkserver"] = "fork", **kwargs):
+        super().__init__(start_method=start_method, process_group_backend="gloo", **kwargs)
+
+    def _configure_launcher(self) -> None:
+        # the start method is one of those of ``__init__``, stored by ``DDPStrategy`` as str
+        start_method = cast(Literal["spawn", "fork", "forkserver"], self._start_method)
+        self._launcher = _MetricsHistoryLauncher(self, start_method=start_method)
+
+
 def configure_trainer(
     config_train: Train,
     config: dict,
@@ -830,7 +1051,8 @@ def configure_trainer(
         config_train : Dict
             dictionary containing the overall training configuration.
         config : dict
-            dictionary containing the custom PyTorch Lightning trainer configuration.
+            dictionary containing the custom PyTorch Lightning trainer configuration. On CPU, a ``ddp`` strategy
+            trains with a ``DDPMetricsStrategy``.
         metrics_logger : MetricsLogger
             MetricsLogger object to log metrics to.
         early_stopping: bool
@@ -878,13 +1100,17 @@ def configure_trainer(
                 config["devices"] = 1
         elif accelerator != "auto":
             config["accelerator"] = accelerator
-            config["devices"] = 1
+            config.setdefault("devices", 1)
 
         if "accelerator" in config:
             log.info(f"Using accelerator {config['accelerator']} with {config['devices']} device(s).")
         else:
             log.info("No accelerator available. Using CPU for training.")
 
+    # Data-parallel training on CPU, in processes forked (or spawned) from this one instead of reruns of the script
+    if config.get("accelerator") == "cpu" and config.get("strategy") in DDP_START_METHODS:
+        config["strategy"] = DDPMetricsStrategy(start_method=DDP_START_METHODS[config["strategy"]])
+
     # Configure metrics
     if metrics_enabled:
         config["logger"] = metrics_logger
@@ -970,8 +1196,7 @@ def configure_trainer(
         config["callbacks"] = callbacks
     config["num_sanity_val_steps"] = 0
     config["enable_model_summary"] = False
-    # TODO: Disabling sampler_ddp brings a good speedup in performance, however, check whether this is a good idea
-    # https://pytorch-lightning.readthedocs.io/en/stable/common/trainer.html#replace-sampler-ddp
-    # config["replace_sampler_ddp"] = False
+    # The batch sampler of the loaders splits the batches between the processes already, see create_batched_loader
+    config["use_distributed_sampler"] = False
 
     return pl.Trainer(**config), checkpoint_callback
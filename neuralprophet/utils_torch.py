@@ -1,12 +1,19 @@
+import collections
+import copy
 import inspect
 import logging
-from typing import Any
+from typing import TYPE_CHECKING, Any, Callable, Optional, cast
 
 import numpy as np
 import pytorch_lightning as pl
 import torch
 import torch.nn as nn
+import torchmetrics
 from captum.attr import Saliency
+from tqdm import tqdm
+
+if TYPE_CHECKING:
+    from neuralprophet.time_net import TimeNet
 
 log = logging.getLogger("NP.utils_torch")
 
@@ -36,6 +43,28 @@ def penalize_nonzero(weights, eagerness=1.0, acceptance=1.0):
     return torch.log(cliff + acceptance * torch.abs(weights)) - np.log(cliff)
 
 
+def select_by_id(params, meta):
+    """
+    Select the parameters of the time series of each sample of a batch.
+
+    Gathers along the time series dimension, which gives the same values and gradients as summing the product of
+    the one-hot encoded ``meta`` and ``params``, without materializing (batch, num_time_series) intermediates.
+
+    Parameters
+    ----------
+        params : torch.Tensor, float
+            Local parameters, dims: (quantiles, num_time_series, ...)
+        meta : torch.Tensor, int
+            Time series ID of each sample of the batch, dims: (batch)
+
+    Returns
+    -------
+        torch.Tensor
+            Parameters of each sample, dims: (quantiles, batch, ...)
+    """
+    return params.index_select(1, meta)
+
+
 def create_optimizer_from_config(optimizer_name, optimizer_args):
     """
     Translate the optimizer name and arguments into a torch optimizer.
@@ -75,6 +104,442 @@ def create_optimizer_from_config(optimizer_name, optimizer_args):
     return optimizer, optimizer_args
 
 
+def move_to_device(data, device):
+    """Move all tensors of a (nested) batch to a device.
+
+    Parameters
+    ----------
+        data : torch.Tensor, dict, list or tuple
+            batch, e.g. the model inputs, targets and meta of a ``TimeDataset``
+        device : torch.device
+            target device
+
+    Returns
+    -------
+        batch on the device, with the same structure
+    """
+    if isinstance(data, torch.Tensor):
+        return data.to(device)
+    if isinstance(data, dict):
+        # keeps the type, e.g. OrderedDict
+        return type(data)((key, move_to_device(value, device)) for key, value in data.items())
+    if isinstance(data, (list, tuple)):
+        return type(data)(move_to_device(value, device) for value in data)
+    return data
+
+
+def predict_batches(model: pl.LightningModule, batches) -> list:
+    """Run the prediction step of a model on batches in a plain ``torch.inference_mode`` loop.
+
+    Equivalent to ``pl.Trainer.predict``, without the setup of a Trainer, its hooks, callbacks and progress bar.
+
+    Parameters
+    ----------
+        model : pl.LightningModule
+            model with a ``predict_step``, e.g. ``TimeNet``
+        batches : iterable
+            batches as passed to ``predict_step``, e.g. a ``DataLoader``
+
+    Returns
+    -------
+        list
+            output of ``predict_step`` for each batch
+    """
+    training = model.training
+    model.eval()
+    results = []
+    try:
+        with torch.inference_mode():
+            for batch_idx, batch in enumerate(batches):
+                results.append(model.predict_step(move_to_device(batch, model.device), batch_idx))
+    finally:
+        model.train(training)
+    return results
+
+
+def _create_optimizer(model: "TimeNet", params, lr: float) -> torch.optim.Optimizer:
+    """Creates the optimizer of the training config of a model, for the given parameters and learning rate."""
+    assert model.config_train is not None
+    # the config resolves the name of the optimizer to its class
+    optimizer_class = cast(Callable[..., torch.optim.Optimizer], model._optimizer)
+    return optimizer_class(params, lr=lr, **model.config_train.optimizer_args)
+
+
+def _create_scheduler(
+    model: "TimeNet", optimizer: torch.optim.Optimizer, max_lr: float, total_steps: int
+) -> torch.optim.lr_scheduler.LRScheduler:
+    """Creates the learning rate scheduler of the training config of a model, for the given optimizer."""
+    assert model.config_train is not None and model._scheduler is not None
+    return model._scheduler(optimizer, max_lr=max_lr, total_steps=total_steps, **model.config_train.scheduler_args)
+
+
+def lr_range_test(
+    model: "TimeNet",
+    batches,
+    min_lr: float,
+    max_lr: float,
+    num_training: int,
+    early_stop_threshold: Optional[float] = None,
+    beta: float = 0.98,
+) -> dict:
+    """Run a learning rate range test in a plain torch loop.
+
+    Like ``Tuner.lr_find``, trains for ``num_training`` steps with an exponentially increasing learning rate and
+    records the smoothed loss of each step. The parameters are kept in memory and restored afterwards, instead of
+    saving and restoring a Trainer checkpoint. The test stops early at the first non-finite loss.
+
+    Parameters
+    ----------
+        model : TimeNet
+            model with a ``loss_func`` and an optimizer config
+        batches : iterable
+            training batches, e.g. a list or a ``DataLoader``, iterated again if there are fewer than ``num_training``
+        min_lr : float
+            learning rate of the first step
+        max_lr : float
+            learning rate of the last step
+        num_training : int
+            number of steps
+        early_stop_threshold : float
+            stop if the smoothed loss is larger than ``early_stop_threshold`` times the best loss, ``None`` to disable
+        beta : float
+            forget rate of the running average of the loss
+
+    Returns
+    -------
+        dict
+            learning rate ``lr`` and smoothed loss ``loss`` of each step, as in ``Tuner.lr_find(...).results``
+    """
+    state = copy.deepcopy(model.state_dict())
+    training = model.training
+    optimizer = _create_optimizer(model, model.parameters(), lr=min_lr)
+    # same schedule as the exponential schedule of ``Tuner.lr_find``, which skips the second step of the range
+    exponents = np.arange(1, num_training + 1) / num_training
+    exponents[0] = 0.0
+    lrs = min_lr * (max_lr / min_lr) ** exponents
+    results: dict = {"lr": [], "loss": []}
+    avg_loss, best_loss = 0.0, np.inf
+    model.train()
+    batch_iterator = iter(batches)
+    try:
+        for step, lr in enumerate(lrs):
+            batch = next(batch_iterator, None)
+            if batch is None:
+                batch_iterator = iter(batches)
+                batch = next(batch_iterator)
+            inputs, targets, meta = move_to_device(batch, model.device)
+            for param_group in optimizer.param_groups:
+                param_group["lr"] = lr
+            predicted, _ = model(inputs, model.get_meta_name_tensor(meta))
+            loss, _ = model.loss_func(inputs, predicted, targets, epoch=0, progress_in_epoch=0.0)
+            current_loss = loss.item()
+            if not np.isfinite(current_loss):
+                break
+            optimizer.zero_grad()
+            loss.backward()
+            optimizer.step()
+            # Avg loss (loss with momentum) + smoothing, bias corrected by the global step after the optimizer step
+            avg_loss = beta * avg_loss + (1 - beta) * current_loss
+            smoothed_loss = avg_loss / (1 - beta ** (step + 2))
+            results["lr"].append(float(lr))
+            results["loss"].append(smoothed_loss)
+            if early_stop_threshold is not None and step > 0 and smoothed_loss > early_stop_threshold * best_loss:
+                break
+            best_loss = min(best_loss, smoothed_loss)
+    finally:
+        model.load_state_dict(state)
+        model.train(training)
+    return results
+
+
+class EarlyStopping:
+    """Stops training when a monitored metric stops improving, like ``pl.callbacks.EarlyStopping`` in mode ``min``."""
+
+    def __init__(self, patience: int = 20, divergence_threshold: Optional[float] = 5.0):
+        """
+        Parameters
+        ----------
+            patience : int
+                number of epochs without improvement after which training is stopped
+            divergence_threshold : float
+                stop as soon as the metric is larger than this value
+        """
+        self.patience = patience
+        self.divergence_threshold = divergence_threshold
+        self.best_score = np.inf
+        self.wait_count = 0
+
+    def should_stop(self, current: float) -> bool:
+        """Updates the state with the metric of an epoch, and tells whether to stop training."""
+        if not np.isfinite(current):
+            return True
+        if self.divergence_threshold is not None and current > self.divergence_threshold:
+            return True
+        if current < self.best_score:
+            self.best_score = current
+            self.wait_count = 0
+            return False
+        self.wait_count += 1
+        return self.wait_count >= self.patience
+
+
+def _epoch_means(step_values: dict, weights: Optional[dict] = None) -> dict:
+    """Means of the values logged at each step of an epoch, like ``self.log(..., on_epoch=True)``."""
+    weights = weights or {}
+    return {
+        name: float(np.average(values, weights=weights.get(name))) if len(values) else float("nan")
+        for name, values in step_values.items()
+    }
+
+
+def train_model(
+    model: "TimeNet",
+    train_loader,
+    epochs: int,
+    val_loader=None,
+    metrics_enabled: bool = False,
+    early_stopping: bool = False,
+    progress_bar_enabled: bool = True,
+) -> dict:
+    """Train a model in a plain PyTorch loop, without a Lightning Trainer.
+
+    Runs the same optimization as ``TimeNet.training_step`` with a Trainer: the optimizer and 1cycle scheduler of
+    ``configure_optimizers``, and the loss with the delayed regularization of ``loss_func``. Saves the dispatch of
+    callbacks, the logging of each step and the TensorBoard writer, which dominate the time to train small models.
+
+    Parameters
+    ----------
+        model : TimeNet
+            model with a ``loss_func``, an optimizer and a scheduler config
+        train_loader : DataLoader
+            training data
+        epochs : int
+            number of epochs to train for
+        val_loader : DataLoader
+            validation data, evaluated after each epoch
+        metrics_enabled : bool
+            whether to collect the metrics of each epoch
+        early_stopping : bool
+            whether to stop training when ``Loss`` (or ``Loss_val`` with validation data) stops improving, requires
+            ``metrics_enabled``
+        progress_bar_enabled : bool
+            whether to show a progress bar over the epochs
+
+    Returns
+    -------
+        dict
+            metrics of each epoch, as collected by ``MetricsLogger.history``. Empty if ``metrics_enabled`` is False.
+    """
+    if early_stopping and not metrics_enabled:
+        raise ValueError("Early stopping requires metrics to be enabled.")
+    num_batches = len(train_loader)
+    optimizer = _create_optimizer(model, model.parameters(), lr=model.learning_rate)
+    scheduler = _create_scheduler(model, optimizer, max_lr=model.learning_rate, total_steps=epochs * num_batches)
+    stopper = EarlyStopping() if early_stopping else None
+    history: dict = collections.defaultdict(list)
+    for epoch in tqdm(range(epochs), desc="Training", disable=not progress_bar_enabled):
+        model.train()
+        step_values, batch_sizes = collections.defaultdict(list), []
+        for batch_idx, batch in enumerate(train_loader):
+            inputs, targets, meta = move_to_device(batch, model.device)
+            predicted, _ = model(inputs, model.get_meta_name_tensor(meta))
+            loss, reg_loss = model.loss_func(
+                inputs, predicted, targets, epoch=epoch, progress_in_epoch=batch_idx / num_batches
+            )
+            optimizer.zero_grad()
+            loss.backward()
+            optimizer.step()
+            scheduler.step()
+            if metrics_enabled:
+                batch_sizes.append(targets.shape[0])
+                step_values["train_loss"].append(loss.item())
+                step_values["reg_loss"].append(reg_loss.item())
+                predicted_denorm = model.denormalize(predicted.detach()[:, :, 0])
+                target_denorm = model.denormalize(targets.squeeze(dim=2))
+                for name, value in model.metrics_train(predicted_denorm, target_denorm).items():
+                    step_values[name].append(value.item())
+                step_values["Loss"].append(loss.item())
+                step_values["RegLoss"].append(reg_loss.item())
+        if not metrics_enabled:
+            continue
+        if val_loader is not None:
+            model.eval()
+            val_values = collections.defaultdict(list)
+            with torch.no_grad():
+                for batch in val_loader:
+                    inputs, targets, meta = move_to_device(batch, model.device)
+                    predicted, _ = model(inputs, model.get_meta_name_tensor(meta))
+                    loss, reg_loss = model.loss_func(inputs, predicted, targets, epoch=epoch, progress_in_epoch=1.0)
+                    predicted_denorm = model.denormalize(predicted[:, :, 0])
+                    target_denorm = model.denormalize(targets.squeeze(dim=2))
+                    for name, value in model.metrics_val(predicted_denorm, target_denorm).items():
+                        val_values[name].append(value.item())
+                    val_values["Loss_val"].append(loss.item())
+                    val_values["RegLoss_val"].append(reg_loss.item())
+            for name, value in _epoch_means(val_values).items():
+                history[name].append(value)
+            history["epoch"].append(epoch)
+        # the losses are weighted by the size of each batch, the metrics by the configured batch size
+        weights = {"train_loss": batch_sizes, "reg_loss": batch_sizes}
+        for name, value in _epoch_means(step_values, weights).items():
+            history[name].append(value)
+        if val_loader is None:
+            history["epoch"].append(epoch)
+        if stopper is not None and stopper.should_stop(history["Loss_val" if val_loader is not None else "Loss"][-1]):
+            log.info(f"Early stopping after epoch {epoch}.")
+            break
+    return history
+
+
+class _StackedStep(nn.Module):
+    """Forward pass and loss of a model, called with the parameters of each stacked model by ``train_stacked``."""
+
+    def __init__(self, model: "TimeNet"):
+        super().__init__()
+        self.model = model
+
+    def forward(self, inputs, targets, epoch, progress_in_epoch):
+        predicted, _ = self.model(inputs)
+        loss, reg_loss = self.model.loss_func(
+            inputs, predicted, targets, epoch=epoch, progress_in_epoch=progress_in_epoch
+        )
+        return loss, reg_loss, predicted
+
+
+def _stack_batches(values: list):
+    """Stacks the (nested dicts of) tensors of a batch of each model along a new leading model dimension."""
+    if isinstance(values[0], dict):
+        return {key: _stack_batches([value[key] for value in values]) for key in values[0]}
+    if isinstance(values[0], torch.Tensor):
+        return torch.stack(values)
+    return values[0]
+
+
+def _stacked_metrics(metrics, predicted, targets) -> dict:
+    """Batch values of the metrics of each stacked model, as the metric collection ``metrics`` of a single model."""
+    error = predicted - targets
+    values = {}
+    for name, metric in metrics.items():
+        if isinstance(metric, torchmetrics.MeanAbsoluteError):
+            values[name] = error.abs().mean(dim=(1, 2))
+        elif isinstance(metric, torchmetrics.MeanSquaredError):
+            values[name] = error.square().mean(dim=(1, 2))
+            if not metric.squared:
+                values[name] = values[name].sqrt()
+        else:
+            raise NotImplementedError(f"Metric {name} is not supported when training stacked models.")
+    return values
+
+
+def train_stacked(
+    models: list,
+    train_loaders: list,
+    epochs: int,
+    metrics_enabled: bool = False,
+    progress_bar_enabled: bool = True,
+) -> list:
+    """Train independent models of the same architecture at once, as one network with stacked parameters.
+
+    The parameters of the models are stacked along a leading model dimension, and each step runs the forward pass,
+    loss and regularization of all models with ``torch.func.vmap``: one batched operation per layer instead of one
+    per layer and model. The models stay independent. The loss of each model is reduced over its own batch, so
+    gradients only reach its own parameters, and each model follows the 1cycle schedule of its own learning rate.
+    Otherwise the optimization is that of ``train_model``.
+
+    Parameters
+    ----------
+        models : list
+            models with the same parameter shapes, a ``loss_func``, an optimizer and a scheduler config, e.g.
+            ``TimeNet``. The trained parameters are written back to each model.
+        train_loaders : list
+            training data of each model, with the same number and sizes of batches
+        epochs : int
+            number of epochs to train for
+        metrics_enabled : bool
+            whether to collect the metrics of each epoch
+        progress_bar_enabled : bool
+            whether to show a progress bar over the epochs
+
+    Returns
+    -------
+        list
+            metrics of each epoch of each model, see ``train_model``
+    """
+    base = models[0]
+    num_batches = len(train_loaders[0])
+    if any(len(loader) != num_batches for loader in train_loaders):
+        raise ValueError("Stacked models must have the same number of batches per epoch.")
+    step = _StackedStep(copy.deepcopy(base))
+    params, buffers = torch.func.stack_module_state(models)
+    params = {f"model.{name}": param for name, param in params.items()}
+    buffers = {f"model.{name}": buffer for name, buffer in buffers.items()}
+    trainable = [param for param in params.values() if param.requires_grad]
+
+    # The optimizer follows the 1cycle schedule of a learning rate of 1, and the update of each model is scaled by its
+    # learning rate. Exact, as the updates of SGD and Adam(W) are proportional to the learning rate.
+    optimizer = _create_optimizer(base, trainable, lr=1.0)
+    scheduler = _create_scheduler(base, optimizer, max_lr=1.0, total_steps=epochs * num_batches)
+    learning_rates = torch.tensor([model.learning_rate for model in models], device=base.device)
+
+    def compute_loss(params, buffers, inputs, targets, epoch, progress_in_epoch):
+        return torch.func.functional_call(step, (params, buffers), (inputs, targets, epoch, progress_in_epoch))
+
+    stacked_loss = torch.func.vmap(compute_loss, in_dims=(0, 0, 0, 0, None, None))
+
+    # denormalization of the targets of each model, for the metrics
+    zero, one = torch.zeros(1, device=base.device), torch.ones(1, device=base.device)
+    shift = torch.stack([model.denormalize(zero) for model in models]).view(-1, 1, 1)
+    scale = torch.stack([model.denormalize(one) for model in models]).view(-1, 1, 1) - shift
+    histories = [collections.defaultdict(list) for _ in models]
+    for epoch in tqdm(range(epochs), desc="Training", disable=not progress_bar_enabled):
+        step_values, batch_sizes = collections.defaultdict(list), []
+        for batch_idx, batches in enumerate(zip(*train_loaders)):
+            batches = [move_to_device(batch, base.device) for batch in batches]
+            inputs = _stack_batches([inputs for inputs, _, _ in batches])
+            targets = torch.stack([targets for _, targets, _ in batches])
+            loss, reg_loss, predicted = stacked_loss(params, buffers, inputs, targets, epoch, batch_idx / num_batches)
+            optimizer.zero_grad()
+            loss.sum().backward()
+            previous = [param.detach().clone() for param in trainable]
+            optimizer.step()
+            with torch.no_grad():
+                for param, previous_param in zip(trainable, previous):
+                    learning_rate = learning_rates.view(-1, *[1] * (param.dim() - 1))
+                    param.copy_(previous_param + learning_rate * (param - previous_param))
+            scheduler.step()
+            if metrics_enabled:
+                batch_sizes.append(targets.shape[1])
+                loss, reg_loss = loss.detach().view(-1), reg_loss.detach().view(-1)
+                step_values["train_loss"].append(loss)
+                step_values["reg_loss"].append(reg_loss)
+                predicted_denorm = scale * predicted.detach()[:, :, :, 0] + shift
+                target_denorm = scale * targets.squeeze(dim=3) + shift
+                for name, value in _stacked_metrics(base.metrics_train, predicted_denorm, target_denorm).items():
+                    step_values[name].append(value)
+                step_values["Loss"].append(loss)
+                step_values["RegLoss"].append(reg_loss)
+        if not metrics_enabled:
+            continue
+        # the losses are weighted by the size of each batch, the metrics by the configured batch size
+        weights = torch.tensor(batch_sizes, dtype=torch.float, device=base.device)
+        for name, values in step_values.items():
+            values = torch.stack(values)
+            if name in ["train_loss", "reg_loss"]:
+                means = (values * weights.view(-1, 1)).sum(dim=0) / weights.sum()
+            else:
+                means = values.mean(dim=0)
+            for history, value in zip(histories, means.tolist()):
+                history[name].append(value)
+        for history in histories:
+            history["epoch"].append(epoch)
+
+    with torch.no_grad():
+        for i, model in enumerate(models):
+            for name, param in model.named_parameters():
+                param.copy_(params[f"model.{name}"][i])
+    return [dict(history) for history in histories]
+
+
 def interprete_model(
     target_model: pl.LightningModule,
     net: str,
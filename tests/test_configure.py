@@ -47,3 +47,9 @@ def test_config_training_quantiles_error_invalid_scale():
     with pytest.raises(Exception) as err:
         Train(**config_train_params)
     assert str(err.value) == "The quantiles specified need to be floats in-between (0, 1)."
+
+
+def test_config_training_lr_finder_error_invalid():
+    config_train_params = generate_config_train_params({"lr_finder": "exhaustive"})
+    with pytest.raises(ValueError):
+        Train(**config_train_params)
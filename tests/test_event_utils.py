@@ -10,7 +10,7 @@ import pandas as pd
 import pytest
 from holidays import country_holidays
 
-from neuralprophet import NeuralProphet, event_utils
+from neuralprophet import NeuralProphet, event_utils, set_random_seed
 
 log = logging.getLogger("NP.test")
 log.setLevel("ERROR")
@@ -44,6 +44,35 @@ def test_get_country_holidays():
         event_utils.get_holiday_names("NotSupportedCountry")
 
 
+def test_holiday_calendar(tmp_path):
+    years = [2019, 2021]
+    calendar = event_utils.get_holiday_calendar(years, {"US": "CA", "DE": None})
+    # computed once per process
+    assert (
+        calendar["Christmas Day"] is event_utils.get_holiday_calendar(years, {"US": "CA", "DE": None})["Christmas Day"]
+    )
+    ds = pd.Series(pd.date_range("2018-12-20", "2022-01-10", freq="12h"))
+    all_holidays = event_utils.get_all_holidays(range(2019, 2022), {"US": "CA", "DE": None})
+    assert set(calendar.keys()) == set(all_holidays.keys())
+    holiday_names = sorted(calendar.keys())
+    features = event_utils.get_holiday_features(ds, holiday_names, calendar)
+    assert features.dtype == "float32"
+    for i, name in enumerate(holiday_names):
+        pd.testing.assert_series_equal(
+            pd.Series(features[:, i]), ds.isin(all_holidays[name]).astype("float32"), check_names=False
+        )
+    # persisted calendars are read by other processes
+    event_utils._holiday_calendars.clear()
+    calendar = event_utils.get_holiday_calendar(years, "US", cache_dir=str(tmp_path))
+    assert len(list(tmp_path.glob("holidays_US_*.npz"))) == 1
+    event_utils._holiday_calendars.clear()
+    loaded = event_utils.get_holiday_calendar(years, "US", cache_dir=str(tmp_path))
+    assert loaded.keys() == calendar.keys()
+    for name, days in calendar.items():
+        assert days.dtype == "int64"
+        assert (loaded[name] == days).all()
+
+
 def test_get_country_holidays_with_subdivisions():
     # Test US holidays with a subdivision
     us_ca_holidays = country_holidays("US", years=2019, subdiv="CA")
@@ -150,3 +179,29 @@ def test_events():
         m.plot(forecast)
         m.plot_parameters()
         plt.show()
+
+
+def test_sparse_events():
+    df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
+    events_df = pd.DataFrame({"event": "promo", "ds": df["ds"].iloc[::17]})
+    forecasts = []
+    for sparse_events in (False, True):
+        set_random_seed(0)
+        m = NeuralProphet(
+            n_lags=3,
+            n_forecasts=2,
+            epochs=EPOCHS,
+            batch_size=BATCH_SIZE,
+            learning_rate=LR,
+            quantiles=[0.1, 0.9],
+            sparse_events=sparse_events,
+        )
+        m.add_events("promo", lower_window=-2, upper_window=1, mode="multiplicative")
+        m.add_country_holidays("US", lower_window=-1, upper_window=1)
+        history_df = m.create_df_with_events(df, events_df)
+        m.fit(history_df, freq="D")
+        future = m.make_future_dataframe(history_df, events_df=events_df, periods=2, n_historic_predictions=True)
+        forecasts.append(m.predict(future))
+    # the gathered sparse effects are identical to the dense effects, up to the order of summation
+    assert "event_promo" in forecasts[1].columns
+    pd.testing.assert_frame_equal(forecasts[0], forecasts[1], rtol=1e-4)
@@ -7,7 +7,7 @@ import pathlib
 import pandas as pd
 import pytest
 
-from neuralprophet import NeuralProphet
+from neuralprophet import DataFrameChunks, NeuralProphet
 
 log = logging.getLogger("NP.test")
 log.setLevel("ERROR")
@@ -412,3 +412,70 @@ def test_trend_local_reg_if_global():
         log.debug(
             f"forecast = {forecast}, metrics= {metrics}, forecast_trend = {forecast_trend}, forecast_seasonal_componets= {forecast_seasonal_componets}"
         )
+
+
+def test_fit_dataframe_chunks():
+    # Streaming fit of one chunk per series, each loaded lazily
+    df = pd.read_csv(PEYTON_FILE, nrows=384)
+    df1_0 = df.iloc[:128, :].copy(deep=True)
+    df1_0["ID"] = "df1"
+    df2_0 = df.iloc[128:256, :].copy(deep=True)
+    df2_0["ID"] = "df2"
+    df3_0 = df.iloc[256:, :].copy(deep=True)
+    df3_0["ID"] = "df3"
+    chunks = DataFrameChunks([df1_0, lambda: df2_0, lambda: df3_0])
+    m = NeuralProphet(
+        n_forecasts=2,
+        n_lags=5,
+        epochs=EPOCHS,
+        batch_size=BATCH_SIZE,
+        learning_rate=LR,
+        trend_global_local="local",
+    )
+    m.fit(chunks, freq="D")
+    # normalization of the stream equals the one of the whole data
+    m_ref = NeuralProphet(n_forecasts=2, n_lags=5, epochs=EPOCHS, batch_size=BATCH_SIZE, learning_rate=LR)
+    df_global = pd.concat((df1_0, df2_0, df3_0))
+    m_ref.fit(df_global, freq="D")
+    assert m.id_list == m_ref.id_list
+    assert m.config_normalization.local_data_params == m_ref.config_normalization.local_data_params
+    assert m.config_normalization.global_data_params == m_ref.config_normalization.global_data_params
+    assert m.model.train_loader.dataset.num_samples == len(m_ref.model.train_loader.dataset)
+    # counted in the pass over the data for the normalization, as in the dataset of each chunk
+    assert m.chunk_num_samples == [len(m._create_chunk_dataset(chunk)) for chunk in chunks]
+    forecast = m.predict(df_global)
+    assert len(forecast) == len(m_ref.predict(df_global))
+    with pytest.raises(ValueError):
+        NeuralProphet(epochs=EPOCHS, batch_size=BATCH_SIZE).fit(chunks, freq="D")
+    with pytest.raises(ValueError):
+        # series split across chunks
+        NeuralProphet(epochs=EPOCHS, learning_rate=LR).fit(DataFrameChunks([df1_0[:64], df1_0[64:]]), freq="D")
+
+
+def test_predict_series_batched():
+    # all series are predicted at once, identical to predicting each series separately
+    df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
+    df1 = df.iloc[:200].assign(ID="df1")
+    df2 = df.iloc[50:].assign(ID="df2", y=df["y"].iloc[50:] * 2)
+    df_global = pd.concat((df2, df1), ignore_index=True)
+    m = NeuralProphet(
+        n_forecasts=3,
+        n_lags=5,
+        epochs=EPOCHS,
+        batch_size=BATCH_SIZE,
+        learning_rate=LR,
+        trend_global_local="local",
+        quantiles=[0.1, 0.9],
+    )
+    m.add_events("playoff")
+    events_df = pd.DataFrame({"event": "playoff", "ds": df["ds"].iloc[::20]})
+    df_global = m.create_df_with_events(df_global, events_df)
+    m.fit(df_global, freq="D")
+    forecast = m.predict(df_global)
+    raw = m.predict(df_global, raw=True)
+    forecasts, raws = [], []
+    for df_name, df_i in df_global.groupby("ID"):
+        forecasts.append(m.predict(df_i))
+        raws.append(m.predict(df_i, raw=True))
+    pd.testing.assert_frame_equal(forecast, pd.concat(forecasts, ignore_index=True))
+    pd.testing.assert_frame_equal(raw, pd.concat(raws, ignore_index=True))
@@ -10,8 +10,21 @@ import numpy as np
 import pandas as pd
 import pytest
 import torch
-
-from neuralprophet import NeuralProphet, df_utils, set_random_seed
+from lightning_fabric.utilities.seed import reset_seed
+
+from neuralprophet import (
+    ForecastSession,
+    NeuralProphet,
+    Predictor,
+    df_utils,
+    fit_bulk,
+    fit_stacked,
+    iter_fit_bulk,
+    set_random_seed,
+    time_net,
+    utils,
+    utils_torch,
+)
 from neuralprophet.data.process import _handle_missing_data, _validate_column_name
 
 log = logging.getLogger("NP.test")
@@ -292,6 +305,177 @@ def test_custom_seasons():
         plt.show()
 
 
+def test_fused_seasonality():
+    df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
+    df["ds"] = pd.to_datetime(df["ds"])
+    df = df_utils.add_weekday_condition(df).drop(columns="weekday")
+    forecasts, seasonal_components = [], []
+    for computation in ("fourier", "fourier_fused"):
+        set_random_seed(0)
+        m = NeuralProphet(
+            n_lags=3,
+            n_forecasts=2,
+            yearly_seasonality=True,
+            seasonality_mode="multiplicative",
+            seasonality_computation=computation,
+            epochs=EPOCHS,
+            batch_size=BATCH_SIZE,
+            learning_rate=LR,
+        )
+        m.add_seasonality(name="weekend", period=7, fourier_order=2, condition_name="weekend")
+        m.fit(df, freq="D")
+        forecasts.append(m.predict(df))
+        seasonal_components.append(m.predict_seasonal_components(df))
+    # the features computed by the model are identical to the features of the dataset, up to float rounding
+    pd.testing.assert_frame_equal(forecasts[0], forecasts[1], rtol=1e-4)
+    pd.testing.assert_frame_equal(seasonal_components[0], seasonal_components[1], rtol=1e-4)
+    with pytest.raises(ValueError):
+        NeuralProphet(seasonality_computation="wavelet")
+
+
+def test_fast_lr_finder(tmp_path, monkeypatch):
+    df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
+    monkeypatch.setattr(utils, "LR_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(utils, "_learning_rates", {})
+    set_random_seed(0)
+    m = NeuralProphet(n_lags=3, epochs=EPOCHS, batch_size=BATCH_SIZE, lr_finder="fast")
+    m.fit(df, freq="D")
+    learning_rate = m.model.learning_rate
+    assert 1e-6 <= learning_rate <= 10
+    assert len(list(tmp_path.glob("learning_rate_*.json"))) == 1
+
+    # a new process with the same model and data shape reuses the persisted learning rate
+    monkeypatch.setattr(utils, "_learning_rates", {})
+
+    def lr_range_test(*args, **kwargs):
+        raise AssertionError("the learning rate should be reused")
+
+    monkeypatch.setattr(utils_torch, "lr_range_test", lr_range_test)
+    m = NeuralProphet(n_lags=3, epochs=EPOCHS, batch_size=BATCH_SIZE, lr_finder="fast")
+    m.fit(df.assign(y=df["y"] + 1), freq="D")
+    assert m.model.learning_rate == learning_rate
+    # a different architecture is a different learning rate test
+    with pytest.raises(AssertionError, match="reused"):
+        NeuralProphet(n_lags=5, epochs=EPOCHS, batch_size=BATCH_SIZE, lr_finder="fast").fit(df, freq="D")
+    # and so is a different config of the same architecture
+    for config in [{"seasonality_mode": "multiplicative"}, {"trend_reg": 10.0}, {"normalize": "minmax"}]:
+        m = NeuralProphet(n_lags=3, epochs=EPOCHS, batch_size=BATCH_SIZE, lr_finder="fast", **config)
+        with pytest.raises(AssertionError, match="reused"):
+            m.fit(df, freq="D")
+
+
+@pytest.mark.parametrize("with_validation", [False, True])
+def test_fit_without_trainer(with_validation):
+    df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
+    df_train, df_val = (df.iloc[:-60], df.iloc[-60:]) if with_validation else (df, None)
+    fits = []
+    for use_trainer in [True, False]:
+        set_random_seed(0)
+        m = NeuralProphet(n_lags=3, epochs=EPOCHS, batch_size=BATCH_SIZE, learning_rate=LR, trend_reg=1)
+        metrics_df = m.fit(df_train, validation_df=df_val, freq="D", use_trainer=use_trainer)
+        fits.append((metrics_df, m.predict(df)))
+    (metrics_trainer, forecast_trainer), (metrics_loop, forecast_loop) = fits
+    pd.testing.assert_frame_equal(metrics_trainer, metrics_loop, check_dtype=False, rtol=1e-5)
+    pd.testing.assert_frame_equal(forecast_trainer, forecast_loop, rtol=1e-5)
+
+    m = NeuralProphet(epochs=EPOCHS, batch_size=BATCH_SIZE, learning_rate=LR)
+    with pytest.raises(NotImplementedError):
+        m.fit(df, freq="D", checkpointing=True, use_trainer=False)
+
+
+def test_fit_bulk():
+    df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
+    df_global = pd.concat([df.assign(ID="df1"), df.assign(ID="df2", y=df["y"] + 1)], ignore_index=True)
+    model_kwargs = {"n_lags": 3, "epochs": EPOCHS, "batch_size": BATCH_SIZE, "learning_rate": LR}
+    models, metrics = fit_bulk(df_global, freq="D", model_kwargs=model_kwargs, num_workers=2, seed=0)
+    assert list(models) == ["df1", "df2"]
+    assert list(metrics["ID"].unique()) == ["df1", "df2"]
+    assert len(metrics) == 2 * EPOCHS
+
+    # each model is fitted as it would be on its own
+    df2 = df_global[df_global["ID"] == "df2"]
+    set_random_seed(0)
+    m = NeuralProphet(**model_kwargs)
+    m.fit(df2, freq="D")
+    pd.testing.assert_frame_equal(models["df2"].predict(df2), m.predict(df2))
+
+    # the fit of a series failing, here for too few rows, does not stop the others
+    df_failing = pd.concat([df.iloc[:3].assign(ID="df0"), df_global], ignore_index=True)
+    results = {
+        result.ID: result
+        for result in iter_fit_bulk(df_failing, freq="D", model_kwargs=model_kwargs, num_workers=2, seed=0)
+    }
+    assert isinstance(results["df0"].error, ValueError) and results["df0"].model is None
+    assert results["df1"].error is None and results["df2"].error is None
+    models, metrics = fit_bulk(df_failing, freq="D", model_kwargs=model_kwargs, num_workers=2, seed=0)
+    assert list(models) == ["df1", "df2"]
+    assert list(metrics["ID"].unique()) == ["df1", "df2"]
+
+    # the models are keyed by the IDs as given, not as strings
+    df_int = pd.concat([df.assign(ID=1), df.assign(ID=2, y=df["y"] + 1)], ignore_index=True)
+    models, metrics = fit_bulk(df_int, freq="D", model_kwargs=model_kwargs, num_workers=1, seed=0)
+    assert list(models) == [1, 2]
+    assert list(metrics["ID"].unique()) == [1, 2]
+
+
+def test_fit_stacked():
+    df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
+    model_kwargs = {"n_lags": 3, "epochs": 3, "batch_size": 32, "learning_rate": 0.1, "ar_reg": 1}
+    # the models of df1 and df2 are stacked, df3 has fewer samples and is trained in a stack of its own
+    df_global = pd.concat(
+        [df.assign(ID="df1"), df.assign(ID="df2", y=df["y"] * 2), df.iloc[:-50].assign(ID="df3")], ignore_index=True
+    )
+    models, metrics = fit_stacked(df_global, freq="D", model_kwargs=model_kwargs, seed=0)
+    assert list(models) == ["df1", "df2", "df3"]
+    assert list(metrics["ID"].unique()) == ["df1", "df2", "df3"]
+    assert len(metrics) == 3 * 3
+
+    # a stacked model is trained as on its own
+    df1 = df.assign(ID="df1")
+    models, metrics = fit_stacked(df1, freq="D", model_kwargs=model_kwargs, seed=0)
+    set_random_seed(0)
+    m = NeuralProphet(**model_kwargs)
+    metrics_df = m.fit(df1, freq="D", use_trainer=False)
+    pd.testing.assert_frame_equal(metrics.drop(columns="ID"), metrics_df, check_dtype=False, rtol=1e-5)
+    pd.testing.assert_frame_equal(models["df1"].predict(df1), m.predict(df1), rtol=1e-5, atol=1e-5)
+
+    # independent of the other models in its stack
+    forecasts = []
+    for y in [df["y"] * 2, df["y"] + 10]:
+        models, _ = fit_stacked(pd.concat([df1, df.assign(ID="df2", y=y)]), freq="D", model_kwargs=model_kwargs, seed=0)
+        forecasts.append(models["df1"].predict(df1))
+    pd.testing.assert_frame_equal(forecasts[0], forecasts[1])
+
+
+def test_fit_ddp(monkeypatch):
+    df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
+    df_global = pd.concat([df.assign(ID="df1"), df.assign(ID="df2", y=df["y"] * 2)], ignore_index=True)
+    model_kwargs = {"n_lags": 3, "epochs": 2, "learning_rate": 0.1, "ar_reg": 1, "accelerator": "cpu"}
+    # the processes of DDP reset the random seed when set up, as does the fit in a single process here
+    setup = time_net.TimeNet.setup
+
+    def setup_with_reset_seed(self, stage):
+        if self.trainer.world_size == 1:
+            reset_seed()
+        setup(self, stage)
+
+    monkeypatch.setattr(time_net.TimeNet, "setup", setup_with_reset_seed)
+    fits = []
+    for devices, batch_size in [(1, 64), (2, 32)]:
+        set_random_seed(0)
+        trainer_config = {"strategy": "ddp", "devices": devices} if devices > 1 else {}
+        m = NeuralProphet(batch_size=batch_size, trainer_config=trainer_config, **model_kwargs)
+        metrics_df = m.fit(df_global, freq="D")
+        fits.append((metrics_df, m.predict(df_global)))
+    (metrics_single, forecast_single), (metrics_ddp, forecast_ddp) = fits
+    # two processes with half the batch size take the same steps, the RMSE is the mean over those of the processes
+    assert len(metrics_ddp) == 2
+    pd.testing.assert_frame_equal(
+        metrics_single.drop(columns="RMSE"), metrics_ddp.drop(columns="RMSE"), check_dtype=False, rtol=1e-5
+    )
+    pd.testing.assert_frame_equal(forecast_single, forecast_ddp, rtol=1e-5, atol=1e-5)
+
+
 def test_ar():
     log.info("testing: AR")
     df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
@@ -1509,6 +1693,62 @@ def test_predict_raw():
     m.predict(df=future, raw=True)
 
 
+def test_predict_without_trainer():
+    df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
+    m = NeuralProphet(
+        n_forecasts=3, n_lags=5, quantiles=[0.1, 0.9], epochs=EPOCHS, batch_size=BATCH_SIZE, learning_rate=LR
+    )
+    m.fit(df, freq="D")
+    future = m.make_future_dataframe(df, periods=3, n_historic_predictions=50)
+    forecast = m.predict(future)
+    pd.testing.assert_frame_equal(m.predict(future, use_trainer=False), forecast)
+    pd.testing.assert_frame_equal(m.predict(future, raw=True, use_trainer=False), m.predict(future, raw=True))
+    # standalone predictor, also without a trainer
+    m.trainer = None
+    training = m.model.training
+    predictor = Predictor(m)
+    pd.testing.assert_frame_equal(predictor.predict(future), forecast)
+    assert m.model.training == training
+
+
+def test_forecast_session():
+    df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
+    df.loc[NROWS - 15 : NROWS - 13, "y"] = np.nan
+    m = NeuralProphet(
+        n_forecasts=3, n_lags=5, quantiles=[0.1, 0.9], epochs=EPOCHS, batch_size=BATCH_SIZE, learning_rate=LR
+    )
+    m.fit(df[: NROWS - 20], freq="D")
+    session = ForecastSession(m, df[: NROWS - 20])
+    assert len(session.buffers["__df__"]) == session.history_size
+    for end in [NROWS - 10, NROWS]:
+        # the session receives new rows only, and forecasts like predicting the full history
+        latest = session.predict(df[end - 10 : end])
+        future = m.make_future_dataframe(df[:end], n_historic_predictions=True)
+        expected = m.get_latest_forecast(m.predict(future))
+        pd.testing.assert_frame_equal(latest, expected, check_dtype=False, rtol=1e-5)
+    with pytest.raises(ValueError):
+        session.predict(df[NROWS - 5 :])
+
+
+def test_forecast_session_integer_history():
+    df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
+    df["y"] = (df["y"] * 10).round().astype(int)
+    df["A"] = np.arange(NROWS) % 7
+    m = NeuralProphet(n_forecasts=3, n_lags=5, epochs=EPOCHS, batch_size=BATCH_SIZE, learning_rate=LR)
+    m.add_lagged_regressor("A")
+    m.fit(df[: NROWS - 10], freq="D")
+    session = ForecastSession(m, df[: NROWS - 10])
+    # later rows with a missing and fractional observations are not cast to the integer dtype of the history
+    df_new = df[NROWS - 10 :].astype({"y": float, "A": float})
+    df_new.loc[NROWS - 8, "y"] = np.nan
+    df_new.loc[NROWS - 6, "y"] += 0.5
+    df_new.loc[NROWS - 5, "A"] = 2.5
+    latest = session.predict(df_new)
+    future = m.make_future_dataframe(pd.concat([df[: NROWS - 10], df_new]), n_historic_predictions=True)
+    expected = m.get_latest_forecast(m.predict(future))
+    pd.testing.assert_frame_equal(latest, expected, check_dtype=False, rtol=1e-5)
+
+
 def test_accelerator():
     log.info("testing: accelerator in Lightning (if available)")
     df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
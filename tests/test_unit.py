@@ -8,10 +8,17 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import pytest
-from torch.utils.data import DataLoader
-
-from neuralprophet import NeuralProphet, configure, df_utils, time_dataset
-from neuralprophet.data.process import _create_dataset, _handle_missing_data
+import torch
+from torch.utils.data import DataLoader, default_collate
+
+from neuralprophet import NeuralProphet, configure, df_utils, event_utils, time_dataset, utils_torch
+from neuralprophet.components.router import get_trend
+from neuralprophet.data.process import (
+    _convert_raw_predictions_to_raw_df,
+    _create_dataset,
+    _handle_missing_data,
+    _reshape_raw_predictions_to_forecst_df,
+)
 from neuralprophet.data.transform import _normalize
 
 log = logging.getLogger("NP.test")
@@ -164,6 +171,34 @@ def test_normalize():
     df_utils.normalize(df, local_data_params["__df__"])
 
 
+def test_prepared_df_is_not_copied():
+    df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
+    df["ds"] = pd.to_datetime(df["ds"])
+    df_orig = df.copy(deep=True)
+    # copy=False returns a shallow copy with the ID column added, leaving df untouched
+    df_prep, _, received_single_time_series, _ = df_utils.prep_or_copy_df(df, copy=False)
+    assert received_single_time_series
+    assert "ID" not in df.columns
+    assert np.shares_memory(df_prep["y"].values, df["y"].values)
+    # a prepared df is passed on as is
+    df_again, _, _, _ = df_utils.prep_or_copy_df(df_prep, copy=False)
+    assert df_again is df_prep
+    assert df_utils.prep_or_copy_df(df_prep)[0] is not df_prep
+    # normalizing (multiple series) copies the data once, without modifying the input
+    df_multi = pd.concat((df_prep.assign(ID="b"), df_prep.assign(ID="a")), ignore_index=True)
+    df_multi_orig = df_multi.copy(deep=True)
+    m = NeuralProphet(epochs=EPOCHS, batch_size=BATCH_SIZE, learning_rate=LR)
+    m.config_normalization.init_data_params(df_multi, m.config_lagged_regressors, m.config_regressors)
+    df_norm = _normalize(df=df_multi, config_normalization=m.config_normalization)
+    pd.testing.assert_frame_equal(df_multi, df_multi_orig)
+    pd.testing.assert_frame_equal(df, df_orig)
+    assert list(df_norm["ID"].unique()) == ["a", "b"]
+    for df_name, df_i in df_multi.groupby("ID"):
+        expected = df_utils.normalize(df_i.drop("ID", axis=1), m.config_normalization.get_data_params(df_name))
+        actual = df_norm[df_norm["ID"] == df_name].drop("ID", axis=1).reset_index(drop=True)
+        pd.testing.assert_frame_equal(actual, expected.reset_index(drop=True))
+
+
 def test_add_lagged_regressors():
     NROWS = 512
     EPOCHS = 3
@@ -285,6 +320,48 @@ def test_split_impute():
     check_split(df_in=df, df_len_expected=len(df) - 12, freq="5min", n_lags=0, n_forecasts=1)
 
 
+def test_handle_missing_data_per_series():
+    m = NeuralProphet(n_lags=3, epochs=EPOCHS, batch_size=BATCH_SIZE, learning_rate=LR)
+    df_a = pd.DataFrame({"ds": pd.date_range("2022-01-01", periods=20), "y": np.arange(20.0), "ID": "a"})
+    df_a.loc[10, "y"] = np.nan
+    df_a.loc[19, "y"] = np.nan
+    df_a = df_a.drop(index=[5, 6])
+    df_b = pd.DataFrame({"ds": pd.date_range("2022-01-04", periods=15), "y": 100.0 + np.arange(15.0), "ID": "b"})
+    df_b.loc[0, "y"] = np.nan
+    # series are stored interleaved and in reverse order
+    df = pd.concat((df_b, df_a), ignore_index=True).iloc[::-1]
+    df, _, _ = df_utils.check_dataframe(df, check_y=False)
+    df_out = _handle_missing_data(
+        df=df,
+        freq="D",
+        n_lags=m.n_lags,
+        n_forecasts=m.n_forecasts,
+        config_missing=m.config_missing,
+        predicting=False,
+    )
+    assert list(df_out["ID"].unique()) == ["a", "b"]
+    out_a = df_out[df_out["ID"] == "a"].reset_index(drop=True)
+    out_b = df_out[df_out["ID"] == "b"].reset_index(drop=True)
+    # missing dates are added and the trailing NaN is dropped within each series
+    pd.testing.assert_series_equal(out_a["ds"], pd.Series(pd.date_range("2022-01-01", periods=19), name="ds"))
+    pd.testing.assert_series_equal(out_b["ds"], pd.Series(pd.date_range("2022-01-04", periods=15), name="ds"))
+    # gaps are imputed from values of the same series only
+    np.testing.assert_allclose(out_a["y"].values, np.arange(19.0))
+    np.testing.assert_allclose(out_b["y"].values, 100.0 + np.concatenate(([1.0], np.arange(1.0, 15.0))))
+    # each series is handled as if it was passed alone
+    for df_name, df_i in df.groupby("ID"):
+        expected = _handle_missing_data(
+            df=df_i,
+            freq="D",
+            n_lags=m.n_lags,
+            n_forecasts=m.n_forecasts,
+            config_missing=m.config_missing,
+            predicting=False,
+        )
+        actual = df_out[df_out["ID"] == df_name]
+        pd.testing.assert_frame_equal(actual.reset_index(drop=True), expected.reset_index(drop=True), check_like=True)
+
+
 def test_cv():
     def check_folds(df, n_lags, n_forecasts, valid_fold_num, valid_fold_pct, fold_overlap_pct):
         folds = df_utils.crossvalidation_split_df(
@@ -737,10 +814,282 @@ def test_dataloader():
     dataset = _create_dataset(m, df_global, predict_mode=False)
     loader = DataLoader(dataset, batch_size=min(1024, len(df)), shuffle=True, drop_last=False)
     for inputs, targets, meta in loader:
-        assert set(meta["df_name"]) == set(df_global["ID"].unique())
+        assert set(meta["df_id"].tolist()) == set(range(len(df_global["ID"].unique())))
         break
 
 
+def test_batched_dataloader():
+    df = pd.read_csv(PEYTON_FILE, nrows=100)
+    df["A"] = np.arange(len(df))
+    df["B"] = np.arange(len(df)) * 0.1
+    df1 = df[:50].assign(ID="df1")
+    df2 = df[50:].assign(ID="df2")
+    m = NeuralProphet(
+        epochs=EPOCHS,
+        batch_size=BATCH_SIZE,
+        learning_rate=LR,
+        yearly_seasonality=True,
+        weekly_seasonality=True,
+        daily_seasonality=True,
+        n_lags=3,
+        n_forecasts=2,
+    )
+    m.add_future_regressor("A")
+    m.add_lagged_regressor("B")
+    config_normalization = configure.Normalization("auto", False, True, False)
+    df_global = pd.concat((df1, df2))
+    df_global["ds"] = pd.to_datetime(df_global.loc[:, "ds"])
+    config_normalization.init_data_params(df_global, m.config_lagged_regressors, m.config_regressors, m.config_events)
+    m.config_normalization = config_normalization
+    df_global = _normalize(df=df_global, config_normalization=m.config_normalization)
+    dataset = _create_dataset(m, df_global, predict_mode=False)
+    indices = np.random.permutation(len(dataset))
+    inputs, targets, meta = dataset.get_batch(indices)
+    inputs_ref, targets_ref, meta_ref = default_collate([dataset[i] for i in indices])
+    assert torch.equal(meta["df_id"], meta_ref["df_id"])
+    assert torch.equal(targets, targets_ref)
+    for key, value in inputs_ref.items():
+        if isinstance(value, dict):
+            for name, features in value.items():
+                assert torch.equal(inputs[key][name], features)
+        else:
+            assert torch.equal(inputs[key], value)
+    loader = time_dataset.create_batched_loader(dataset, batch_size=32, shuffle=True)
+    assert len(loader) == int(np.ceil(len(dataset) / 32))
+    n_samples = 0
+    for inputs, targets, meta in loader:
+        n_samples += targets.shape[0]
+    assert n_samples == len(dataset)
+
+
+def test_distributed_batch_sampler(monkeypatch):
+    dataset = list(range(11))
+    shards = []
+    for rank in range(3):
+        monkeypatch.setattr(
+            time_dataset.DistributedBatchSampler, "_get_rank_and_world_size", staticmethod(lambda: (rank, 3))
+        )
+        sampler = time_dataset.DistributedBatchSampler(dataset, batch_size=2)
+        batches = list(sampler)
+        assert len(batches) == len(sampler) == 2
+        shards.append([i for batch in batches for i in batch])
+    # the samples are split evenly, padded by repeating the first ones
+    assert shards == [[0, 3, 6, 9], [1, 4, 7, 10], [2, 5, 8, 0]]
+
+
+def test_global_dataset_shares_df():
+    df = pd.read_csv(PEYTON_FILE, nrows=100)
+    df["A"] = np.arange(len(df))
+    df1 = df[:60].assign(ID="df1")
+    df2 = df[60:].assign(ID="df0")
+    m = NeuralProphet(
+        epochs=EPOCHS,
+        batch_size=BATCH_SIZE,
+        learning_rate=LR,
+        weekly_seasonality=True,
+        n_lags=3,
+        n_forecasts=2,
+    )
+    m.add_lagged_regressor("A")
+    config_normalization = configure.Normalization("auto", False, True, False)
+    df_global = pd.concat((df1, df2))
+    df_global["ds"] = pd.to_datetime(df_global.loc[:, "ds"])
+    config_normalization.init_data_params(df_global, m.config_lagged_regressors, m.config_regressors, m.config_events)
+    m.config_normalization = config_normalization
+    df_global = _normalize(df=df_global, config_normalization=m.config_normalization)
+    # rows of the series are shuffled, the dataset sorts them once by ID and ds
+    m.id_list = ["df1", "df0"]
+    dataset = _create_dataset(m, df_global.sample(frac=1.0, random_state=0), predict_mode=False)
+    assert dataset.df_names == ["df0", "df1"]
+    assert list(dataset.df_ids) == [1, 0]
+    assert list(dataset.id_offsets) == [0, 40, 100]
+    assert len(dataset) == (40 - 3 - 2 + 1) + (60 - 3 - 2 + 1)
+    for i, df_name in enumerate(dataset.df_names):
+        local = _create_dataset(m, df_global[df_global["ID"] == df_name], predict_mode=False)
+        positions = np.flatnonzero(dataset.sample_series_index == i)
+        assert len(positions) == len(local)
+        for pos, local_pos in zip(positions, range(len(local))):
+            inputs, targets, meta = dataset[pos]
+            inputs_ref, targets_ref, _ = local[local_pos]
+            assert meta["df_id"] == dataset.df_ids[i]
+            assert torch.equal(targets, targets_ref)
+            for key, value in inputs_ref.items():
+                if isinstance(value, dict):
+                    for name, features in value.items():
+                        assert torch.equal(inputs[key][name], features)
+                else:
+                    assert torch.equal(inputs[key], value)
+
+
+def test_event_features_per_series():
+    df = pd.concat(
+        [
+            pd.DataFrame({"ds": pd.date_range("2022-12-20", periods=n, freq="D"), "ID": name})
+            for name, n in (("a", 20), ("b", 6), ("c", 30))
+        ],
+        ignore_index=True,
+    )
+    df["y_scaled"] = df["t"] = 0.0
+    df["promo"] = np.random.default_rng(0).random(len(df)) < 0.3
+    config_events = {
+        "promo": configure.Event(lower_window=-3, upper_window=2, reg_lambda=None, mode="multiplicative"),
+    }
+    config_holidays = configure.Holidays(country="US", lower_window=-1, upper_window=4, mode="additive")
+    config_holidays.init_holidays(df)
+    _, id_offsets = time_dataset.get_id_offsets(df)
+    event_features, additive_names, multiplicative_names = time_dataset.create_event_features(
+        df, config_events, config_holidays, id_offsets
+    )
+    assert multiplicative_names == sorted(f"promo_{offset:+d}" for offset in range(-3, 3))
+    assert event_features["additive"].shape == (len(df), len(additive_names))
+    assert event_features["additive"].flags.c_contiguous
+    # each offset feature is the feature shifted within each series
+    holidays = event_utils.get_all_holidays(range(2022, 2024), "US")
+    for mode, names in (("additive", additive_names), ("multiplicative", multiplicative_names)):
+        features = event_features[mode]
+        for j, name in enumerate(names):
+            event, offset = name.rsplit("_", 1)
+            feature = df["promo"] if event == "promo" else df["ds"].isin(holidays[event])
+            expected = feature.astype(np.float32).groupby(df["ID"]).shift(int(offset), fill_value=0.0)
+            np.testing.assert_array_equal(features[:, j], expected.to_numpy())
+    # samples sliced from the features with and without precomputed tensors are identical
+    datasets = [
+        time_dataset.TimeDataset(
+            df=df,
+            predict_mode=False,
+            n_lags=2,
+            n_forecasts=3,
+            prediction_frequency=None,
+            predict_steps=1,
+            config_seasonality=None,
+            config_events=config_events,
+            config_country_holidays=config_holidays,
+            config_regressors=None,
+            config_lagged_regressors=None,
+            config_missing=configure.MissingDataHandling(),
+            precompute_tensors=precompute_tensors,
+        )
+        for precompute_tensors in (True, False)
+    ]
+    assert len(datasets[0]) == (20 - 4) + (6 - 4) + (30 - 4)
+    for index in range(len(datasets[0])):
+        inputs, _, _ = datasets[0][index]
+        inputs_ref, _, _ = datasets[1][index]
+        for mode in ("additive", "multiplicative"):
+            assert torch.equal(inputs["events"][mode], inputs_ref["events"][mode])
+
+
+def test_sparse_rows():
+    features = np.zeros((12, 5), dtype=np.float32)
+    features[[0, 3, 3, 7, 11], [4, 0, 2, 1, 3]] = [1.0, 0.5, 1.0, 2.0, 1.0]
+    sparse_rows = time_dataset.SparseRows.from_dense(features)
+    assert len(sparse_rows) == 12
+    window_indices = torch.tensor([[0, 1, 2, 3], [3, 4, 5, 6], [8, 9, 10, 11], [3, 3, 7, 7]])
+    gathered = sparse_rows.gather(window_indices)
+    assert gathered.is_sparse
+    assert torch.equal(gathered.to_dense(), torch.from_numpy(features)[window_indices])
+    assert torch.equal(sparse_rows.to_dense(2, 8), torch.from_numpy(features[2:8]))
+
+
+def test_select_by_id():
+    params = torch.randn(3, 10, 6, requires_grad=True)
+    meta = torch.tensor([4, 0, 9, 4, 4, 2])
+    selected = utils_torch.select_by_id(params, meta)
+    one_hot = torch.nn.functional.one_hot(meta, num_classes=10)
+    selected_ref = torch.sum(one_hot.unsqueeze(dim=0).unsqueeze(dim=-1) * params.unsqueeze(dim=1), dim=2)
+    assert selected.shape == (3, 6, 6)
+    assert torch.equal(selected, selected_ref)
+    weights = torch.randn(3, 6, 6)
+    (grad,) = torch.autograd.grad((selected * weights).sum(), params)
+    (grad_ref,) = torch.autograd.grad((selected_ref * weights).sum(), params)
+    assert torch.allclose(grad, grad_ref)
+    assert torch.equal(grad[:, [1, 3, 5, 6, 7, 8]], torch.zeros(3, 6, 6))
+
+
+@pytest.mark.parametrize("growth, trend_reg", [("linear", 0), ("linear", 1.0), ("discontinuous", 0)])
+def test_piecewise_linear_trend(growth, trend_reg):
+    config = configure.Trend(
+        growth=growth,
+        changepoints=None,
+        n_changepoints=5,
+        changepoints_range=0.8,
+        trend_reg=trend_reg,
+        trend_reg_threshold=False,
+        trend_global_local="local",
+        trend_local_reg=False,
+    )
+    id_list = ["a", "b", "c"]
+    trend = get_trend(config, n_forecasts=4, quantiles=[0.5], id_list=id_list, num_trends_modelled=3, device="cpu")
+    changepoints = trend.trend_changepoints_t.numpy().astype(np.float64)
+    # times in all segments, including exactly at each changepoint
+    t = torch.tensor(np.concatenate([changepoints, np.linspace(0, 1, 9), [1.5]]).reshape(-1, 4), dtype=torch.float)
+    meta = torch.arange(t.shape[0]) % 3
+    with torch.no_grad():
+        predicted = trend(t, meta)[:, :, 0].numpy()
+    t = t.numpy().astype(np.float64)
+    for i, series in enumerate(meta.tolist()):
+        k0 = trend.trend_k0[0, series, 0].item()
+        deltas = trend.trend_deltas[0, series].detach().numpy().astype(np.float64)
+        segment = np.searchsorted(changepoints, t[i], side="right") - 1
+        if growth == "discontinuous":
+            m = trend.trend_m[0, series].detach().numpy().astype(np.float64)
+            expected = (k0 + deltas[segment]) * t[i] + m[segment]
+        else:
+            # change in slope at each changepoint, see Prophet
+            slope_changes = deltas if trend_reg > 0 else np.diff(deltas, prepend=0.0)
+            past = changepoints <= t[i][:, None]
+            expected = k0 * t[i] + np.sum(past * slope_changes * (t[i][:, None] - changepoints), axis=1)
+        np.testing.assert_allclose(predicted[i], trend.bias.item() + expected, rtol=1e-5, atol=1e-5)
+
+
+def test_reshape_raw_predictions():
+    n_lags, n_forecasts, quantiles = 3, 4, [0.5, 0.1, 0.9]
+    df = pd.DataFrame({"ds": pd.date_range("2022-01-01", periods=20, freq="H"), "y": 1.0, "ID": "__df__"})
+    n_samples = len(df) - n_lags - n_forecasts + 1
+    predicted = np.random.rand(n_samples, n_forecasts, len(quantiles)).astype(np.float32)
+    components = {
+        "trend": np.random.rand(n_samples, n_forecasts, len(quantiles)).astype(np.float32),
+        "ar": np.random.rand(n_samples, n_forecasts, len(quantiles)).astype(np.float32),
+    }
+    fcst = _reshape_raw_predictions_to_forecst_df(
+        df=df,
+        predicted=predicted,
+        components=components,
+        prediction_frequency=None,
+        dates=df["ds"].iloc[n_lags : -n_forecasts + 1],
+        n_forecasts=n_forecasts,
+        max_lags=n_lags,
+        freq="H",
+        quantiles=quantiles,
+        config_lagged_regressors=None,
+    )
+    assert list(fcst.columns[:7]) == ["ds", "y", "ID", "yhat1", "yhat2", "yhat3", "yhat4"]
+    assert list(fcst.columns[-6:]) == ["yhat4 90.0%", "ar1", "ar2", "ar3", "ar4", "trend"]
+    for i in range(n_samples):
+        for forecast_lag in range(1, n_forecasts + 1):
+            row = n_lags + i + forecast_lag - 1
+            assert fcst[f"yhat{forecast_lag}"].iloc[row] == predicted[i, forecast_lag - 1, 0]
+            assert fcst[f"yhat{forecast_lag} 10.0%"].iloc[row] == predicted[i, forecast_lag - 1, 1]
+            assert fcst[f"ar{forecast_lag}"].iloc[row] == components["ar"][i, forecast_lag - 1, 0]
+    assert fcst["yhat1"].iloc[:n_lags].isna().all()
+    assert fcst["yhat4"].iloc[: n_lags + n_forecasts - 1].isna().all()
+    # non-lagged components: all steps of the first forecast, then the last step of each further forecast
+    trend = np.concatenate((components["trend"][0, :, 0], components["trend"][1:, -1, 0]))
+    np.testing.assert_array_equal(fcst["trend"].values[n_lags:], trend)
+
+    raw = _convert_raw_predictions_to_raw_df(
+        dates=df["ds"].iloc[n_lags : -n_forecasts + 1],
+        predicted=predicted,
+        n_forecasts=n_forecasts,
+        quantiles=quantiles,
+        components=components,
+    )
+    assert list(raw.columns[:8]) == ["ds", "ID", "step0", "step0 10.0%", "step0 90.0%", "trend0", "ar0", "step1"]
+    assert len(raw) == n_samples
+    np.testing.assert_array_equal(raw["step2 90.0%"].values, predicted[:, 2, 2])
+    np.testing.assert_array_equal(raw["ar3"].values, components["ar"][:, 3, 0])
+
+
 def test_newer_sample_weight():
     dates = pd.date_range(start="2020-01-01", periods=100, freq="D")
     a = [0, 1] * 50
@@ -990,3 +1339,18 @@ def test_float32_inputs():
     m.fit(df, freq="D")
     forecast = m.predict(df)
     assert forecast["yhat1"].dtype == np.float32
+
+
+def test_prediction_frequency_calendar_index():
+    ds = pd.Series(pd.date_range(start="2019-12-25", periods=24 * 60, freq="H"))
+    calendar = df_utils.CalendarIndex.from_ds(ds)
+    assert calendar.hour.dtype == np.int8 and len(calendar) == len(ds)
+    assert (calendar[10:20].dayofweek == ds.dt.dayofweek.values[10:20]).all()
+    df = pd.DataFrame({"ds": ds})
+    prediction_frequency = {"daily-hour": 14, "weekly-day": 2}
+    mask = time_dataset.create_prediction_frequency_filter_mask(df, prediction_frequency)
+    assert (mask == ((ds.dt.hour == 14) & (ds.dt.dayofweek == 2)).values).all()
+    mask = df_utils.create_mask_for_prediction_frequency({"monthly-day": 30}, ds, forecast_lag=2, calendar=calendar)
+    assert (mask == (ds.dt.day == 32 % ds.dt.daysinmonth).values).all()
+    with pytest.raises(ValueError):
+        time_dataset.create_prediction_frequency_filter_mask(df, {"hourly-second": 1})
@@ -0,0 +1,71 @@
+import logging
+import os
+import pathlib
+import time
+
+import pandas as pd
+
+from neuralprophet import NeuralProphet, fit_bulk, fit_stacked, set_random_seed
+
+log = logging.getLogger("NP.test")
+log.setLevel("ERROR")
+log.parent.setLevel("ERROR")
+
+DIR = pathlib.Path(__file__).parent.parent.parent.absolute()
+DATA_DIR = os.path.join(DIR, "tests", "test-data")
+PEYTON_FILE = os.path.join(DATA_DIR, "wp_log_peyton_manning.csv")
+MODEL_KWARGS = {"n_lags": 7, "epochs": 10, "batch_size": 32, "learning_rate": 0.1}
+FIT_KWARGS = {"use_trainer": False}
+
+
+def many_series(n_series, nrows=365):
+    """Copies of a series, shifted to tell them apart, with columns ``ds``, ``y`` and ``ID``."""
+    df = pd.read_csv(PEYTON_FILE, nrows=nrows)
+    return pd.concat([df.assign(ID=f"series_{i}", y=df["y"] + i) for i in range(n_series)], ignore_index=True)
+
+
+def fit_sequential(df):
+    for ID, df_id in df.groupby("ID", sort=False):
+        set_random_seed(0)
+        NeuralProphet(**MODEL_KWARGS).fit(df_id, freq="D", progress=None, **FIT_KWARGS)
+
+
+def measure_bulk_fit(n_series=64, num_workers_list=None):
+    """Compare fitting a model per series one after the other with fitting them in a pool of processes.
+
+    The times of ``fit_bulk`` include starting the processes. Expect a speedup close to the number of workers, up to
+    the number of physical cores.
+    """
+    if num_workers_list is None:
+        num_workers_list = sorted({1, 2, 4, 8, os.cpu_count() or 1})
+    df = many_series(n_series)
+    start = time.perf_counter()
+    fit_sequential(df)
+    sequential = time.perf_counter() - start
+    print(f"{n_series} series, sequential: {sequential:.1f} s")
+    for num_workers in num_workers_list:
+        start = time.perf_counter()
+        fit_bulk(df, freq="D", model_kwargs=MODEL_KWARGS, fit_kwargs=FIT_KWARGS, num_workers=num_workers, seed=0)
+        elapsed = time.perf_counter() - start
+        print(f"{n_series} series, fit_bulk with {num_workers} workers: {elapsed:.1f} s ({sequential / elapsed:.1f}x)")
+
+
+def measure_stacked_fit(n_series_list=(16, 64, 256)):
+    """Compare fitting a model per series one after the other with training them at once as stacked models."""
+    for n_series in n_series_list:
+        df = many_series(n_series)
+        start = time.perf_counter()
+        fit_sequential(df)
+        sequential = time.perf_counter() - start
+        start = time.perf_counter()
+        fit_stacked(df, freq="D", model_kwargs=MODEL_KWARGS, seed=0)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{n_series} series, sequential: {sequential:.1f} s, fit_stacked: {elapsed:.1f} s "
+            f"({sequential / elapsed:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    measure_bulk_fit()
+    measure_stacked_fit()
@@ -0,0 +1,49 @@
+import logging
+import os
+import pathlib
+import time
+
+import pandas as pd
+
+from neuralprophet import NeuralProphet, set_random_seed
+
+log = logging.getLogger("NP.test")
+log.setLevel("ERROR")
+log.parent.setLevel("ERROR")
+
+DIR = pathlib.Path(__file__).parent.parent.parent.absolute()
+DATA_DIR = os.path.join(DIR, "tests", "test-data")
+PEYTON_FILE = os.path.join(DATA_DIR, "wp_log_peyton_manning.csv")
+MODEL_KWARGS = {"n_lags": 14, "n_forecasts": 7, "epochs": 5, "learning_rate": 0.1, "accelerator": "cpu"}
+BATCH_SIZE = 1024
+
+
+def global_series(n_series, nrows=1_000):
+    """Copies of a series, shifted to tell them apart, with columns ``ds``, ``y`` and ``ID``."""
+    df = pd.read_csv(PEYTON_FILE, nrows=nrows)
+    return pd.concat([df.assign(ID=f"series_{i}", y=df["y"] + i) for i in range(n_series)], ignore_index=True)
+
+
+def measure_ddp_fit(n_series=200, devices_list=None):
+    """Compare fitting one global model in a single process with data-parallel training in several processes.
+
+    Each process takes ``BATCH_SIZE / devices`` samples per step, so that all take the same steps. The times include
+    forking the processes. Expect a speedup up to the number of physical cores, less the gradient synchronization.
+    """
+    if devices_list is None:
+        devices_list = sorted({1, 2, 4, os.cpu_count() or 1})
+    df = global_series(n_series)
+    for devices in devices_list:
+        set_random_seed(0)
+        m = NeuralProphet(
+            batch_size=BATCH_SIZE // devices,
+            trainer_config={"strategy": "ddp", "devices": devices} if devices > 1 else {},
+            **MODEL_KWARGS,
+        )
+        start = time.perf_counter()
+        metrics = m.fit(df, freq="D", progress=None)
+        print(f"{devices} process(es): {time.perf_counter() - start:.1f} s, final loss {metrics['Loss'].iloc[-1]:.5f}")
+
+
+if __name__ == "__main__":
+    measure_ddp_fit()
@@ -0,0 +1,82 @@
+import logging
+
+import torch
+import torch.utils.benchmark as benchmark
+
+from neuralprophet import configure
+from neuralprophet.components.router import get_trend
+from neuralprophet.utils_torch import select_by_id
+
+log = logging.getLogger("NP.test")
+log.setLevel("ERROR")
+log.parent.setLevel("ERROR")
+
+BATCH_SIZE = 128
+N_FORECASTS = 7
+QUANTILES = [0.5, 0.05, 0.95]
+N_PARAMS = 20  # fourier terms of a yearly seasonality with resolution 10
+# one-hot intermediates of dims (quantiles, batch, num_time_series, params) no longer fit in memory beyond this
+MAX_ONE_HOT_IDS = 10_000
+
+
+def select_by_one_hot(params, meta):
+    """Selection of the local parameters of each sample as computed before ``select_by_id``."""
+    meta_name_tensor_one_hot = torch.nn.functional.one_hot(meta, num_classes=params.shape[1])
+    return torch.sum(meta_name_tensor_one_hot.unsqueeze(dim=0).unsqueeze(dim=-1) * params.unsqueeze(dim=1), dim=2)
+
+
+def local_trend(n_ids, n_changepoints=10):
+    config = configure.Trend(
+        growth="linear",
+        changepoints=None,
+        n_changepoints=n_changepoints,
+        changepoints_range=0.8,
+        trend_reg=0,
+        trend_reg_threshold=False,
+        trend_global_local="local",
+        trend_local_reg=False,
+    )
+    id_list = [f"series_{i}" for i in range(n_ids)]
+    return get_trend(
+        config, n_forecasts=N_FORECASTS, quantiles=QUANTILES, id_list=id_list, num_trends_modelled=n_ids, device="cpu"
+    )
+
+
+def measure_local_components(id_list_sizes=(10, 100, 1_000, 10_000, 100_000), batch_size=BATCH_SIZE):
+    """Compare the forward and backward pass of local parameter selection per number of time series."""
+    results = []
+    for n_ids in id_list_sizes:
+        torch.manual_seed(0)
+        params = torch.randn(len(QUANTILES), n_ids, N_PARAMS, requires_grad=True)
+        meta = torch.randint(0, n_ids, (batch_size,))
+        sub_label = f"[time series: {n_ids}, batch: {batch_size}]"
+        methods = {"gather": select_by_id}
+        if n_ids <= MAX_ONE_HOT_IDS:
+            methods["one-hot"] = select_by_one_hot
+        for description, select in methods.items():
+            results.append(
+                benchmark.Timer(
+                    stmt="select(params, meta).sum().backward()",
+                    globals={"select": select, "params": params, "meta": meta},
+                    label="local seasonality parameters (forward + backward)",
+                    sub_label=sub_label,
+                    description=description,
+                ).blocked_autorange(min_run_time=1)
+            )
+        trend = local_trend(n_ids)
+        t = torch.rand(batch_size, N_FORECASTS)
+        results.append(
+            benchmark.Timer(
+                stmt="trend(t, meta).sum().backward()",
+                globals={"trend": trend, "t": t, "meta": meta},
+                label="local piecewise linear trend (forward + backward)",
+                sub_label=sub_label,
+                description="gather",
+            ).blocked_autorange(min_run_time=1)
+        )
+    compare = benchmark.Compare(results)
+    compare.print()
+
+
+if __name__ == "__main__":
+    measure_local_components()
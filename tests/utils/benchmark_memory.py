@@ -0,0 +1,115 @@
+import logging
+import os
+import pathlib
+import resource
+import sys
+import threading
+import time
+
+import pandas as pd
+
+from neuralprophet import NeuralProphet
+
+log = logging.getLogger("NP.test")
+log.setLevel("ERROR")
+log.parent.setLevel("ERROR")
+
+DIR = pathlib.Path(__file__).parent.parent.parent.absolute()
+DATA_DIR = os.path.join(DIR, "tests", "test-data")
+YOS_FILE = os.path.join(DATA_DIR, "yosemite_temps.csv")
+EPOCHS = 1
+BATCH_SIZE = 128
+LR = 1.0
+MB = 1024**2
+
+
+def current_rss():
+    """Resident set size of this process in bytes, peak RSS where the current RSS is not available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # ru_maxrss is in bytes on macOS, in kilobytes elsewhere
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+
+
+class PeakRSS:
+    """Tracks the peak RSS reached within a with-block, by sampling the RSS in a background thread."""
+
+    def __init__(self, interval=0.001):
+        self.interval = interval
+        self.start = 0
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, current_rss())
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self.start = current_rss()
+        self.peak = self.start
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss())
+
+    @property
+    def increase(self):
+        """Peak RSS above the RSS at the start of the block, in bytes."""
+        return self.peak - self.start
+
+
+def load_data(nrows, n_series=1):
+    df = pd.read_csv(YOS_FILE, nrows=nrows)
+    if n_series > 1:
+        df = pd.concat([df.assign(ID=f"series_{i}") for i in range(n_series)], ignore_index=True)
+    return df
+
+
+def measure_fit_predict(nrows=10000, n_series=1, n_lags=12, n_forecasts=6):
+    """Peak RSS increase of fit and predict, in MB."""
+    df = load_data(nrows, n_series)
+    m = NeuralProphet(
+        n_lags=n_lags,
+        n_forecasts=n_forecasts,
+        epochs=EPOCHS,
+        batch_size=BATCH_SIZE,
+        learning_rate=LR,
+    )
+    with PeakRSS() as fit_rss:
+        m.fit(df, freq="5min", progress=None, metrics=False)
+    with PeakRSS() as predict_rss:
+        m.predict(df)
+    return {
+        "rows": len(df),
+        "series": n_series,
+        "data MB": df.memory_usage(deep=True).sum() / MB,
+        "fit peak MB": fit_rss.increase / MB,
+        "predict peak MB": predict_rss.increase / MB,
+    }
+
+
+def measure_memory(sizes=(1000, 10000, 18000), n_series=(1, 10)):
+    """Prints the peak RSS increase of fit and predict per dataset size.
+
+    Each measurement runs in a fresh process, so that memory retained by earlier runs does not hide peaks.
+    """
+    import multiprocessing
+
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    with ctx.Pool(1, maxtasksperchild=1) as pool:
+        for series in n_series:
+            for nrows in sizes:
+                results.append(pool.apply(measure_fit_predict, kwds={"nrows": nrows, "n_series": series}))
+    print(pd.DataFrame(results).round(1).to_string(index=False))
+
+
+if __name__ == "__main__":
+    measure_memory()
@@ -0,0 +1,80 @@
+import logging
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import torch.utils.benchmark as benchmark
+
+from neuralprophet.data.process import _convert_raw_predictions_to_raw_df, _reshape_raw_predictions_to_forecst_df
+
+log = logging.getLogger("NP.test")
+log.setLevel("ERROR")
+log.parent.setLevel("ERROR")
+
+NROWS = 5000
+QUANTILES = [0.5, 0.05, 0.95]
+COMPONENTS = ["trend", "season_daily", "season_weekly", "ar"]
+
+
+def raw_predictions(nrows=NROWS, n_forecasts=24, n_lags=24, quantiles=QUANTILES):
+    """Random raw predictions and components of a single hourly series, as returned by ``_predict_raw``."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"ds": pd.date_range("2022-01-01", periods=nrows, freq="H"), "y": rng.normal(size=nrows)})
+    df["ID"] = "__df__"
+    n_samples = nrows - n_lags - n_forecasts + 1
+    dates = df["ds"].iloc[n_lags : n_lags + n_samples]
+    shape = (n_samples, n_forecasts, len(quantiles))
+    predicted = rng.normal(size=shape).astype(np.float32)
+    components = OrderedDict((name, rng.normal(size=shape).astype(np.float32)) for name in COMPONENTS)
+    return df, dates, predicted, components
+
+
+def measure_raw_forecast(n_forecasts_list=(1, 24, 168), nrows=NROWS, n_lags=24, quantiles=QUANTILES):
+    """Compare assembling the raw (``predict(raw=True)``) and the target-wise forecast frames per n_forecasts."""
+    results = []
+    for n_forecasts in n_forecasts_list:
+        df, dates, predicted, components = raw_predictions(nrows, n_forecasts, n_lags, quantiles)
+        sub_label = f"[rows: {nrows}, n_forecasts: {n_forecasts}, quantiles: {len(quantiles)}]"
+        results.append(
+            benchmark.Timer(
+                stmt="convert(dates=dates, predicted=predicted, n_forecasts=n_forecasts, quantiles=quantiles, "
+                "components=components)",
+                globals={
+                    "convert": _convert_raw_predictions_to_raw_df,
+                    "dates": dates,
+                    "predicted": predicted,
+                    "n_forecasts": n_forecasts,
+                    "quantiles": quantiles,
+                    "components": components,
+                },
+                label="raw predictions to forecast frame",
+                sub_label=sub_label,
+                description="raw",
+            ).blocked_autorange(min_run_time=1)
+        )
+        results.append(
+            benchmark.Timer(
+                stmt="reshape(df=df, predicted=predicted, components=components, prediction_frequency=None, "
+                "dates=dates, n_forecasts=n_forecasts, max_lags=n_lags, freq='H', quantiles=quantiles, "
+                "config_lagged_regressors=None)",
+                globals={
+                    "reshape": _reshape_raw_predictions_to_forecst_df,
+                    "df": df,
+                    "dates": dates,
+                    "predicted": predicted,
+                    "n_forecasts": n_forecasts,
+                    "n_lags": n_lags,
+                    "quantiles": quantiles,
+                    "components": components,
+                },
+                label="raw predictions to forecast frame",
+                sub_label=sub_label,
+                description="target-wise",
+            ).blocked_autorange(min_run_time=1)
+        )
+    compare = benchmark.Compare(results)
+    compare.print()
+
+
+if __name__ == "__main__":
+    measure_raw_forecast()
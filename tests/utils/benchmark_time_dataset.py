@@ -8,7 +8,7 @@ import pandas as pd
 import torch.utils.benchmark as benchmark
 from torch.utils.data import DataLoader
 
-from neuralprophet import NeuralProphet, df_utils, utils
+from neuralprophet import NeuralProphet, df_utils, time_dataset, utils
 from neuralprophet.data.process import _check_dataframe, _create_dataset, _handle_missing_data
 from neuralprophet.data.transform import _normalize
 
@@ -49,11 +49,9 @@ def print_input_shapes(inputs):
     print(f"Tabularized inputs shapes: \n{tabularized_input_shapes_str}")
 
 
-def load(nrows=NROWS, epochs=EPOCHS, batch=BATCH_SIZE, season=True, iterations=1):
-    tic = time.perf_counter()
+def prepare(nrows=NROWS, epochs=EPOCHS, batch=BATCH_SIZE, season=True):
     df = pd.read_csv(YOS_FILE, nrows=nrows)
     freq = "5min"
-    num_workers = 0
 
     m = NeuralProphet(
         n_lags=12,
@@ -97,6 +95,13 @@ def load(nrows=NROWS, epochs=EPOCHS, batch=BATCH_SIZE, season=True, iterations=1
     m.config_seasonality = utils.set_auto_seasonalities(df_merged, config_seasonality=m.config_seasonality)
     if m.config_country_holidays is not None:
         m.config_country_holidays.init_holidays(df_merged)
+    return m, df
+
+
+def load(nrows=NROWS, epochs=EPOCHS, batch=BATCH_SIZE, season=True, iterations=1):
+    tic = time.perf_counter()
+    num_workers = 0
+    m, df = prepare(nrows=nrows, epochs=epochs, batch=batch, season=season)
 
     dataset = _create_dataset(
         m, df, predict_mode=False, prediction_frequency=m.prediction_frequency
@@ -128,13 +133,61 @@ def load(nrows=NROWS, epochs=EPOCHS, batch=BATCH_SIZE, season=True, iterations=1
         # do_something()
     toc = time.perf_counter()
     # print_input_shapes(data)
-    # print(len(meta["df_name"]))
+    # print(len(meta["df_id"]))
     print(f"######## Time: {toc - tic:0.4f} for iterating {iterations} batches of size {batch}")
 
 
 load(nrows=1010, batch=100, iterations=10)
 
 
+def iterate_epoch(loader):
+    for data, target, meta in loader:
+        pass
+
+
+def measure_tensor_store(sizes=(1000, 10000), batch=128):
+    """Compare one epoch of data loading with per-sample pandas tabularization vs. precomputed tensors,
+    fetched per sample or as whole mini-batches."""
+    results = []
+    for nrows in sizes:
+        m, df = prepare(nrows=nrows, batch=batch)
+        for precompute_tensors, batched in [(False, False), (True, False), (True, True)]:
+            dataset = time_dataset.GlobalTimeDataset(
+                df,
+                predict_mode=False,
+                n_lags=m.n_lags,
+                n_forecasts=m.n_forecasts,
+                prediction_frequency=m.prediction_frequency,
+                predict_steps=m.predict_steps,
+                config_seasonality=m.config_seasonality,
+                config_events=m.config_events,
+                config_country_holidays=m.config_country_holidays,
+                config_regressors=m.config_regressors,
+                config_lagged_regressors=m.config_lagged_regressors,
+                config_missing=m.config_missing,
+                precompute_tensors=precompute_tensors,
+            )
+            if batched:
+                loader = time_dataset.create_batched_loader(dataset, batch_size=batch, shuffle=True)
+            else:
+                loader = DataLoader(dataset, batch_size=batch, shuffle=True)
+            results.append(
+                benchmark.Timer(
+                    stmt="iterate_epoch(loader)",
+                    setup="from __main__ import iterate_epoch",
+                    globals={"loader": loader},
+                    label="TimeDataset epoch",
+                    sub_label=f"[rows: {nrows}, batch: {batch}]",
+                    description=f"precompute_tensors={precompute_tensors}, batched={batched}",
+                ).blocked_autorange(min_run_time=1)
+            )
+    compare = benchmark.Compare(results)
+    compare.print()
+
+
+# measure_tensor_store()
+
+
 def yosemite(nrows=NROWS, epochs=EPOCHS, batch=BATCH_SIZE, season=True):
     # log.info("testing: Uncertainty Estimation Yosemite Temps")
     df = pd.read_csv(YOS_FILE, nrows=nrows)
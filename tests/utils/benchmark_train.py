@@ -0,0 +1,53 @@
+import logging
+
+import pandas as pd
+import torch.utils.benchmark as benchmark
+
+from neuralprophet import NeuralProphet, set_random_seed
+
+log = logging.getLogger("NP.test")
+log.setLevel("ERROR")
+log.parent.setLevel("ERROR")
+
+PEYTON_FILE = "tests/test-data/wp_log_peyton_manning.csv"
+EPOCHS = 10
+BATCH_SIZE = 64
+LR = 0.1
+
+
+def fit(df, use_trainer, validation_df=None, **kwargs):
+    set_random_seed(0)
+    m = NeuralProphet(epochs=EPOCHS, batch_size=BATCH_SIZE, learning_rate=LR, **kwargs)
+    return m.fit(df, validation_df=validation_df, freq="D", progress=None, use_trainer=use_trainer)
+
+
+def measure_fit(nrows_list=(100, 1_000, 3_000), n_lags=3):
+    """Compare the wall-clock time to fit a small model with and without the Lightning Trainer."""
+    results = []
+    for nrows in nrows_list:
+        df = pd.read_csv(PEYTON_FILE, nrows=nrows)
+        df_train, df_val = df.iloc[: int(0.8 * nrows)], df.iloc[int(0.8 * nrows) :]
+        for validation_df in [None, df_val]:
+            sub_label = f"[rows: {nrows}, validation: {validation_df is not None}]"
+            for use_trainer, description in [(True, "trainer"), (False, "plain loop")]:
+                results.append(
+                    benchmark.Timer(
+                        stmt="fit(df, use_trainer, validation_df, n_lags=n_lags)",
+                        globals={
+                            "fit": fit,
+                            "df": df_train,
+                            "use_trainer": use_trainer,
+                            "validation_df": validation_df,
+                            "n_lags": n_lags,
+                        },
+                        label=f"fit ({EPOCHS} epochs)",
+                        sub_label=sub_label,
+                        description=description,
+                    ).blocked_autorange(min_run_time=2)
+                )
+    compare = benchmark.Compare(results)
+    compare.print()
+
+
+if __name__ == "__main__":
+    measure_fit()